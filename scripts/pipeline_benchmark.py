@@ -0,0 +1,379 @@
+import argparse
+import itertools
+import json
+import os
+import platform
+import sys
+import threading
+import time
+from array import array
+from datetime import datetime
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+import can
+
+# Traffic mixes: payload of each frame and the IDs cycled through
+FRAME_MIXES = {
+    "classic": (False, 8),  # classic CAN, 8 data bytes
+    "fd64": (True, 64),  # CAN-FD with bitrate switch, 64 data bytes
+}
+ID_MIXES = {
+    "few": range(0x100, 0x108),
+    "many": range(0x700),
+}
+# Block-list rule the filter evaluates for every frame; no traffic matches it
+DEFAULT_FILTER = "7F0-7FF"
+# Seconds the pipeline gets to catch up after the generator stopped
+SETTLE_S = 2.0
+
+
+class TrafficGenerator:
+    """Sends frames on its own bus from a thread at a fixed rate.
+
+    The rate is kept by sending whatever is due every millisecond, so short
+    bursts average out to the target. A rate of 0 sends as fast as the bus
+    accepts frames.
+    """
+
+    def __init__(
+        self,
+        bus: can.BusABC,
+        rate: int,
+        is_fd: bool,
+        length: int,
+        arbitration_ids: range,
+    ):
+        self._bus = bus
+        self._rate = rate
+        self._messages = [
+            can.Message(
+                arbitration_id=arbitration_id,
+                is_extended_id=False,
+                is_fd=is_fd,
+                bitrate_switch=is_fd,
+                data=bytes((arbitration_id + index) & 0xFF for index in range(length)),
+            )
+            for arbitration_id in arbitration_ids
+        ]
+        self.sent = 0
+        self.errors = 0
+        self._attempted = 0
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="TrafficGenerator", daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        messages = itertools.cycle(self._messages)
+        send = self._bus.send
+        started = time.perf_counter()
+        while not self._stopping.is_set():
+            if self._rate:
+                elapsed = time.perf_counter() - started
+                due = int(elapsed * self._rate) - self._attempted
+            else:
+                due = 256
+            for _ in range(due):
+                self._attempted += 1
+                try:
+                    send(next(messages))
+                except can.CanError:
+                    self.errors += 1
+                    continue
+                self.sent += 1
+            if self._rate:
+                time.sleep(0.001)
+
+
+class DisplayProbe:
+    """Counts frames after the log view took them and records their latency.
+
+    Connected to the receive signal after the log view, so it runs once the
+    batch is in the view's model; the repaint that follows is coalesced by
+    Qt and not waited for.
+    """
+
+    def __init__(self):
+        self.displayed = 0
+        self.latencies = array("d")
+        self.recording = False
+
+    def on_batch(self, msgs: list[can.Message]) -> None:
+        self.displayed += len(msgs)
+        if self.recording:
+            now = time.time()
+            self.latencies.extend(now - msg.timestamp for msg in msgs)
+
+
+def percentile(values: list[float], fraction: float) -> float | None:
+    if not values:
+        return None
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def rss_mb() -> float | None:
+    # current resident set size; only available through /proc on Linux
+    try:
+        with open("/proc/self/statm") as file:
+            pages = int(file.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+# ru_maxrss is not available everywhere and can be below a current RSS read
+# from /proc (it counts differently), so the peak is at least 'current'
+def peak_rss_mb(current: float | None = None) -> float | None:
+    if resource is None:
+        return current
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    peak_mb = peak / scale
+    return peak_mb if current is None else max(peak_mb, current)
+
+
+def run_scenario(
+    app, args: argparse.Namespace, frame_mix: str, id_mix: str, rate: int
+) -> dict:
+    from PySide6.QtCore import QEventLoop, QTimer
+    from returns.pipeline import is_successful
+
+    from src.component.logbox import LogBox
+    from src.utils.can_handler import CANHandler
+    from src.utils.id_filter import (
+        FILTER_MODE_BLOCK,
+        ChannelIdFilters,
+        parse_filter_rule,
+    )
+
+    is_fd, length = FRAME_MIXES[frame_mix]
+    handler = CANHandler()
+    handler.configure_receive_pipeline(args.rx_batch_size, args.rx_tick_hz)
+    rules = [parse_filter_rule(text, "hex") for text in args.filter]
+    handler.update_id_filter(
+        ChannelIdFilters([(rule, None) for rule in rules], FILTER_MODE_BLOCK)
+    )
+    log_box = LogBox()
+    log_box.resize(800, 600)
+    log_box.show()
+    probe = DisplayProbe()
+    handler.receive_batch_signal.connect(log_box.can_msg_batch_log)
+    handler.receive_batch_signal.connect(probe.on_batch)
+
+    result = handler.connect_device(
+        args.channel, 500_000, args.interface, is_fd, 2_000_000 if is_fd else None
+    )
+    if not is_successful(result):
+        raise RuntimeError(f"Failed to connect to {args.channel}: {result.failure()}")
+    generator_bus = can.Bus(args.channel, interface=args.interface, fd=is_fd)
+    generator = TrafficGenerator(generator_bus, rate, is_fd, length, ID_MIXES[id_mix])
+
+    def run_loop(seconds: float) -> None:
+        loop = QEventLoop()
+        QTimer.singleShot(round(seconds * 1000), loop.quit)
+        loop.exec()
+
+    generator.start()
+    run_loop(args.warmup)
+
+    # measured window
+    probe.recording = True
+    sent_before = generator.sent
+    displayed_before = probe.displayed
+    stats_before = handler.get_receive_stats()
+    cpu_before = time.process_time()
+    started = time.perf_counter()
+    run_loop(args.duration)
+    elapsed = time.perf_counter() - started
+    cpu_seconds = time.process_time() - cpu_before
+    probe.recording = False
+    stats_after = handler.get_receive_stats()
+    sent = generator.sent - sent_before
+    displayed = probe.displayed - displayed_before
+    rss = rss_mb()
+
+    generator.stop()
+    # let the pipeline catch up to see whether it only lags or drops
+    deadline = time.perf_counter() + SETTLE_S
+    while probe.displayed < generator.sent and time.perf_counter() < deadline:
+        run_loop(0.05)
+    stats_final = handler.get_receive_stats()
+
+    handler.disconnect_devive()
+    generator_bus.shutdown()
+    log_box.close_history()
+    log_box.deleteLater()
+    handler.deleteLater()
+    app.processEvents()
+
+    latencies = sorted(probe.latencies)
+    return {
+        "frame": frame_mix,
+        "ids": id_mix,
+        "distinct_ids": len(ID_MIXES[id_mix]),
+        "target_rate": rate,
+        "duration_s": round(elapsed, 3),
+        "sent": sent,
+        "send_errors": generator.errors,
+        "displayed": displayed,
+        "sent_per_second": round(sent / elapsed, 1),
+        # sustained rate reaching the log view
+        "frames_per_second": round(displayed / elapsed, 1),
+        "dropped": stats_after.dropped - stats_before.dropped,
+        "pending_at_end": stats_after.pending,
+        "dropped_total": stats_final.dropped,
+        "caught_up": probe.displayed >= generator.sent,
+        "latency_ms": {
+            name: None if value is None else round(value * 1000, 3)
+            for name, value in (
+                ("p50", percentile(latencies, 0.50)),
+                ("p90", percentile(latencies, 0.90)),
+                ("p99", percentile(latencies, 0.99)),
+                ("max", latencies[-1] if latencies else None),
+            )
+        },
+        # the whole process: generator, receive thread and GUI thread
+        "cpu_percent": round(cpu_seconds / elapsed * 100, 1),
+        "rss_mb": None if rss is None else round(rss, 1),
+        "peak_rss_mb": None if (peak := peak_rss_mb(rss)) is None else round(peak, 1),
+    }
+
+
+def parse_list(text: str) -> list[str]:
+    return [item.strip() for item in text.split(",") if item.strip()]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Measure how many frames/s the receive pipeline (CANHandler, ID "
+            "filter and log view) sustains, and the latency from arrival to "
+            "the view, as JSON"
+        )
+    )
+    parser.add_argument(
+        "--interface",
+        default="virtual",
+        help="python-can interface (default: virtual; socketcan for vcan)",
+    )
+    parser.add_argument(
+        "--channel",
+        default="bench",
+        help="Channel, e.g. vcan0 for socketcan (default: bench)",
+    )
+    parser.add_argument(
+        "--rates",
+        type=lambda text: [int(rate) for rate in parse_list(text)],
+        default=[1000, 5000, 20000, 0],
+        help="Comma separated frames/s to generate, 0 for unthrottled "
+        "(default: 1000,5000,20000,0)",
+    )
+    parser.add_argument(
+        "--frames",
+        type=parse_list,
+        default=list(FRAME_MIXES),
+        help=f"Comma separated frame mixes: {', '.join(FRAME_MIXES)} (default: all)",
+    )
+    parser.add_argument(
+        "--ids",
+        type=parse_list,
+        default=list(ID_MIXES),
+        help=f"Comma separated ID mixes: {', '.join(ID_MIXES)} (default: all)",
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=5.0,
+        help="Measured seconds per scenario (default: 5)",
+    )
+    parser.add_argument(
+        "--warmup",
+        type=float,
+        default=1.0,
+        help="Seconds of traffic before measuring (default: 1)",
+    )
+    parser.add_argument(
+        "--filter",
+        type=parse_list,
+        default=[DEFAULT_FILTER],
+        help=f"Comma separated hex block-list rules (default: {DEFAULT_FILTER})",
+    )
+    parser.add_argument("--rx-batch-size", type=int, default=None)
+    parser.add_argument("--rx-tick-hz", type=int, default=None)
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Write the JSON report here instead of stdout",
+    )
+    parser.add_argument(
+        "--show",
+        action="store_true",
+        help="Use the default Qt platform instead of offscreen",
+    )
+    args = parser.parse_args()
+    for name, choices in (("frames", FRAME_MIXES), ("ids", ID_MIXES)):
+        unknown = set(getattr(args, name)) - set(choices)
+        if unknown:
+            parser.error(f"unknown --{name}: {', '.join(sorted(unknown))}")
+    return args
+
+
+def main() -> int:
+    args = parse_args()
+    if not args.show:
+        os.environ["QT_QPA_PLATFORM"] = "offscreen"
+    from PySide6.QtWidgets import QApplication
+
+    app = QApplication(sys.argv[:1])
+    results = []
+    for frame_mix, id_mix, rate in itertools.product(args.frames, args.ids, args.rates):
+        result = run_scenario(app, args, frame_mix, id_mix, rate)
+        latency = result["latency_ms"]
+        print(
+            f"{frame_mix:7} {id_mix:4} rate {rate or 'max':>6}: "
+            f"{result['frames_per_second']:9.1f} frames/s, "
+            f"p99 {latency['p99']} ms, dropped {result['dropped']}, "
+            f"CPU {result['cpu_percent']} %",
+            file=sys.stderr,
+        )
+        results.append(result)
+
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "python_can": can.__version__,
+        "interface": args.interface,
+        "channel": args.channel,
+        "duration_s": args.duration,
+        "filter": args.filter,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output is None:
+        print(text)
+    else:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
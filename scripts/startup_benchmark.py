@@ -0,0 +1,182 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+STARTUP_PROBE_ENV = "CANVIEWER_STARTUP_PROBE"
+FIRST_PAINT_MARKER = "CANVIEWER_FIRST_PAINT"
+# Backend packages that must only be imported once their interface is used
+LAZY_MODULES = ("usb", "gs_usb", "serial")
+
+
+def parse_importtime(stderr: str) -> dict[str, tuple[int, int]]:
+    """Map module name to (self µs, cumulative µs) from ``-X importtime``."""
+    modules: dict[str, tuple[int, int]] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the column header
+        modules[fields[2].strip()] = (int(fields[0]), int(fields[1]))
+    return modules
+
+
+def measure_imports(python: str, module: str) -> dict[str, tuple[int, int]]:
+    result = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+        env=probe_env(offscreen=True, probe=False),
+        check=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def probe_env(offscreen: bool, probe: bool = True) -> dict[str, str]:
+    env = os.environ.copy()
+    if probe:
+        env[STARTUP_PROBE_ENV] = "1"
+    if offscreen:
+        env["QT_QPA_PLATFORM"] = "offscreen"
+    return env
+
+
+def measure_first_paint(command: list[str], offscreen: bool, timeout: float) -> float:
+    """Wall-clock milliseconds from process spawn to the first window paint."""
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        command,
+        cwd=ROOT_DIR,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        env=probe_env(offscreen),
+    )
+    # a launch that never paints is killed, which ends the read loop
+    watchdog = threading.Timer(timeout, process.kill)
+    watchdog.start()
+    try:
+        assert process.stdout is not None
+        for line in process.stdout:
+            if line.startswith(FIRST_PAINT_MARKER):
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                process.wait(timeout)
+                return elapsed_ms
+    finally:
+        watchdog.cancel()
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+    raise RuntimeError(
+        f"{' '.join(command)} exited without painting a window "
+        f"(exit code {process.returncode})"
+    )
+
+
+def print_imports(modules: dict[str, tuple[int, int]], top: int) -> None:
+    print(f"{'self ms':>9} {'cumul ms':>9}  module")
+    ranked = sorted(modules.items(), key=lambda item: item[1][1], reverse=True)
+    for name, (self_us, cumulative_us) in ranked[:top]:
+        print(f"{self_us / 1000:9.1f} {cumulative_us / 1000:9.1f}  {name}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Measure CANViewer import time and time to first paint"
+    )
+    parser.add_argument(
+        "--binary",
+        type=Path,
+        default=None,
+        help="Benchmark a built executable (e.g. dist/CANViewer) instead of main.py",
+    )
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=5,
+        help="Number of launches; the median is reported (default: 5)",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=20,
+        help="Number of modules listed by cumulative import time (default: 20)",
+    )
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=None,
+        help="Fail if the median time to first paint exceeds this",
+    )
+    parser.add_argument(
+        "--import-budget-ms",
+        type=float,
+        default=None,
+        help="Fail if importing the main window takes longer than this",
+    )
+    parser.add_argument(
+        "--offscreen",
+        action="store_true",
+        help="Use the Qt offscreen platform (for CI without a display)",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=60.0,
+        help="Seconds to wait for one launch (default: 60)",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    failures: list[str] = []
+
+    # Import times only exist for the interpreted app; a Nuitka binary has
+    # its modules compiled in
+    if args.binary is None:
+        modules = measure_imports(sys.executable, "src.main_window")
+        print("Imports of src.main_window")
+        print_imports(modules, args.top)
+        import_ms = modules["src.main_window"][1] / 1000
+        print(f"total: {import_ms:.1f} ms\n")
+        eager = sorted(name for name in modules if name.split(".")[0] in LAZY_MODULES)
+        if eager:
+            failures.append("backend modules imported at startup: " + ", ".join(eager))
+        if args.import_budget_ms is not None and import_ms > args.import_budget_ms:
+            failures.append(
+                f"import time {import_ms:.1f} ms exceeds {args.import_budget_ms} ms"
+            )
+        command = [sys.executable, "main.py"]
+    else:
+        command = [str(args.binary.resolve())]
+
+    timings = [
+        measure_first_paint(command, args.offscreen, args.timeout)
+        for _ in range(args.runs)
+    ]
+    median_ms = statistics.median(timings)
+    print(f"Time to first paint: {' '.join(command)}")
+    print(
+        f"median {median_ms:.1f} ms | min {min(timings):.1f} ms | "
+        f"max {max(timings):.1f} ms | runs {len(timings)}"
+    )
+    if args.budget_ms is not None and median_ms > args.budget_ms:
+        failures.append(
+            f"time to first paint {median_ms:.1f} ms exceeds {args.budget_ms} ms"
+        )
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+from collections.abc import Callable
+
+import can
+from PySide6.QtCore import QTimer, Signal, Slot
+from PySide6.QtWidgets import (
+    QCheckBox,
+    QDialog,
+    QDoubleSpinBox,
+    QFormLayout,
+    QHBoxLayout,
+    QLabel,
+    QPushButton,
+    QSpinBox,
+    QVBoxLayout,
+)
+
+from ..utils.burst import BurstConfig, BurstStats
+
+STATS_REFRESH_MS = 250
+DEFAULT_BURST_FRAMES = 10_000
+
+
+def _format_us(value: float | None) -> str:
+    if value is None:
+        return "-"
+    return f"{value * 1_000_000:.0f} µs"
+
+
+def format_burst_stats(stats: BurstStats) -> str:
+    bus_load = "-" if stats.bus_load is None else f"{stats.bus_load * 100:.1f} %"
+    running = " (running)" if stats.running else ""
+    lines = [
+        f"Interface: {stats.interface or '-'}{running}",
+        (
+            f"Sent: {stats.sent} in {stats.elapsed:.3f} s"
+            f" | {stats.frames_per_second:.0f} frames/s | bus load {bus_load}"
+        ),
+        f"Errors: {stats.errors} | buffer full: {stats.buffer_full}",
+        (
+            f"send() latency: p50 {_format_us(stats.latency_p50)}"
+            f" | p99 {_format_us(stats.latency_p99)}"
+            f" | max {_format_us(stats.latency_max)}"
+        ),
+    ]
+    if stats.last_error is not None:
+        lines.append(f"Last error: {stats.last_error}")
+    return "\n".join(lines)
+
+
+class BurstDialog(QDialog):
+    """Runs a burst of the editor's message and shows the achieved rate."""
+
+    log_signal = Signal(str, str)
+
+    def __init__(
+        self,
+        message_source: Callable[[], can.Message | None],
+        start: Callable[[can.Message, BurstConfig], object],
+        stop: Callable[[], None],
+        stats_source: Callable[[], BurstStats | None],
+        parent=None,
+    ):
+        super().__init__(parent)
+        self.setWindowTitle("Burst Transmit")
+        self._message_source = message_source
+        self._start = start
+        self._stop = stop
+        self._stats_source = stats_source
+
+        self._layout = QVBoxLayout()
+        self.setLayout(self._layout)
+
+        # Burst settings
+        self._form_layout = QFormLayout()
+        self._layout.addLayout(self._form_layout)
+        self._count_spinbox = QSpinBox()
+        self._count_spinbox.setRange(0, 2_000_000_000)
+        self._count_spinbox.setValue(DEFAULT_BURST_FRAMES)
+        self._count_spinbox.setSpecialValueText("No limit")
+        self._form_layout.addRow("Frames:", self._count_spinbox)
+        self._duration_spinbox = QDoubleSpinBox()
+        self._duration_spinbox.setRange(0, 86_400)
+        self._duration_spinbox.setDecimals(1)
+        self._duration_spinbox.setSuffix(" s")
+        self._duration_spinbox.setSpecialValueText("No limit")
+        self._form_layout.addRow("Duration:", self._duration_spinbox)
+        self._increment_id_checkbox = QCheckBox("Increment ID")
+        self._form_layout.addRow(self._increment_id_checkbox)
+        self._increment_data_checkbox = QCheckBox("Increment data")
+        self._form_layout.addRow(self._increment_data_checkbox)
+        self._log_frames_checkbox = QCheckBox("Show sent frames in the log")
+        self._form_layout.addRow(self._log_frames_checkbox)
+
+        # Result
+        self._stats_label = QLabel("Not started")
+        self._layout.addWidget(self._stats_label)
+
+        # button layout
+        self._button_layout = QHBoxLayout()
+        self._button_layout.addStretch()
+        self._layout.addLayout(self._button_layout)
+
+        # Start/Stop Button
+        self._start_button = QPushButton("Start")
+        self._start_button.clicked.connect(self._on_start_stop_clicked)
+        self._button_layout.addWidget(self._start_button)
+
+        self._stats_timer = QTimer(self)
+        self._stats_timer.timeout.connect(self._update_stats)
+
+    def config(self) -> BurstConfig:
+        return BurstConfig(
+            count=self._count_spinbox.value() or None,
+            duration=self._duration_spinbox.value() or None,
+            increment_id=self._increment_id_checkbox.isChecked(),
+            increment_data=self._increment_data_checkbox.isChecked(),
+            log_frames=self._log_frames_checkbox.isChecked(),
+        )
+
+    @Slot()
+    def _on_start_stop_clicked(self) -> None:
+        stats = self._stats_source()
+        if stats is not None and stats.running:
+            self._stop()
+            self._update_stats()
+            return
+        msg = self._message_source()
+        if msg is None:
+            return
+        try:
+            self._start(msg, self.config())
+        except (can.CanError, ValueError, OSError) as e:
+            self.log_signal.emit(f"Failed to start the burst: {e}", "red")
+            return
+        self._start_button.setText("Stop")
+        self._stats_timer.start(STATS_REFRESH_MS)
+
+    @Slot()
+    def _update_stats(self) -> None:
+        stats = self._stats_source()
+        if stats is None:
+            return
+        self._stats_label.setText(format_burst_stats(stats))
+        if not stats.running and self._stats_timer.isActive():
+            self._stats_timer.stop()
+            self._start_button.setText("Start")
+            self.log_signal.emit(
+                f"Burst finished: {stats.sent} frames, "
+                f"{stats.frames_per_second:.0f} frames/s, "
+                f"{stats.errors} errors, {stats.buffer_full} buffer full",
+                "green",
+            )
+
+    def closeEvent(self, event) -> None:
+        self._stop()
+        self._update_stats()
+        event.accept()
@@ -0,0 +1,107 @@
+from collections.abc import Callable
+
+import can
+from PySide6.QtCore import QTimer, Slot
+from PySide6.QtWidgets import QHBoxLayout, QLabel, QWidget
+
+from ..utils.bus_load import SAMPLE_INTERVAL_S, BusLoadEstimator, BusLoadStats
+from ..utils.frame_store import message_channel
+
+
+class BusLoadIndicator(QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.estimator = BusLoadEstimator()
+        # one estimator per connected channel once more than one is connected;
+        # 'estimator' is the first of them
+        self._estimators: dict[str, BusLoadEstimator] = {}
+        # {channel: fraction of bus time} of frames that are sent without
+        # being seen, polled every sample
+        self._unseen_load_source: Callable[[], dict[str, float]] | None = None
+
+        self._layout = QHBoxLayout()
+        self._layout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(self._layout)
+        self._load_label = QLabel()
+        self._load_label.setToolTip(
+            "Bus load from received and sent frames: current (peak, 1 s / 10 s average)"
+        )
+        self._layout.addWidget(self._load_label)
+        self._show_stats(self.estimator.stats())
+
+        self._sample_timer = QTimer(self)
+        self._sample_timer.timeout.connect(self._on_sample)
+        self._sample_timer.start(round(SAMPLE_INTERVAL_S * 1000))
+
+    def set_bitrates(self, bitrate: int, data_bitrate: int | None = None) -> None:
+        self.estimator.set_bitrates(bitrate, data_bitrate)
+
+    # Connected channels and their (bitrate, data bitrate); estimators of
+    # channels that stay connected keep their history
+    def set_channels(self, bitrates: dict[str, tuple[int, int | None]]) -> None:
+        estimators: dict[str, BusLoadEstimator] = {}
+        for channel, (bitrate, data_bitrate) in bitrates.items():
+            estimator = self._estimators.get(channel)
+            if estimator is None:
+                estimator = BusLoadEstimator()
+            estimator.set_bitrates(bitrate, data_bitrate)
+            estimators[channel] = estimator
+        self._estimators = estimators
+        if estimators:
+            self.estimator = next(iter(estimators.values()))
+        self._show_stats(self.estimator.stats())
+
+    def set_unseen_load_source(
+        self, source: Callable[[], dict[str, float]] | None
+    ) -> None:
+        self._unseen_load_source = source
+
+    @Slot(list)
+    def add_frames(self, msgs: list[can.Message]) -> None:
+        if len(self._estimators) < 2:
+            self.estimator.add_frames(msgs)
+            return
+        # frames of an unknown channel count towards the first one
+        batches: dict[str, list[can.Message]] = {}
+        for msg in msgs:
+            batches.setdefault(message_channel(msg), []).append(msg)
+        for channel, batch in batches.items():
+            self._estimators.get(channel, self.estimator).add_frames(batch)
+
+    @Slot(can.Message)
+    def add_frame(self, msg: can.Message) -> None:
+        self.add_frames([msg])
+
+    @Slot()
+    def reset(self) -> None:
+        for estimator in {self.estimator, *self._estimators.values()}:
+            estimator.reset()
+        self._show_stats(self.estimator.stats())
+
+    @Slot()
+    def _on_sample(self) -> None:
+        if self._unseen_load_source is not None:
+            self._apply_unseen_load(self._unseen_load_source())
+        if len(self._estimators) < 2:
+            self._show_stats(self.estimator.sample())
+            return
+        self._load_label.setText(
+            " | ".join(
+                f"{channel} {estimator.sample().current:5.1f}%"
+                for channel, estimator in self._estimators.items()
+            )
+        )
+
+    def _apply_unseen_load(self, loads: dict[str, float]) -> None:
+        if len(self._estimators) < 2:
+            self.estimator.set_unseen_load(sum(loads.values()))
+            return
+        for channel, estimator in self._estimators.items():
+            estimator.set_unseen_load(loads.get(channel, 0.0))
+
+    def _show_stats(self, stats: BusLoadStats) -> None:
+        self._load_label.setText(
+            f"Load {stats.current:5.1f}% "
+            f"(peak {stats.peak:.1f}%, 1s {stats.average_1s:.1f}%, "
+            f"10s {stats.average_10s:.1f}%)"
+        )
@@ -1,4 +1,4 @@
-from typing import Optional, Tuple, Union
+from typing import Optional
 
 import can
 from PySide6.QtCore import Qt, Signal, Slot
@@ -27,6 +27,8 @@ class ClickableLabel(QLabel):
 class CanMessageEditor(QWidget):
     log_signal = Signal(str, str)
     radix_toggle_signal = Signal()
+    # ID, ID type or data edited (used to update a running periodic send)
+    message_edited_signal = Signal()
 
     def __init__(self, parent=None, initial_radix_type="dec"):
         super().__init__(parent)
@@ -66,6 +68,7 @@ class CanMessageEditor(QWidget):
         self.id_edit = QLineEdit("0")
         self.id_edit.setValidator(QIntValidator())
         self.id_edit.setMinimumWidth(50)
+        self.id_edit.textChanged.connect(self.message_edited_signal)
         self._grid_layout.addWidget(self.id_edit, 0, 1, Qt.AlignmentFlag.AlignBottom)
 
         # Label for DataFrame
@@ -145,16 +148,18 @@ class CanMessageEditor(QWidget):
             self.id_button.setText("ExtID")
         else:
             self.id_button.setText("StdID")
+        self.message_edited_signal.emit()
 
     # returns message and usable(True/False)
-    def get_message(self) -> Tuple[Union[can.Message, None], bool]:
+    def get_message(self, log_errors: bool = True) -> tuple[can.Message | None, bool]:
         dataframe = []
 
         # ID
         id_text = self.id_edit.text()
         if not id_text:
-            print("ID is empty.")
-            self._log("ID is empty.", "red")
+            if log_errors:
+                print("ID is empty.")
+                self._log("ID is empty.", "red")
             return None, False  # msg , usable
         id_value = Validator.decimalize(id_text, self.radix_type)
         # TODO: Validate id_value with maximam number(StdID and ExtID)
@@ -180,8 +185,9 @@ class CanMessageEditor(QWidget):
                     break
 
         if not dataframe:
-            print("DataFrame is empty.")
-            self._log("DataFrame is empty.", "red")
+            if log_errors:
+                print("DataFrame is empty.")
+                self._log("DataFrame is empty.", "red")
             return None, False  # msg , usable
         dlc = len(dataframe)
 
@@ -232,6 +238,7 @@ class CanMessageEditor(QWidget):
         else:
             edit.setStyleSheet(self.style_edit_default)
             edit.setValidator(Validator.dec_validator)
+        edit.textChanged.connect(self.message_edited_signal)
         return edit
 
     def _add_dataframe_row(self) -> None:
@@ -1,121 +1,122 @@
-from dataclasses import dataclass
-from pathlib import Path
-from typing import Any
+import threading
+import time
+from collections.abc import Hashable
 
-from PySide6.QtCore import Signal, Slot
+from PySide6.QtCore import QObject, Signal, Slot
 from PySide6.QtWidgets import QComboBox, QHBoxLayout, QLabel, QPushButton, QWidget
-from serial.tools.list_ports import comports
-
-GsUsb: Any = None
-try:
-    from gs_usb.gs_usb import GsUsb as _GsUsb  # type: ignore[import-untyped]
-except ImportError:
-    pass
-else:
-    GsUsb = _GsUsb
-
-
-@dataclass(frozen=True)
-class CanChannel:
-    interface: str
-    channel: str | int
-    label: str
-
-
-SLCAN_EXCLUDED_KEYWORDS = (
-    "BLUETOOTH",
-    "DEBUG-CONSOLE",
-)
-
-SLCAN_INCLUDED_KEYWORDS = (
-    "CAN",
-    "USB2CAN",
-    "CANABLE",
-    "CANDLELIGHT",
-)
-
-
-def _get_gs_usb_device_label(index: int, device: Any) -> str:
-    return str(index)
-
-
-def _is_slcan_candidate(port_info: Any) -> bool:
-    text = f"{port_info.device} {port_info.description} {port_info.hwid}".upper()
-    if any(keyword in text for keyword in SLCAN_EXCLUDED_KEYWORDS):
-        return False
-    return any(keyword in text for keyword in SLCAN_INCLUDED_KEYWORDS)
-
-
-def _discover_slcan_channels() -> list[CanChannel]:
-    channels: list[CanChannel] = []
-    port_infos = sorted(
-        (port_info for port_info in comports() if _is_slcan_candidate(port_info)),
-        key=lambda port_info: (
-            "CAN" not in f"{port_info.description} {port_info.hwid}".upper(),
-            port_info.device,
-        ),
-    )
-    for port_info in port_infos:
-        port = port_info.device
-        desc = port_info.description
-        label = f"SLCAN - {port}"
-        if desc:
-            label = f"{label} ({desc})"
-        channels.append(CanChannel(interface="slcan", channel=port, label=label))
-    return channels
-
-
-def _discover_gs_usb_channels() -> list[CanChannel]:
-    if GsUsb is None:
-        print("gs_usb is not installed")
-        return []
-
-    channels: list[CanChannel] = []
-    try:
-        devices = GsUsb.scan()
-    except Exception as error:
-        print(f"gs_usb scan failed: {error}")
-        return []
-
-    for index, device in enumerate(devices):
-        device_label = _get_gs_usb_device_label(index, device)
-        channels.append(
-            CanChannel(
-                interface="gs_usb",
-                channel=index,
-                label=f"gs_usb - {device_label}",
-            )
+
+from ..utils.channel_discovery import DISCOVERY_BACKENDS, CanChannel
+
+HOTPLUG_POLL_S = 2.0
+# A backend without a cheap fingerprint (e.g. off Linux) costs a full scan to
+# poll, so it is polled this rarely; Refresh still scans it at once
+UNFINGERPRINTED_POLL_S = 30.0
+
+
+class ChannelDiscovery(QObject):
+    """Scans the CAN backends on a worker thread.
+
+    Each backend reports through ``channels_found`` as soon as it answers.
+    Between full scans the worker polls the backends' cheap fingerprints and
+    rescans only a backend whose devices changed, so plugged adapters show
+    up without pressing Refresh. A backend without a fingerprint is rescanned
+    only every ``UNFINGERPRINTED_POLL_S``.
+    """
+
+    channels_found = Signal(str, list)
+    scan_finished = Signal()
+
+    def __init__(
+        self,
+        parent=None,
+        poll_interval: float = HOTPLUG_POLL_S,
+        unfingerprinted_interval: float = UNFINGERPRINTED_POLL_S,
+    ):
+        super().__init__(parent)
+        self._poll_interval = poll_interval
+        self._unfingerprinted_interval = unfingerprinted_interval
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._full_scan = True
+        self._paused = False
+        self._stopping = False
+        self._fingerprints: dict[str, Hashable | None] = {}
+        # monotonic time of each backend's last scan
+        self._scanned_at: dict[str, float] = {}
+        self._thread = threading.Thread(
+            target=self._run, name="ChannelDiscovery", daemon=True
         )
-    return channels
-
-
-def _discover_socketcan_channels() -> list[CanChannel]:
-    net_dir = Path("/sys/class/net")
-    if not net_dir.exists():
-        return []
-
-    channels: list[CanChannel] = []
-    for net_device in sorted(net_dir.iterdir()):
-        name = net_device.name
-        if name.startswith(("can", "vcan")):
-            channels.append(
-                CanChannel(
-                    interface="socketcan",
-                    channel=name,
-                    label=f"SocketCAN - {name}",
-                )
-            )
-    return channels
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def rescan(self) -> None:
+        with self._lock:
+            self._full_scan = True
+        self._wake.set()
+
+    # Hotplug polling is paused while a channel is open
+    def set_paused(self, paused: bool) -> None:
+        self._paused = paused
+        self._wake.set()
+
+    def stop(self) -> None:
+        self._stopping = True
+        self._wake.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout=1.0)
+
+    def _run(self) -> None:
+        while not self._stopping:
+            # cleared before scanning so requests made meanwhile are not lost
+            self._wake.clear()
+            with self._lock:
+                full_scan = self._full_scan
+                self._full_scan = False
+            if full_scan or not self._paused:
+                self._scan(full_scan)
+            if full_scan:
+                self.scan_finished.emit()
+            self._wake.wait(self._poll_interval)
+
+    def _scan(self, full_scan: bool) -> None:
+        for backend in DISCOVERY_BACKENDS:
+            if self._stopping:
+                return
+            fingerprint = backend.fingerprint()
+            now = time.monotonic()
+            if not full_scan:
+                if fingerprint is None:
+                    scanned_at = self._scanned_at.get(backend.interface)
+                    if (
+                        scanned_at is not None
+                        and now - scanned_at < self._unfingerprinted_interval
+                    ):
+                        continue
+                elif self._fingerprints.get(backend.interface) == fingerprint:
+                    continue
+            self._fingerprints[backend.interface] = fingerprint
+            self._scanned_at[backend.interface] = now
+            self.channels_found.emit(backend.interface, backend.discover())
 
 
 class ChannelSelector(QWidget):
     channel_signal = Signal(str, str, bool)
     mode_signal = Signal(bool)
+    # (channel, interface) of the selection, also sent when it gets connected
+    # or disconnected
+    selection_signal = Signal(str, str)
 
     def __init__(self, parent=None, preferred_interface="slcan"):
         super().__init__(parent)
 
         self._preferred_interface = preferred_interface
+        # Channels per interface, kept between scans
+        self._channels: dict[str, list[CanChannel]] = {}
+        # The preferred interface wins the selection until the first scan ends
+        self._initial_scan = True
+        # (interface, channel) of every connected channel
+        self._connected: set[tuple[str, str]] = set()
 
         # main layout
         self._layout = QHBoxLayout()
@@ -148,57 +149,116 @@ class ChannelSelector(QWidget):
         self._refresh_button.clicked.connect(self._refresh)
         self._layout.addWidget(self._refresh_button)
 
-        self._refresh()
+        self._discovery = ChannelDiscovery(self)
+        self._discovery.channels_found.connect(self._on_channels_found)
+        self._discovery.scan_finished.connect(self._on_scan_finished)
+        self._set_scanning(True)
+        self._discovery.start()
+        self._update_connect_button_enabled()
         self._emit_mode_changed()
 
-    @Slot(bool)
-    def can_connection_change_callback(self, connected: bool) -> None:
+    def shutdown(self) -> None:
+        self._discovery.stop()
+
+    # Several channels can be connected at once; the button connects or
+    # disconnects the selected one
+    @Slot(str, str, bool)
+    def channel_connection_change_callback(
+        self, channel: str, interface: str, connected: bool
+    ) -> None:
         if connected:
-            self.connection_complete()
+            self._connected.add((interface, channel))
         else:
-            self.disconnection_complete()
-
-    def connection_complete(self) -> None:
-        self._connect_button.setText("Disconnect")
-        self._channel_combobox.setEnabled(False)
-        self._mode_combobox.setEnabled(False)
-        self._refresh_button.setEnabled(False)
-
-    def disconnection_complete(self) -> None:
-        self._connect_button.setText("Connect")
-        self._channel_combobox.setEnabled(True)
-        self._mode_combobox.setEnabled(True)
-        self._refresh_button.setEnabled(True)
-        self._update_connect_button_enabled()
-        self._update_mode_availability()
+            self._connected.discard((interface, channel))
+        self._connect_button.setText(
+            "Disconnect" if self._is_connected() else "Connect"
+        )
+        self._refresh_button.setEnabled(
+            not self._connected and self._refresh_button.text() == "Refresh"
+        )
+        self._discovery.set_paused(bool(self._connected))
+        if not self._connected:
+            # channels found while connected were only cached
+            self._update_channel_list()
+        else:
+            self._update_mode_availability()
+        self._emit_selection()
+
+    # Whether the selected channel is connected
+    def _is_connected(self) -> bool:
+        selected = self._channel_combobox.currentData()
+        return (
+            isinstance(selected, CanChannel)
+            and (selected.interface, str(selected.channel)) in self._connected
+        )
+
+    def _set_scanning(self, scanning: bool) -> None:
+        self._refresh_button.setText("Scanning..." if scanning else "Refresh")
+        self._refresh_button.setEnabled(not scanning and not self._connected)
 
     @Slot()
     def _refresh(self) -> None:
-        self._channel_combobox.clear()
+        self._set_scanning(True)
+        self._discovery.rescan()
+
+    @Slot()
+    def _on_scan_finished(self) -> None:
+        self._initial_scan = False
+        self._set_scanning(False)
+
+    @Slot(str, list)
+    def _on_channels_found(self, interface: str, channels: list[CanChannel]) -> None:
+        if self._channels.get(interface) == channels:
+            return
+        self._channels[interface] = channels
+        for channel in channels:
+            print(f" {channel.label}")
+        if not self._connected:
+            self._update_channel_list()
+
+    # Rebuild the combobox from the cache, keeping the current selection
+    def _update_channel_list(self) -> None:
+        selected = self._channel_combobox.currentData()
         channels = [
-            *_discover_slcan_channels(),
-            *_discover_gs_usb_channels(),
-            *_discover_socketcan_channels(),
+            channel
+            for backend in DISCOVERY_BACKENDS
+            for channel in self._channels.get(backend.interface, [])
         ]
-        preferred_index = -1
-        for index, channel in enumerate(channels):
-            print(f" {index}: {channel.label}")
-            self._channel_combobox.addItem(channel.label, channel)
-            if preferred_index < 0 and channel.interface == self._preferred_interface:
-                preferred_index = index
+        index = -1
+        if not self._initial_scan and selected in channels:
+            index = channels.index(selected)
+        if index < 0:
+            index = next(
+                (
+                    i
+                    for i, channel in enumerate(channels)
+                    if channel.interface == self._preferred_interface
+                ),
+                0 if channels else -1,
+            )
 
-        if preferred_index >= 0:
-            self._channel_combobox.setCurrentIndex(preferred_index)
+        self._channel_combobox.blockSignals(True)
+        self._channel_combobox.clear()
+        for channel in channels:
+            self._channel_combobox.addItem(channel.label, channel)
+        self._channel_combobox.setCurrentIndex(index)
+        self._channel_combobox.blockSignals(False)
 
         self._update_connect_button_enabled()
+        self._update_mode_availability()
 
     def _update_connect_button_enabled(self) -> None:
-        if self._connect_button.text() == "Disconnect":
+        if self._is_connected():
             self._connect_button.setEnabled(True)
             return
 
         self._connect_button.setEnabled(self._channel_combobox.count() > 0)
 
+    def _emit_selection(self) -> None:
+        selected = self._channel_combobox.currentData()
+        if isinstance(selected, CanChannel):
+            self.selection_signal.emit(str(selected.channel), selected.interface)
+
     @Slot()
     def _on_connect_button_clicked(self) -> None:
         selected = self._channel_combobox.currentData()
@@ -217,9 +277,17 @@ class ChannelSelector(QWidget):
 
     @Slot()
     def _on_channel_selection_changed(self) -> None:
+        self._connect_button.setText(
+            "Disconnect" if self._is_connected() else "Connect"
+        )
         self._update_mode_availability()
+        self._emit_selection()
 
+    # The mode of a connected channel cannot change
     def _update_mode_availability(self) -> None:
+        if self._is_connected():
+            self._mode_combobox.setEnabled(False)
+            return
         selected = self._channel_combobox.currentData()
         can_fd_available = not (
             isinstance(selected, CanChannel) and selected.interface == "gs_usb"
@@ -1,12 +1,14 @@
+from collections.abc import Callable
 from typing import Optional
 
 from PySide6.QtCore import (
+    QRegularExpression,
     QTimer,
     Signal,
     Slot,
 )
 from PySide6.QtGui import (
-    QIntValidator,
+    QRegularExpressionValidator,
 )
 from PySide6.QtWidgets import (
     QHBoxLayout,
@@ -16,11 +18,17 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
-from ..utils.validator import Validator
+from ..utils.periodic_sender import MODE_NATIVE, PeriodicSendStats
+
+STATS_REFRESH_MS = 500
 
 
 class CommunicationController(QWidget):
     send_can_msg_trigger_signal = Signal()
+    # period in seconds; the receiver answers with set_periodic_running()
+    start_periodic_signal = Signal(float)
+    stop_periodic_signal = Signal()
+    open_burst_signal = Signal()
     log_clear_signal = Signal()
     log_signal = Signal(str, str)
 
@@ -28,6 +36,7 @@ class CommunicationController(QWidget):
         super().__init__()
         self.sendable = False
         self.can_connection_status = False
+        self._stats_source: Callable[[], PeriodicSendStats | None] | None = None
 
         self._layout = QHBoxLayout()
         self._layout.setContentsMargins(0, 0, 0, 0)
@@ -36,11 +45,18 @@ class CommunicationController(QWidget):
         # Interval Label
         self._layout.addWidget(QLabel("Interval (ms):"))
         # Interval Text-Box
+        # fractional milliseconds allow sub-millisecond periods
         self._interval_edit = QLineEdit()
-        self._interval_edit.setValidator(QIntValidator())
+        self._interval_edit.setValidator(
+            QRegularExpressionValidator(QRegularExpression(r"^[0-9]*\.?[0-9]*$"))
+        )
         self._interval_edit.textChanged.connect(self._on_interval_edit_changed_callback)
         self._layout.addWidget(self._interval_edit)
 
+        # Achieved period and jitter of the periodic send
+        self._stats_label = QLabel()
+        self._layout.addWidget(self._stats_label)
+
         # Clear Button
         self._clear_button = QPushButton("Clear")
         self._clear_button.clicked.connect(self._on_clear_pressed_callback)
@@ -51,13 +67,40 @@ class CommunicationController(QWidget):
         self._start_button.clicked.connect(self._on_start_stop_pressed_callback)
         self._layout.addWidget(self._start_button)
 
-        # Periodic Callback with Timer
-        self.interval_send_timer = QTimer()
-        self.interval_send_timer.timeout.connect(self._on_interval_send)
+        # Burst Button
+        self._burst_button = QPushButton("Burst...")
+        self._burst_button.clicked.connect(self.open_burst_signal.emit)
+        self._layout.addWidget(self._burst_button)
+
+        self._stats_timer = QTimer(self)
+        self._stats_timer.timeout.connect(self._update_stats)
 
     @Slot(bool)
     def can_connection_change_callback(self, connected: bool) -> None:
         self.can_connection_status = connected
+        if not connected and self.sendable:
+            self.set_periodic_running(False)
+
+    def set_periodic_stats_source(
+        self, source: Callable[[], PeriodicSendStats | None]
+    ) -> None:
+        self._stats_source = source
+
+    def set_periodic_running(self, running: bool) -> None:
+        self.sendable = running
+        self._on_interval_edit_changed_callback()
+        if running:
+            self._stats_timer.start(STATS_REFRESH_MS)
+            self._update_stats()
+        else:
+            self._stats_timer.stop()
+
+    def _interval_ms(self) -> float | None:
+        try:
+            interval = float(self._interval_edit.text())
+        except ValueError:
+            return None
+        return interval if interval > 0 else None
 
     def _log(self, text: str, color: Optional[str] = None) -> None:
         self.log_signal.emit(text, color)
@@ -66,16 +109,12 @@ class CommunicationController(QWidget):
     # If the text box is blank or has a value less than or equal to 0, the button text changes to "Send".
     @Slot()
     def _on_interval_edit_changed_callback(self) -> None:
-        if (
-            self._interval_edit.text() == ""
-            or Validator.decimalize(self._interval_edit.text()) <= 0
-        ):
+        if self.sendable:
+            self._start_button.setText("Stop")
+        elif self._interval_ms() is None:
             self._start_button.setText("Send")
         else:
-            if self.sendable:
-                self._start_button.setText("Stop")
-            else:
-                self._start_button.setText("Start")
+            self._start_button.setText("Start")
 
     @Slot()
     def _on_clear_pressed_callback(self) -> None:
@@ -83,7 +122,7 @@ class CommunicationController(QWidget):
 
     # When the start/stop button is pressed, this function is called.
     # If the button text is "Send", the send_can_msg_trigger_signal is emitted.
-    # If the button text is "Start", the 'interval_send_timer' is started with the interval value from the text box, and the button text is changed to "Stop".
+    # If the button text is "Start", the start_periodic_signal is emitted with the interval from the text box.
     @Slot()
     def _on_start_stop_pressed_callback(self) -> None:
         if not self.can_connection_status:
@@ -91,22 +130,32 @@ class CommunicationController(QWidget):
             return
 
         if self.sendable:
-            self.interval_send_timer.stop()
-            self.sendable = False
-            self._start_button.setText("Start")
+            self.stop_periodic_signal.emit()
+            self.set_periodic_running(False)
             self._log("Stopped sending data")
         else:
-            interval_text: str = self._interval_edit.text()
-            if interval_text == "" or Validator.decimalize(interval_text) <= 0:
+            interval_ms = self._interval_ms()
+            if interval_ms is None:
                 self.send_can_msg_trigger_signal.emit()
                 # self._log("Sent data once")
             else:
-                interval_value = Validator.decimalize(interval_text)
-                self.interval_send_timer.start(interval_value)
-                self._start_button.setText("Stop")
-                self.sendable = True
-                self._log(f"Started sending data every {interval_value}ms")
+                self.start_periodic_signal.emit(interval_ms / 1000)
 
     @Slot()
-    def _on_interval_send(self) -> None:
-        self.send_can_msg_trigger_signal.emit()
+    def _update_stats(self) -> None:
+        stats = self._stats_source() if self._stats_source is not None else None
+        if stats is None:
+            return
+        if stats.mode == MODE_NATIVE and not stats.sent:
+            # no loopback of the kernel's sends (yet)
+            self._stats_label.setText(f"{stats.mode} {stats.period * 1000:g} ms")
+            return
+        text = f"sent {stats.sent}"
+        if stats.period_mean is not None and stats.jitter is not None:
+            text += (
+                f" | period {stats.period_mean * 1000:.3f} ms"
+                f" | jitter {stats.jitter * 1000:.3f} ms"
+            )
+        if stats.errors:
+            text += f" | errors {stats.errors}"
+        self._stats_label.setText(text)
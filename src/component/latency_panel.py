@@ -0,0 +1,56 @@
+from PySide6.QtCore import QTimer, Slot
+from PySide6.QtWidgets import QHBoxLayout, QLabel, QPushButton, QWidget
+
+from ..utils.latency_histogram import LatencyHistogram, LatencyStats
+
+REFRESH_MS = 500
+
+
+def _format_ms(value: float | None) -> str:
+    if value is None:
+        return "-"
+    return f"{value * 1000:.1f} ms"
+
+
+def format_latency_stats(stats: LatencyStats) -> str:
+    return (
+        f"Latency p50 {_format_ms(stats.p50)} | p99 {_format_ms(stats.p99)} | "
+        f"max {_format_ms(stats.max)}"
+    )
+
+
+class LatencyPanel(QWidget):
+    """Shows how stale the log is: frame timestamp to the paint showing it."""
+
+    def __init__(self, histogram: LatencyHistogram, parent=None):
+        super().__init__(parent)
+        self._histogram = histogram
+
+        self._layout = QHBoxLayout()
+        self._layout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(self._layout)
+        self._latency_label = QLabel()
+        self._latency_label.setToolTip(
+            "Time from the frame timestamp to the log paint that shows it "
+            "(frames of connected channels, sampled per batch)"
+        )
+        self._layout.addWidget(self._latency_label)
+
+        # Button for reset the histogram
+        reset_button = QPushButton("Reset")
+        reset_button.clicked.connect(self.reset)
+        self._layout.addWidget(reset_button)
+
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.timeout.connect(self.refresh)
+        self._refresh_timer.start(REFRESH_MS)
+        self.refresh()
+
+    @Slot()
+    def refresh(self) -> None:
+        self._latency_label.setText(format_latency_stats(self._histogram.stats()))
+
+    @Slot()
+    def reset(self) -> None:
+        self._histogram.reset()
+        self.refresh()
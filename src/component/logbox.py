@@ -1,127 +1,527 @@
+import math
+import re
+import time
+from array import array
 from datetime import datetime
-from typing import Optional
+from typing import Any, cast
 
 import can
-from PySide6.QtCore import Slot
-from PySide6.QtGui import QFont, QTextCursor
-from PySide6.QtWidgets import QTextEdit
+from PySide6.QtCore import (
+    QAbstractTableModel,
+    QModelIndex,
+    QPersistentModelIndex,
+    Qt,
+    Signal,
+    Slot,
+)
+from PySide6.QtGui import QColor, QFont
+from PySide6.QtWidgets import QAbstractItemView, QHeaderView, QTableView
 
+from ..utils.capture_file import CaptureFile
+from ..utils.frame_store import (
+    FLAG_ERROR,
+    FLAG_EXTENDED,
+    FLAG_RX,
+    FLAG_TEXT,
+    FrameRow,
+    FrameStore,
+    HistoryStats,
+)
+from ..utils.latency_histogram import LatencyHistogram
+from ..utils.pipeline_stats import RenderCounters
+from ..utils.signal_decoder import SignalDecoder
+from .table_model import ROOT_INDEX
+
+_HTML_TAG_PATTERN = re.compile(r"<[^>]+>")
+
+# Frames sampled per batch for the arrival-to-paint latency, and how many
+# samples can wait for the next paint
+LATENCY_SAMPLES_PER_BATCH = 32
+MAX_PENDING_LATENCY_SAMPLES = 256
+
+# How the Time column is shown
+TIME_MODE_ABSOLUTE = "absolute"  # wall clock of the frame timestamp
+TIME_MODE_RELATIVE = "relative"  # seconds since the first frame
+TIME_MODE_DELTA = "delta"  # seconds since the previous frame with the same ID
+TIME_MODES = (TIME_MODE_ABSOLUTE, TIME_MODE_RELATIVE, TIME_MODE_DELTA)
+_TIME_MODE_LABELS = {
+    TIME_MODE_ABSOLUTE: "Time",
+    TIME_MODE_RELATIVE: "Time (rel)",
+    TIME_MODE_DELTA: "Time (Δ ID)",
+}
+
+# color setting with message direction and ID type
+# RX: orange, TX: blue
+# EXT: light blue, STD: blue
+_RX_EXT_COLOR = QColor("#FFA22B")  # orange
+_RX_STD_COLOR = QColor("#EC4954")  # red
+_TX_EXT_COLOR = QColor("#33C0FF")  # light blue
+_TX_STD_COLOR = QColor("#2C4AFF")  # blue
+
+
+class CanLogModel(QAbstractTableModel):
+    COLUMN_TIME = 0
+    COLUMN_CHANNEL = 1
+    COLUMN_DIR = 2
+    COLUMN_ID = 3
+    COLUMN_DLC = 4
+    COLUMN_DATA = 5
+    COLUMN_DECODED = 6
+    HEADERS = ("Time", "Channel", "Dir", "ID", "DLC", "Data", "Decoded")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._store = FrameStore()
+        # An opened capture file replaces the live history while it is shown
+        self._capture: CaptureFile | None = None
+        self._time_mode = TIME_MODE_ABSOLUTE
+        self.render_counters = RenderCounters()
+        self._signal_decoder: SignalDecoder | None = None
+
+    def _rows(self) -> FrameStore | CaptureFile:
+        return self._capture if self._capture is not None else self._store
+
+    def time_mode(self) -> str:
+        return self._time_mode
+
+    def set_time_mode(self, time_mode: str) -> None:
+        if time_mode not in TIME_MODES:
+            raise ValueError(f"Unknown time mode: {time_mode}")
+        if time_mode == self._time_mode:
+            return
+        self._time_mode = time_mode
+        self.headerDataChanged.emit(
+            Qt.Orientation.Horizontal, self.COLUMN_TIME, self.COLUMN_TIME
+        )
+        row_count = len(self._rows())
+        if row_count:
+            self.dataChanged.emit(
+                self.index(0, self.COLUMN_TIME),
+                self.index(row_count - 1, self.COLUMN_TIME),
+                [Qt.ItemDataRole.DisplayRole],
+            )
+
+    # Signals are decoded when a cell is shown, like every other column
+    def set_signal_decoder(self, decoder: SignalDecoder | None) -> None:
+        self._signal_decoder = decoder
+        row_count = len(self._rows())
+        if row_count:
+            self.dataChanged.emit(
+                self.index(0, self.COLUMN_DECODED),
+                self.index(row_count - 1, self.COLUMN_DECODED),
+                [Qt.ItemDataRole.DisplayRole],
+            )
+
+    def rowCount(self, parent: QModelIndex | QPersistentModelIndex = ROOT_INDEX) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._rows())
+
+    def columnCount(
+        self, parent: QModelIndex | QPersistentModelIndex = ROOT_INDEX
+    ) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.HEADERS)
+
+    def headerData(
+        self,
+        section: int,
+        orientation: Qt.Orientation,
+        role: int = Qt.ItemDataRole.DisplayRole,
+    ) -> Any:
+        if (
+            role == Qt.ItemDataRole.DisplayRole
+            and orientation == Qt.Orientation.Horizontal
+        ):
+            if section == self.COLUMN_TIME:
+                return _TIME_MODE_LABELS[self._time_mode]
+            return self.HEADERS[section]
+        return None
+
+    # Rows are formatted here, so only the rows on screen are ever converted to text
+    def data(
+        self,
+        index: QModelIndex | QPersistentModelIndex,
+        role: int = Qt.ItemDataRole.DisplayRole,
+    ) -> Any:
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            started = time.perf_counter_ns()
+            text = self._format_cell(self._rows().row(index.row()), index.column())
+            counters = self.render_counters
+            counters.formatted += 1
+            counters.format_ns += time.perf_counter_ns() - started
+            return text
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return self._row_color(self._rows().row(index.row()))
+        return None
+
+    def append_messages(self, msgs: list[can.Message]) -> None:
+        if not msgs:
+            return
+        if self._capture is not None:
+            # keep recording live frames without showing them
+            for msg in msgs:
+                self._store.append_message(msg)
+            self._store.evict(self._store.eviction_count())
+            return
+        self.render_counters.rendered += len(msgs)
+        first = len(self._store)
+        self.beginInsertRows(ROOT_INDEX, first, first + len(msgs) - 1)
+        append_message = self._store.append_message
+        for msg in msgs:
+            append_message(msg)
+        self.endInsertRows()
+        self._evict_over_limit()
+
+    def append_text(self, text: str, color: str | None, timestamp: float) -> None:
+        if self._capture is not None:
+            self._store.append_text(text, color, timestamp)
+            self._store.evict(self._store.eviction_count())
+            return
+        row = len(self._store)
+        self.beginInsertRows(ROOT_INDEX, row, row)
+        self._store.append_text(text, color, timestamp)
+        self.endInsertRows()
+        self._evict_over_limit()
+
+    def set_history_limits(
+        self,
+        max_frames: int | None,
+        max_bytes: int | None,
+        spill_path: str | None,
+    ) -> None:
+        self._store.set_limits(max_frames, max_bytes, spill_path)
+        self._evict_over_limit()
+
+    def history_stats(self) -> HistoryStats:
+        return self._store.stats()
+
+    def close(self) -> None:
+        self.close_capture()
+        self._store.close_spill()
+
+    def capture(self) -> CaptureFile | None:
+        return self._capture
+
+    def open_capture(self, capture: CaptureFile) -> None:
+        previous = self._capture
+        self.beginResetModel()
+        self._capture = capture
+        self.endResetModel()
+        if previous is not None:
+            previous.close()
+
+    # Go back to the live history
+    def close_capture(self) -> None:
+        capture = self._capture
+        if capture is None:
+            return
+        self.beginResetModel()
+        self._capture = None
+        self.endResetModel()
+        capture.close()
+
+    def start_timestamp(self) -> float | None:
+        return self._rows().start_timestamp
+
+    # channels of the live history; capture files carry no channel
+    def channels(self) -> list[str]:
+        if self._capture is not None:
+            return []
+        return self._store.channels()
+
+    def index_at_time(self, timestamp: float) -> int:
+        return self._rows().index_at_time(timestamp)
+
+    def next_index_for_id(
+        self, arbitration_id: int, is_extended_id: bool, index: int = -1
+    ) -> int | None:
+        return self._rows().next_index_for_id(arbitration_id, is_extended_id, index)
+
+    def _evict_over_limit(self) -> None:
+        count = self._store.eviction_count()
+        if count <= 0:
+            return
+        self.beginRemoveRows(ROOT_INDEX, 0, count - 1)
+        self._store.evict(count)
+        self.endRemoveRows()
+
+    def clear(self) -> None:
+        self.beginResetModel()
+        self._store.clear()
+        self.endResetModel()
+
+    def _format_cell(self, row: FrameRow, column: int) -> str:
+        if column == self.COLUMN_TIME:
+            return self._format_time(row)
+
+        if row.flags & FLAG_TEXT:
+            if column == self.COLUMN_DATA:
+                text, _ = cast(tuple[str, str | None], row.payload)
+                return text
+            return ""
+
+        if column == self.COLUMN_CHANNEL:
+            return row.channel
+        if column == self.COLUMN_DIR:
+            direction = "RX" if row.flags & FLAG_RX else "TX"
+            return f"{direction}:{'E' if row.flags & FLAG_ERROR else ' '}"
+        if column == self.COLUMN_ID:
+            # make ID string with message ID type(Std/Ext)
+            if row.flags & FLAG_EXTENDED:
+                return f"EXT {row.arbitration_id:08X}"
+            return f"STD _____{row.arbitration_id:03X}"
+        if column == self.COLUMN_DLC:
+            return str(row.dlc)
+        if column == self.COLUMN_DATA:
+            data: bytes = row.payload  # type: ignore[assignment]
+            if len(data) > 8:
+                return " | ".join(
+                    data[i : i + 8].hex(" ").upper() for i in range(0, len(data), 8)
+                )
+            return data.hex(" ").upper()
+        if column == self.COLUMN_DECODED:
+            decoder = self._signal_decoder
+            if decoder is None or row.flags & FLAG_ERROR:
+                return ""
+            return decoder.format(
+                row.arbitration_id,
+                bool(row.flags & FLAG_EXTENDED),
+                row.payload,  # type: ignore[arg-type]
+            )
+        return ""
+
+    def _format_time(self, row: FrameRow) -> str:
+        if self._time_mode == TIME_MODE_RELATIVE:
+            start = self._rows().start_timestamp
+            if start is None:
+                return ""
+            return f"{row.timestamp - start:.6f}"
+        if self._time_mode == TIME_MODE_DELTA:
+            if math.isnan(row.delta):
+                return ""
+            return f"{row.delta:.6f}"
+        return datetime.fromtimestamp(row.timestamp).strftime("%H:%M:%S.%f")
+
+    def _row_color(self, row: FrameRow) -> QColor | None:
+        if row.flags & FLAG_TEXT:
+            _, color = row.payload  # type: ignore[misc]
+            return QColor(color) if color else None
+        if row.flags & FLAG_RX:
+            return _RX_EXT_COLOR if row.flags & FLAG_EXTENDED else _RX_STD_COLOR
+        return _TX_EXT_COLOR if row.flags & FLAG_EXTENDED else _TX_STD_COLOR
+
+
+class LogBox(QTableView):
+    history_stats_signal = Signal(HistoryStats)
+    time_mode_signal = Signal(str)
 
-class LogBox(QTextEdit):
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setReadOnly(True)
+        self._model = CanLogModel(self)
+        self.setModel(self._model)
+
         self.setFont(QFont("Menlo", 14))
-        self.setLineWrapMode(QTextEdit.LineWrapMode.NoWrap)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.setShowGrid(False)
+        self.setWordWrap(False)
+        self.setHorizontalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+
+        # Fixed row heights let the view map scroll position to rows without
+        # measuring every row, so huge logs scroll smoothly.
+        vertical_header = self.verticalHeader()
+        vertical_header.setVisible(False)
+        vertical_header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        vertical_header.setDefaultSectionSize(self.fontMetrics().height() + 4)
+
+        horizontal_header = self.horizontalHeader()
+        horizontal_header.setStretchLastSection(True)
+        horizontal_header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        # Click the Time header to switch between absolute/relative/delta time
+        horizontal_header.sectionClicked.connect(self._on_header_clicked)
+        char_width = self.fontMetrics().horizontalAdvance("0")
+        self.setColumnWidth(CanLogModel.COLUMN_TIME, char_width * 16)
+        self.setColumnWidth(CanLogModel.COLUMN_CHANNEL, char_width * 9)
+        # shown once frames of more than one channel were logged
+        self.setColumnHidden(CanLogModel.COLUMN_CHANNEL, True)
+        self.setColumnWidth(CanLogModel.COLUMN_DIR, char_width * 5)
+        self.setColumnWidth(CanLogModel.COLUMN_ID, char_width * 14)
+        self.setColumnWidth(CanLogModel.COLUMN_DLC, char_width * 5)
+        self.setColumnWidth(CanLogModel.COLUMN_DATA, char_width * 3 * 8 + 8)
+        # shown while a signal database is loaded
+        self.setColumnHidden(CanLogModel.COLUMN_DECODED, True)
+
+        # Time from the frame timestamp to the paint that shows it, for
+        # frames of connected channels (replayed frames keep old timestamps).
+        # Samples are kept in fixed arrays until the next paint.
+        self.latency_histogram = LatencyHistogram()
+        self._live_channels: frozenset[str] = frozenset()
+        self._latency_timestamps = array("d", bytes(8 * MAX_PENDING_LATENCY_SAMPLES))
+        # number of frames each sample stands for
+        self._latency_weights = array("I", bytes(4 * MAX_PENDING_LATENCY_SAMPLES))
+        self._pending_latency_samples = 0
 
     # show log to logbox
     @Slot(str, str)
-    def log(self, text: str, color: Optional[str] = None) -> None:
-        if color is None:
-            if "<font" in text or "<span" in text:
-                self._append_html(text)
-            else:
-                self.append(text)
-        else:
-            self._append_html(f"<font color='{color}'>{text}</font>")
+    def log(self, text: str, color: str | None = None) -> None:
+        follow = self._is_at_bottom()
+        self._model.append_text(_HTML_TAG_PATTERN.sub("", text), color, time.time())
+        if follow:
+            self.scrollToBottom()
+        self.history_stats_signal.emit(self._model.history_stats())
 
-    def _append_html(self, html: str) -> None:
-        cursor = self.textCursor()
-        cursor.movePosition(QTextCursor.MoveOperation.End)
-        cursor.insertHtml(html)
-        cursor.insertBlock()
-        self.setTextCursor(cursor)
+    # show a batch of received can messages to logbox
+    @Slot(list)
+    def can_msg_batch_log(self, msgs: list[can.Message]) -> None:
+        follow = self._is_at_bottom()
+        self._model.append_messages(msgs)
+        self._update_channel_column()
+        if follow:
+            self.scrollToBottom()
+            # rows only get painted while they are scrolled into view
+            if self._live_channels and self.isVisible():
+                self._sample_latency(msgs)
+        self.history_stats_signal.emit(self._model.history_stats())
 
     # show can message to logbox
     @Slot(can.Message)
     def can_msg_log(self, msg: can.Message) -> None:
-        dir = ""
         if msg is None:
             return
+        self.can_msg_batch_log([msg])
 
-        # color setting with message direction and ID type
-        # RX: orange, TX: blue
-        # EXT: light blue, STD: blue
-        color: str = ""
-        if msg.is_rx:
-            if msg.is_extended_id:
-                color = "#FFA22B"  # orange
-            else:
-                color = "#EC4954"  # red
-            dir = "RX"
-        else:
-            if msg.is_extended_id:
-                color = "#33C0FF"  # light blue
-            else:
-                color = "#2C4AFF"  # blue
-            dir = "TX"
-
-        # make ID string with message ID type(Std/Ext)
-        if msg.is_extended_id:
-            id_str = f"{msg.arbitration_id:08x}"
+    # Clearing while a capture file is shown returns to the live log
+    @Slot()
+    def clear(self) -> None:
+        if self._model.capture() is not None:
+            self._model.close_capture()
         else:
-            id_str = "_____" + f"{msg.arbitration_id:03x}"
+            self._model.clear()
+        self._update_channel_column()
+        self.history_stats_signal.emit(self._model.history_stats())
 
-        ms_timestamp = datetime.now().strftime("%M:%S:%f")[:-3]
-        data_bytes = list(msg.data) if msg.data is not None else []
-        if msg.is_fd and len(data_bytes) > 8:
-            data_html = self._format_fd_data_with_gradient(
-                data_bytes, is_tx=not msg.is_rx
-            )
-            prefix = (
-                f"time:{ms_timestamp}\t{dir}:{'E' if msg.is_error_frame else ' '} "
-                f"{'EXT' if msg.is_extended_id else 'STD'}ID:{id_str.upper()} data:"
-            )
-            self.log(f"<font color='{color}'>{prefix}</font> {data_html}")
-        else:
-            data_str = " ".join(f"{byte:02x}".upper() for byte in data_bytes)
-            text = f"time:{ms_timestamp}\t{dir}:{'E' if msg.is_error_frame else ' '} {'EXT' if msg.is_extended_id else 'STD'}ID:{id_str.upper()} data:{data_str}"
-            self.log(text, color=color)
-
-    def _format_fd_data_with_gradient(self, data_bytes: list[int], is_tx: bool) -> str:
-        if is_tx:
-            start_color = "#2C4AFF"
-            end_color = "#FF00FF"
-        else:
-            start_color = "#EC4954"
-            end_color = "#FFA22B"
-
-        chunks = [data_bytes[i : i + 8] for i in range(0, len(data_bytes), 8)]
-        steps = max(2, min(8, len(chunks)))
-        colors = self._interpolate_colors(start_color, end_color, steps)
-        segments = []
-        for index, chunk in enumerate(chunks):
-            color = colors[min(index, len(colors) - 1)]
-            segment = " ".join(f"{byte:02x}".upper() for byte in chunk)
-            segments.append(f"<font color='{color}'>{segment}</font>")
-        return " | ".join(segments)
-
-    def _interpolate_colors(
-        self, start_hex: str, end_hex: str, steps: int
-    ) -> list[str]:
-        def hex_to_rgb(hex_color: str) -> tuple[int, int, int]:
-            hex_color = hex_color.lstrip("#")
-            return (
-                int(hex_color[0:2], 16),
-                int(hex_color[2:4], 16),
-                int(hex_color[4:6], 16),
-            )
+    # Show a capture file instead of the live log, read straight from disk
+    def open_capture(self, capture: CaptureFile) -> None:
+        self._model.open_capture(capture)
+        self._update_channel_column()
+        self.scrollToTop()
 
-        def rgb_to_hex(rgb: tuple[int, int, int]) -> str:
-            return "#{:02X}{:02X}{:02X}".format(*rgb)
-
-        start = hex_to_rgb(start_hex)
-        end = hex_to_rgb(end_hex)
-        if steps <= 1:
-            return [rgb_to_hex(start)]
-
-        colors = []
-        for index in range(steps):
-            ratio = index / (steps - 1)
-            rgb = (
-                round(start[0] + (end[0] - start[0]) * ratio),
-                round(start[1] + (end[1] - start[1]) * ratio),
-                round(start[2] + (end[2] - start[2]) * ratio),
-            )
-            colors.append(rgb_to_hex(rgb))
-        return colors
+    def close_capture(self) -> None:
+        self._model.close_capture()
+        self._update_channel_column()
+        self.scrollToBottom()
+
+    def _update_channel_column(self) -> None:
+        hidden = len(self._model.channels()) < 2
+        if hidden != self.isColumnHidden(CanLogModel.COLUMN_CHANNEL):
+            self.setColumnHidden(CanLogModel.COLUMN_CHANNEL, hidden)
+
+    # Jump to the first frame at 'seconds' after the first one
+    def scroll_to_time(self, seconds: float) -> None:
+        start = self._model.start_timestamp()
+        if start is None:
+            return
+        self._select_row(self._model.index_at_time(start + seconds))
+
+    # Jump to the next frame of an ID after the current row; wraps around
+    def scroll_to_next_id(self, arbitration_id: int, is_extended_id: bool) -> bool:
+        current = self.currentIndex().row() if self.currentIndex().isValid() else -1
+        row = self._model.next_index_for_id(arbitration_id, is_extended_id, current)
+        if row is None and current >= 0:
+            row = self._model.next_index_for_id(arbitration_id, is_extended_id)
+        if row is None:
+            return False
+        self._select_row(row)
+        return True
+
+    def _select_row(self, row: int) -> None:
+        row = min(row, self._model.rowCount() - 1)
+        if row < 0:
+            return
+        index = self._model.index(row, CanLogModel.COLUMN_TIME)
+        self.setCurrentIndex(index)
+        self.scrollTo(index, QAbstractItemView.ScrollHint.PositionAtCenter)
+
+    # Limit how much history the log keeps. None means unlimited.
+    def set_history_limits(
+        self,
+        max_frames: int | None,
+        max_mb: float | None = None,
+        spill_path: str | None = None,
+    ) -> None:
+        max_bytes = int(max_mb * 1024 * 1024) if max_mb is not None else None
+        self._model.set_history_limits(max_frames, max_bytes, spill_path)
+        self.history_stats_signal.emit(self._model.history_stats())
+
+    def history_stats(self) -> HistoryStats:
+        return self._model.history_stats()
+
+    def set_signal_decoder(self, decoder: SignalDecoder | None) -> None:
+        self._model.set_signal_decoder(decoder)
+        self.setColumnHidden(CanLogModel.COLUMN_DECODED, decoder is None)
+
+    def render_counters(self) -> RenderCounters:
+        return self._model.render_counters
+
+    def close_history(self) -> None:
+        self._model.close()
+
+    def time_mode(self) -> str:
+        return self._model.time_mode()
+
+    @Slot(str)
+    def set_time_mode(self, time_mode: str) -> None:
+        self._model.set_time_mode(time_mode)
+        self.time_mode_signal.emit(time_mode)
+
+    @Slot()
+    def cycle_time_mode(self) -> None:
+        index = TIME_MODES.index(self._model.time_mode())
+        self.set_time_mode(TIME_MODES[(index + 1) % len(TIME_MODES)])
+
+    @Slot(int)
+    def _on_header_clicked(self, section: int) -> None:
+        if section == CanLogModel.COLUMN_TIME:
+            self.cycle_time_mode()
+
+    # Channels whose frame timestamps are arrival times
+    def set_live_channels(self, channels: list[str]) -> None:
+        self._live_channels = frozenset(channels)
+
+    def _sample_latency(self, msgs: list[can.Message]) -> None:
+        stride = max(1, len(msgs) // LATENCY_SAMPLES_PER_BATCH)
+        pending = self._pending_latency_samples
+        live_channels = self._live_channels
+        for start in range(0, len(msgs), stride):
+            if pending >= MAX_PENDING_LATENCY_SAMPLES:
+                break
+            msg = msgs[start]
+            if msg.channel not in live_channels:
+                continue
+            self._latency_timestamps[pending] = msg.timestamp
+            self._latency_weights[pending] = min(stride, len(msgs) - start)
+            pending += 1
+        self._pending_latency_samples = pending
+
+    def paintEvent(self, event) -> None:
+        super().paintEvent(event)
+        if not self._pending_latency_samples:
+            return
+        now = time.time()
+        record = self.latency_histogram.record
+        for index in range(self._pending_latency_samples):
+            record(now - self._latency_timestamps[index], self._latency_weights[index])
+        self._pending_latency_samples = 0
+
+    # Frames that arrived while hidden were never shown on time
+    def hideEvent(self, event) -> None:
+        self._pending_latency_samples = 0
+        super().hideEvent(event)
+
+    def _is_at_bottom(self) -> bool:
+        scroll_bar = self.verticalScrollBar()
+        return scroll_bar.value() >= scroll_bar.maximum()
@@ -1,44 +1,88 @@
 from typing import cast
 
-from PySide6.QtCore import Qt, QTimer, Signal, Slot
+from PySide6.QtCore import Qt, Signal, Slot
 from PySide6.QtGui import QKeyEvent
 from PySide6.QtWidgets import (
     QCheckBox,
+    QComboBox,
     QHBoxLayout,
+    QLabel,
     QLineEdit,
     QPushButton,
     QTableWidget,
+    QTableWidgetItem,
     QVBoxLayout,
     QWidget,
 )
 
+from ..utils.id_filter import (
+    FILTER_MODE_BLOCK,
+    FILTER_MODE_PASS,
+    ID_SPACE_ANY,
+    ID_SPACE_EXT,
+    ID_SPACE_STD,
+    ChannelIdFilters,
+    FilterRule,
+    convert_filter_text_radix,
+    parse_filter_rule,
+)
 from ..utils.validator import Validator
 
+COLUMN_ID = 0
+COLUMN_TYPE = 1
+COLUMN_CHANNEL = 2
+COLUMN_MEMO = 3
+COLUMN_ENABLE = 4
+COLUMN_WHERE = 5
+
+ID_SPACE_LABELS = (
+    ("Any", ID_SPACE_ANY),
+    ("Std", ID_SPACE_STD),
+    ("Ext", ID_SPACE_EXT),
+)
+FILTER_MODE_LABELS = (
+    ("Block listed IDs", FILTER_MODE_BLOCK),
+    ("Pass listed IDs only", FILTER_MODE_PASS),
+)
+
 
 class MessageFilter(QWidget):
-    update_filter_id_signal = Signal(list)
+    update_filter_signal = Signal(ChannelIdFilters)
 
     def __init__(self, initial_radix_type="dec"):
         super().__init__()
         self.radix_type = initial_radix_type
-        self.ignore_ids = []
+        self.id_filter = ChannelIdFilters.accept_all()
+        # table row of each rule in 'id_filter' and where each rule runs on
+        # each connected channel
+        self._rule_rows: list[int] = []
+        self._rule_placements: dict[str, list[str]] = {}
+        # set while several cells are rewritten at once (radix change, clear)
+        self._suspend_updates = False
 
         # color style
         self.style_edit_default = ""
         self.style_edit_hex = """color: #0082FF;
                             font-weight: bold;"""
 
-        # Timer for get table data
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_ignore_ids)
-        self.timer.start(100)
-
         # layout
         self._layout = QVBoxLayout()
         self.setLayout(self._layout)
 
+        # Filter mode (block-list / pass-list)
+        self._mode_layout = QHBoxLayout()
+        self._mode_layout.addWidget(QLabel("Mode"))
+        self._mode_combobox = QComboBox()
+        for label, mode in FILTER_MODE_LABELS:
+            self._mode_combobox.addItem(label, mode)
+        self._mode_combobox.currentIndexChanged.connect(self.update_filter)
+        self._mode_layout.addWidget(self._mode_combobox)
+        self._layout.addLayout(self._mode_layout)
+
+        # The filter is rebuilt only when a cell is edited, not polled
         self._table = self.FilterTable(initial_radix_type)
         self._table.setRowCount(6)
+        self._table.contents_changed_signal.connect(self.update_filter)
         self._layout.addWidget(self._table)
 
         # button layout
@@ -52,54 +96,133 @@ class MessageFilter(QWidget):
 
         # Button for clear table
         clear_button = QPushButton("Clear")
-        clear_button.clicked.connect(self._table.clear)
+        clear_button.clicked.connect(self.clear)
         self._button_layout.addWidget(clear_button)
 
-    @Slot(str)
-    def update_ignore_ids(self) -> None:
-        ignore_ids = []
+    @Slot()
+    def update_filter(self) -> None:
+        if self._suspend_updates:
+            return
+        rules: list[tuple[FilterRule, str | None]] = []
+        rule_rows: list[int] = []
         for row in range(self._table.rowCount()):
-            id_edit = cast(QLineEdit | None, self._table.cellWidget(row, 0))
-            checkbox_widget = self._table.cellWidget(row, 2)
+            id_edit = cast(QLineEdit | None, self._table.cellWidget(row, COLUMN_ID))
+            type_combobox = cast(
+                QComboBox | None, self._table.cellWidget(row, COLUMN_TYPE)
+            )
+            channel_combobox = cast(
+                QComboBox | None, self._table.cellWidget(row, COLUMN_CHANNEL)
+            )
+            checkbox_widget = self._table.cellWidget(row, COLUMN_ENABLE)
             checkbox = checkbox_widget.findChild(QCheckBox) if checkbox_widget else None
-            if id_edit and checkbox and checkbox.isChecked():
+            if id_edit and type_combobox and checkbox and checkbox.isChecked():
                 text = id_edit.text()
-                if text:
-                    ignore_ids.append(Validator.decimalize(text, self.radix_type))
-        self.ignore_ids = ignore_ids
-        self.update_filter_id_signal.emit(ignore_ids)
-
-    def get_ignore_ids(self) -> list:
-        return self.ignore_ids
+                if not text:
+                    continue
+                try:
+                    rule = parse_filter_rule(
+                        text, self.radix_type, type_combobox.currentData()
+                    )
+                except ValueError:
+                    # incomplete entry such as "100-" while typing
+                    continue
+                channel = channel_combobox.currentData() if channel_combobox else None
+                rules.append((rule, channel))
+                rule_rows.append(row)
+
+        # Only compile and notify when the filter itself has changed
+        mode = self._mode_combobox.currentData()
+        if mode == self.id_filter.mode and tuple(rules) == self.id_filter.rules:
+            if rule_rows != self._rule_rows:
+                self._rule_rows = rule_rows
+                self._show_rule_placement()
+            return
+        self.id_filter = ChannelIdFilters(rules, mode)
+        self._rule_rows = rule_rows
+        self._show_rule_placement()
+        self.update_filter_signal.emit(self.id_filter)
+
+    def get_filter(self) -> ChannelIdFilters:
+        return self.id_filter
+
+    # Channels that can be picked for a rule; a channel stays selectable
+    # after it is disconnected
+    def set_channels(self, channels: list[str]) -> None:
+        for channel in channels:
+            self._table.add_channel(channel)
+
+    # Show where each rule runs (kernel, python-can or software) on each
+    # channel, keyed by channel ("" while disconnected)
+    @Slot(dict)
+    def set_rule_placement(self, placements: dict[str, list[str]]) -> None:
+        self._rule_placements = placements
+        self._show_rule_placement()
+
+    def _show_rule_placement(self) -> None:
+        # placement of each rule on each channel it runs on
+        rule_labels: list[dict[str, str]] = [{} for _ in self._rule_rows]
+        for channel, channel_rule_labels in self._rule_placements.items():
+            indices = self.id_filter.rule_indices(channel)
+            for index, label in zip(indices, channel_rule_labels):
+                if index < len(rule_labels):
+                    rule_labels[index][channel] = label
+        row_labels: dict[int, str] = {}
+        for row, channel_labels in zip(self._rule_rows, rule_labels):
+            if len(set(channel_labels.values())) == 1:
+                row_labels[row] = next(iter(channel_labels.values()))
+            else:
+                row_labels[row] = ", ".join(
+                    f"{channel}: {label}" for channel, label in channel_labels.items()
+                )
+        for row in range(self._table.rowCount()):
+            item = self._table.item(row, COLUMN_WHERE)
+            if item is not None:
+                item.setText(row_labels.get(row, ""))
 
     def add_table_row(self) -> None:
         self._table._add_table_row(radix_type=self.radix_type)
 
+    @Slot()
+    def clear(self) -> None:
+        self._suspend_updates = True
+        try:
+            self._table.clear()
+        finally:
+            self._suspend_updates = False
+        self.update_filter()
+
     @Slot(str)
     def update_radix(self, new_radix: str) -> None:
         if self.radix_type == new_radix:
             return
         self.radix_type = new_radix
 
+        # Rows are rewritten one by one; rebuild the filter once at the end
+        self._suspend_updates = True
+        try:
+            self._update_table_radix(new_radix)
+        finally:
+            self._suspend_updates = False
+        self.update_filter()
+
+    def _update_table_radix(self, new_radix: str) -> None:
         self._table.update_radix(new_radix)
         for row in range(self._table.rowCount()):
-            id_edit = cast(QLineEdit | None, self._table.cellWidget(row, 0))
+            id_edit = cast(QLineEdit | None, self._table.cellWidget(row, COLUMN_ID))
             if id_edit:
                 if new_radix == "hex":
                     id_edit.setStyleSheet(self.style_edit_hex)
-                    id_edit.setValidator(Validator.hex_validator)
-                    id_edit.setText(
-                        Validator.text_hexadecimalize_from_decimal_text(id_edit.text())
-                    )
+                    id_edit.setValidator(Validator.filter_hex_validator)
+                    id_edit.setText(convert_filter_text_radix(id_edit.text(), "hex"))
 
                 elif new_radix == "dec":
                     id_edit.setStyleSheet(self.style_edit_default)
-                    id_edit.setValidator(Validator.dec_validator)
-                    id_edit.setText(
-                        Validator.text_decimalize_from_hex_text(id_edit.text())
-                    )
+                    id_edit.setValidator(Validator.filter_dec_validator)
+                    id_edit.setText(convert_filter_text_radix(id_edit.text(), "dec"))
 
     class FilterTable(QTableWidget):
+        contents_changed_signal = Signal()
+
         def __init__(self, initial_radix_type="hex"):
             super().__init__()
 
@@ -131,30 +254,56 @@ class MessageFilter(QWidget):
             )
 
             # Table Settings
-            self.setColumnCount(3)
-            self.setHorizontalHeaderLabels(["Ignore ID", "Memo", "Enable"])
+            # ID accepts a single ID, a range ("100-1FF") or an id/mask ("100/7F0")
+            self.setColumnCount(6)
+            self.setHorizontalHeaderLabels(
+                ["ID", "Type", "Channel", "Memo", "Enable", "Where"]
+            )
             self.horizontalHeader().setStretchLastSection(True)
-            self.setColumnWidth(0, 80)
-            self.setColumnWidth(1, 110)
-            self.setColumnWidth(2, 45)
+            self.setColumnWidth(COLUMN_ID, 100)
+            self.setColumnWidth(COLUMN_TYPE, 60)
+            self.setColumnWidth(COLUMN_CHANNEL, 80)
+            self.setColumnWidth(COLUMN_MEMO, 110)
+            self.setColumnWidth(COLUMN_ENABLE, 45)
+            # channels a rule can be limited to; the column is shown once
+            # there is more than one
+            self.channels: list[str] = []
+            self.setColumnHidden(COLUMN_CHANNEL, True)
 
             for _ in range(6):
                 self._add_table_row(radix_type=initial_radix_type)
             self.radix_type = initial_radix_type
 
-        def _add_table_row(self, id_value="", memo="", radix_type="dec") -> None:
+        def _add_table_row(
+            self, id_value="", memo="", radix_type="dec", id_space=ID_SPACE_ANY
+        ) -> None:
             self.setRowCount(self.rowCount() + 1)
 
             # LineEdit for ID
             id_edit = QLineEdit()
             id_edit.setText(id_value)
             if radix_type == "hex":
-                id_edit.setValidator(Validator.hex_validator)
+                id_edit.setValidator(Validator.filter_hex_validator)
                 id_edit.setStyleSheet(self.style_edit_hex)
             elif radix_type == "dec":
-                id_edit.setValidator(Validator.dec_validator)
+                id_edit.setValidator(Validator.filter_dec_validator)
                 id_edit.setStyleSheet(self.style_edit_default)
 
+            # ComboBox for ID type (Std/Ext/Any)
+            type_combobox = QComboBox()
+            for label, space in ID_SPACE_LABELS:
+                type_combobox.addItem(label, space)
+            type_combobox.setCurrentIndex(type_combobox.findData(id_space))
+            id_edit.textChanged.connect(self.contents_changed_signal)
+            type_combobox.currentIndexChanged.connect(self.contents_changed_signal)
+
+            # ComboBox for the channel the rule applies to
+            channel_combobox = QComboBox()
+            channel_combobox.addItem("All", None)
+            for channel in self.channels:
+                channel_combobox.addItem(channel, channel)
+            channel_combobox.currentIndexChanged.connect(self.contents_changed_signal)
+
             # LineEdit for Memo
             memo_edit = QLineEdit()
             memo_edit.setText(memo)
@@ -163,6 +312,7 @@ class MessageFilter(QWidget):
             # Check-Box
             checkbox = QCheckBox()
             checkbox.setCheckState(Qt.CheckState.Checked)
+            checkbox.toggled.connect(self.contents_changed_signal)
             checkbox_widget = QWidget()
             checkbox_layout = QHBoxLayout(checkbox_widget)
             checkbox_layout.addWidget(checkbox)
@@ -170,17 +320,24 @@ class MessageFilter(QWidget):
             checkbox_layout.setContentsMargins(0, 0, 0, 0)
 
             # set Widget to Table
-            self.setCellWidget(self.rowCount() - 1, 0, id_edit)
-            self.setCellWidget(self.rowCount() - 1, 1, memo_edit)
-            self.setCellWidget(self.rowCount() - 1, 2, checkbox_widget)
+            self.setCellWidget(self.rowCount() - 1, COLUMN_ID, id_edit)
+            self.setCellWidget(self.rowCount() - 1, COLUMN_TYPE, type_combobox)
+            self.setCellWidget(self.rowCount() - 1, COLUMN_CHANNEL, channel_combobox)
+            self.setCellWidget(self.rowCount() - 1, COLUMN_MEMO, memo_edit)
+            self.setCellWidget(self.rowCount() - 1, COLUMN_ENABLE, checkbox_widget)
+
+            # Where the rule is evaluated (filled in by the CAN handler)
+            where_item = QTableWidgetItem("")
+            where_item.setFlags(Qt.ItemFlag.ItemIsEnabled)
+            self.setItem(self.rowCount() - 1, COLUMN_WHERE, where_item)
 
         def keyPressEvent(self, event: QKeyEvent) -> None:
             if event.key() in (Qt.Key.Key_Return, Qt.Key.Key_Enter):
                 current_row = self.currentRow()
                 current_column = self.currentColumn()
 
-                # チェックボックスがある列（例えば、2列目）かどうかを確認
-                if current_column == 2:
+                # チェックボックスがある列（例えば、3列目）かどうかを確認
+                if current_column == COLUMN_ENABLE:
                     checkbox_widget = self.cellWidget(current_row, current_column)
                     if checkbox_widget:
                         checkbox = checkbox_widget.findChild(QCheckBox)
@@ -191,6 +348,18 @@ class MessageFilter(QWidget):
             # それ以外のキーイベントは親クラスに渡す
             super().keyPressEvent(event)
 
+        def add_channel(self, channel: str) -> None:
+            if channel in self.channels:
+                return
+            self.channels.append(channel)
+            for row in range(self.rowCount()):
+                channel_combobox = cast(
+                    QComboBox | None, self.cellWidget(row, COLUMN_CHANNEL)
+                )
+                if channel_combobox is not None:
+                    channel_combobox.addItem(channel, channel)
+            self.setColumnHidden(COLUMN_CHANNEL, len(self.channels) < 2)
+
         def clear(self) -> None:
             self.setRowCount(0)
             for _ in range(6):
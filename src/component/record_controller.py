@@ -0,0 +1,114 @@
+from pathlib import Path
+
+import can
+from PySide6.QtCore import QTimer, Signal, Slot
+from PySide6.QtWidgets import (
+    QFileDialog,
+    QHBoxLayout,
+    QLabel,
+    QPushButton,
+    QWidget,
+)
+
+from ..utils.recorder import (
+    RECORD_FORMATS,
+    FrameRecorder,
+    RecorderStats,
+    record_file_filter,
+)
+
+STATS_REFRESH_MS = 500
+
+
+class RecordController(QWidget):
+    log_signal = Signal(str, str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._recorder: FrameRecorder | None = None
+
+        self._layout = QHBoxLayout()
+        self._layout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(self._layout)
+
+        # Recording status (file, size, queue depth, drops)
+        self._status_label = QLabel()
+        self._layout.addWidget(self._status_label)
+
+        # Record/Stop Button
+        self._record_button = QPushButton("Record")
+        self._record_button.clicked.connect(self._on_record_pressed_callback)
+        self._layout.addWidget(self._record_button)
+
+        self._stats_timer = QTimer(self)
+        self._stats_timer.timeout.connect(self._update_status)
+
+    # Frame tap for CANHandler; runs on the notifier thread and never blocks
+    def record(self, msg: can.Message) -> None:
+        recorder = self._recorder
+        if recorder is not None:
+            recorder.record(msg)
+
+    def is_recording(self) -> bool:
+        return self._recorder is not None
+
+    def start_recording(self, path: str) -> bool:
+        self.stop_recording()
+        recorder = FrameRecorder(path)
+        try:
+            recorder.start()
+        except (OSError, ValueError) as e:
+            self.log_signal.emit(f"Failed to start recording: {e}", "red")
+            return False
+        self._recorder = recorder
+        self._record_button.setText("Stop Rec")
+        self._stats_timer.start(STATS_REFRESH_MS)
+        self._update_status()
+        self.log_signal.emit(f"Recording to {path}", "green")
+        return True
+
+    @Slot()
+    def stop_recording(self) -> None:
+        recorder = self._recorder
+        if recorder is None:
+            return
+        self._recorder = None
+        recorder.stop()
+        self._stats_timer.stop()
+        self._record_button.setText("Record")
+        stats = recorder.stats()
+        self._show_stats(stats, recording=False)
+        if recorder.error is not None:
+            self.log_signal.emit(f"Recording failed: {recorder.error}", "red")
+        self.log_signal.emit(
+            f"Recorded {stats.written} frames to {stats.path}"
+            + (f" ({stats.dropped} dropped)" if stats.dropped else ""),
+            "green",
+        )
+
+    @Slot()
+    def _on_record_pressed_callback(self) -> None:
+        if self._recorder is not None:
+            self.stop_recording()
+            return
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Record CAN Frames", "capture.blf", record_file_filter()
+        )
+        if not path:
+            return
+        if Path(path).suffix.lower() not in RECORD_FORMATS:
+            path += ".blf"
+        self.start_recording(path)
+
+    @Slot()
+    def _update_status(self) -> None:
+        if self._recorder is not None:
+            self._show_stats(self._recorder.stats(), recording=True)
+
+    def _show_stats(self, stats: RecorderStats, recording: bool) -> None:
+        prefix = "REC " if recording else ""
+        self._status_label.setText(
+            f"{prefix}{Path(stats.path).name} | "
+            f"{stats.bytes_written / (1024 * 1024):.1f} MB | "
+            f"queue {stats.queued}/{stats.queue_capacity} | dropped {stats.dropped}"
+        )
@@ -0,0 +1,201 @@
+from collections.abc import Callable
+from pathlib import Path
+
+import can
+from PySide6.QtCore import Qt, QTimer, Signal, Slot
+from PySide6.QtWidgets import (
+    QCheckBox,
+    QComboBox,
+    QFileDialog,
+    QHBoxLayout,
+    QLabel,
+    QPushButton,
+    QSlider,
+    QWidget,
+)
+
+from ..utils.capture_file import CAPTURE_SUFFIX
+from ..utils.replay import FrameReplay, ReplaySource, open_replay_source
+
+POSITION_REFRESH_MS = 100
+_SLIDER_STEPS = 1000
+SPEED_OPTIONS = ("0.1x", "0.5x", "1x", "2x", "5x", "10x", "100x", "Max")
+_REPLAY_FILE_FILTER = (
+    f"CAN logs (*{CAPTURE_SUFFIX} *.blf *.asc *.log *.csv *.mf4 *.trc);;All files (*)"
+)
+
+
+def _parse_speed(text: str) -> float | None:
+    if text == "Max":
+        return None
+    return float(text.rstrip("x"))
+
+
+class ReplayController(QWidget):
+    log_signal = Signal(str, str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._replay: FrameReplay | None = None
+        self._deliver: Callable[[can.Message], None] | None = None
+        self._is_backlogged: Callable[[], bool] | None = None
+        self._transmit: Callable[[can.Message], None] | None = None
+
+        self._layout = QHBoxLayout()
+        self._layout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(self._layout)
+
+        # Open Button
+        self._open_button = QPushButton("Open...")
+        self._open_button.clicked.connect(self._on_open_pressed_callback)
+        self._layout.addWidget(self._open_button)
+
+        # Play/Pause Button
+        self._play_button = QPushButton("Play")
+        self._play_button.setEnabled(False)
+        self._play_button.clicked.connect(self._on_play_pressed_callback)
+        self._layout.addWidget(self._play_button)
+
+        # Seek Slider
+        self._seek_slider = QSlider(Qt.Orientation.Horizontal)
+        self._seek_slider.setRange(0, _SLIDER_STEPS)
+        self._seek_slider.setEnabled(False)
+        self._seek_slider.sliderReleased.connect(self._on_seek_released_callback)
+        self._layout.addWidget(self._seek_slider, 1)
+
+        # Position Label
+        self._position_label = QLabel("No replay")
+        self._layout.addWidget(self._position_label)
+
+        # Speed Combobox
+        self._speed_combobox = QComboBox()
+        self._speed_combobox.addItems(SPEED_OPTIONS)
+        self._speed_combobox.setCurrentText("1x")
+        self._speed_combobox.currentTextChanged.connect(self._on_speed_changed_callback)
+        self._layout.addWidget(self._speed_combobox)
+
+        # Retransmit CheckBox
+        self._retransmit_checkbox = QCheckBox("Send to bus")
+        self._retransmit_checkbox.toggled.connect(self._on_retransmit_toggled_callback)
+        self._layout.addWidget(self._retransmit_checkbox)
+
+        self._position_timer = QTimer(self)
+        self._position_timer.timeout.connect(self._update_position)
+
+    # Where replayed frames go (the receive path) and how to throttle max speed
+    def set_frame_sink(
+        self,
+        deliver: Callable[[can.Message], None],
+        is_backlogged: Callable[[], bool] | None = None,
+    ) -> None:
+        self._deliver = deliver
+        self._is_backlogged = is_backlogged
+
+    # Used when "Send to bus" is checked
+    def set_transmitter(self, transmit: Callable[[can.Message], None]) -> None:
+        self._transmit = transmit
+
+    def open_replay(self, path: str) -> bool:
+        if self._deliver is None:
+            raise RuntimeError("No frame sink is set for the replay")
+        self.close_replay()
+        try:
+            source: ReplaySource = open_replay_source(path)
+        except (OSError, ValueError, can.CanError) as e:
+            self.log_signal.emit(f"Failed to open replay: {e}", "red")
+            return False
+        self._replay = FrameReplay(source, self._deliver, self._is_backlogged)
+        self._replay.set_speed(_parse_speed(self._speed_combobox.currentText()))
+        self._on_retransmit_toggled_callback(self._retransmit_checkbox.isChecked())
+        self._play_button.setEnabled(True)
+        self._seek_slider.setEnabled(True)
+        self._position_timer.start(POSITION_REFRESH_MS)
+        self._update_position()
+        self.log_signal.emit(
+            f"Loaded {Path(path).name} for replay ({len(source)} frames)", "green"
+        )
+        return True
+
+    @Slot()
+    def close_replay(self) -> None:
+        replay = self._replay
+        if replay is None:
+            return
+        self._replay = None
+        replay.stop()
+        self._position_timer.stop()
+        self._play_button.setText("Play")
+        self._play_button.setEnabled(False)
+        self._seek_slider.setEnabled(False)
+        self._position_label.setText("No replay")
+
+    def play(self) -> None:
+        if self._replay is not None:
+            self._replay.play()
+            self._play_button.setText("Pause")
+
+    def pause(self) -> None:
+        if self._replay is not None:
+            self._replay.pause()
+            self._play_button.setText("Play")
+
+    def replay(self) -> FrameReplay | None:
+        return self._replay
+
+    @Slot()
+    def _on_open_pressed_callback(self) -> None:
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Open Replay", "", _REPLAY_FILE_FILTER
+        )
+        if path:
+            self.open_replay(path)
+
+    @Slot()
+    def _on_play_pressed_callback(self) -> None:
+        if self._replay is None:
+            return
+        if self._replay.is_playing():
+            self.pause()
+        else:
+            self.play()
+
+    @Slot()
+    def _on_seek_released_callback(self) -> None:
+        if self._replay is None:
+            return
+        self._replay.seek(
+            round(self._seek_slider.value() * len(self._replay) / _SLIDER_STEPS)
+        )
+        self._update_position()
+
+    @Slot(str)
+    def _on_speed_changed_callback(self, text: str) -> None:
+        if self._replay is not None:
+            self._replay.set_speed(_parse_speed(text))
+
+    @Slot(bool)
+    def _on_retransmit_toggled_callback(self, checked: bool) -> None:
+        if self._replay is not None:
+            self._replay.set_transmit(self._transmit if checked else None)
+
+    @Slot()
+    def _update_position(self) -> None:
+        replay = self._replay
+        if replay is None:
+            return
+        position = replay.position()
+        total = len(replay)
+        if not replay.is_playing():
+            self._play_button.setText("Play")
+        if not self._seek_slider.isSliderDown():
+            self._seek_slider.setValue(
+                round(position * _SLIDER_STEPS / total) if total else 0
+            )
+        text = f"{position}/{total}"
+        start = replay.source.start_timestamp
+        if start is not None and 0 < position <= total:
+            elapsed = replay.source.message(position - 1).timestamp - start
+            text += f" | {elapsed:.3f} s"
+        if replay.transmit_errors:
+            text += f" | send errors {replay.transmit_errors}"
+        self._position_label.setText(text)
@@ -0,0 +1,69 @@
+from pathlib import Path
+
+from PySide6.QtCore import Signal, Slot
+from PySide6.QtWidgets import QFileDialog, QHBoxLayout, QLabel, QPushButton, QWidget
+
+from ..utils.signal_decoder import (
+    SignalDecoder,
+    database_file_filter,
+    load_signal_database,
+)
+
+
+class SignalDatabaseController(QWidget):
+    log_signal = Signal(str, str)
+    # the loaded SignalDecoder, None once unloaded
+    decoder_signal = Signal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._decoder: SignalDecoder | None = None
+
+        self._layout = QHBoxLayout()
+        self._layout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(self._layout)
+
+        # Loaded database (file, messages)
+        self._status_label = QLabel()
+        self._layout.addWidget(self._status_label)
+
+        # Load/Unload Button
+        self._load_button = QPushButton("Load DBC")
+        self._load_button.clicked.connect(self._on_load_pressed_callback)
+        self._layout.addWidget(self._load_button)
+
+    def decoder(self) -> SignalDecoder | None:
+        return self._decoder
+
+    def load_database(self, path: str) -> bool:
+        try:
+            decoder = load_signal_database(path)
+        except (OSError, ValueError) as e:
+            self.log_signal.emit(f"Failed to load signal database: {e}", "red")
+            return False
+        self._decoder = decoder
+        self._status_label.setText(f"{Path(path).name} | {len(decoder)} messages")
+        self._load_button.setText("Unload DBC")
+        self.decoder_signal.emit(decoder)
+        self.log_signal.emit(f"Loaded {path} ({len(decoder)} messages)", "green")
+        return True
+
+    @Slot()
+    def unload_database(self) -> None:
+        if self._decoder is None:
+            return
+        self._decoder = None
+        self._status_label.setText("")
+        self._load_button.setText("Load DBC")
+        self.decoder_signal.emit(None)
+
+    @Slot()
+    def _on_load_pressed_callback(self) -> None:
+        if self._decoder is not None:
+            self.unload_database()
+            return
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Load Signal Database", "", database_file_filter()
+        )
+        if path:
+            self.load_database(path)
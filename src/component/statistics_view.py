@@ -0,0 +1,265 @@
+from collections.abc import Iterable
+from typing import Any
+
+import can
+from PySide6.QtCore import (
+    QAbstractTableModel,
+    QModelIndex,
+    QPersistentModelIndex,
+    QSortFilterProxyModel,
+    Qt,
+    QTimer,
+    Signal,
+    Slot,
+)
+from PySide6.QtWidgets import (
+    QAbstractItemView,
+    QFileDialog,
+    QHBoxLayout,
+    QHeaderView,
+    QPushButton,
+    QTableView,
+    QVBoxLayout,
+    QWidget,
+)
+
+from ..utils.statistics import IdStatisticsSnapshot, StatisticsEngine
+from .table_model import ROOT_INDEX
+
+DEFAULT_REFRESH_HZ = 2
+
+# Raw value used by the proxy model for numeric sorting
+SORT_ROLE = Qt.ItemDataRole.UserRole + 1
+
+
+def _format_ms(value: float | None) -> str:
+    if value is None:
+        return ""
+    return f"{value * 1000:.3f}"
+
+
+class StatisticsModel(QAbstractTableModel):
+    COLUMN_CHANNEL = 0
+    COLUMN_ID = 1
+    COLUMN_COUNT = 2
+    COLUMN_RATE = 3
+    COLUMN_MEAN = 4
+    COLUMN_MIN = 5
+    COLUMN_MAX = 6
+    COLUMN_JITTER = 7
+    COLUMN_LAST_SEEN = 8
+    HEADERS = (
+        "Channel",
+        "ID",
+        "Count",
+        "Frames/s",
+        "Mean (ms)",
+        "Min (ms)",
+        "Max (ms)",
+        "Jitter (ms)",
+        "Last seen",
+    )
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows: list[IdStatisticsSnapshot] = []
+
+    def rowCount(self, parent: QModelIndex | QPersistentModelIndex = ROOT_INDEX) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def columnCount(
+        self, parent: QModelIndex | QPersistentModelIndex = ROOT_INDEX
+    ) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.HEADERS)
+
+    def headerData(
+        self,
+        section: int,
+        orientation: Qt.Orientation,
+        role: int = Qt.ItemDataRole.DisplayRole,
+    ) -> Any:
+        if (
+            role == Qt.ItemDataRole.DisplayRole
+            and orientation == Qt.Orientation.Horizontal
+        ):
+            return self.HEADERS[section]
+        return None
+
+    def data(
+        self,
+        index: QModelIndex | QPersistentModelIndex,
+        role: int = Qt.ItemDataRole.DisplayRole,
+    ) -> Any:
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._format_cell(row, column)
+        if role == SORT_ROLE:
+            return self._sort_value(row, column)
+        if role == Qt.ItemDataRole.TextAlignmentRole and column not in (
+            self.COLUMN_CHANNEL,
+            self.COLUMN_ID,
+        ):
+            return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        return None
+
+    # The engine keeps IDs in first-seen order, so existing rows never move
+    def update_snapshot(self, rows: list[IdStatisticsSnapshot]) -> None:
+        previous_count = len(self._rows)
+        if len(rows) < previous_count:
+            self.beginResetModel()
+            self._rows = rows
+            self.endResetModel()
+            return
+        if len(rows) > previous_count:
+            self.beginInsertRows(ROOT_INDEX, previous_count, len(rows) - 1)
+            self._rows = rows
+            self.endInsertRows()
+        else:
+            self._rows = rows
+        if previous_count:
+            self.dataChanged.emit(
+                self.index(0, 0),
+                self.index(previous_count - 1, len(self.HEADERS) - 1),
+                [Qt.ItemDataRole.DisplayRole, SORT_ROLE],
+            )
+
+    def _format_cell(self, row: IdStatisticsSnapshot, column: int) -> str:
+        if column == self.COLUMN_CHANNEL:
+            return row.channel
+        if column == self.COLUMN_ID:
+            if row.is_extended_id:
+                return f"EXT {row.arbitration_id:08X}"
+            return f"STD {row.arbitration_id:03X}"
+        if column == self.COLUMN_COUNT:
+            return str(row.count)
+        if column == self.COLUMN_RATE:
+            return f"{row.rate:.1f}"
+        if column == self.COLUMN_MEAN:
+            return _format_ms(row.period_mean)
+        if column == self.COLUMN_MIN:
+            return _format_ms(row.period_min)
+        if column == self.COLUMN_MAX:
+            return _format_ms(row.period_max)
+        if column == self.COLUMN_JITTER:
+            return _format_ms(row.jitter)
+        if column == self.COLUMN_LAST_SEEN:
+            return f"{row.last_seen:.6f}"
+        return ""
+
+    def _sort_value(self, row: IdStatisticsSnapshot, column: int) -> Any:
+        values = (
+            row.channel,
+            (int(row.is_extended_id) << 29) | row.arbitration_id,
+            row.count,
+            row.rate,
+            row.period_mean,
+            row.period_min,
+            row.period_max,
+            row.jitter,
+            row.last_seen,
+        )
+        value = values[column]
+        # rows without a period sort first
+        return -1.0 if value is None else value
+
+
+class StatisticsView(QWidget):
+    log_signal = Signal(str, str)
+
+    def __init__(self, parent=None, refresh_hz: int = DEFAULT_REFRESH_HZ):
+        super().__init__(parent)
+        self.engine = StatisticsEngine()
+
+        self._layout = QVBoxLayout()
+        self._layout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(self._layout)
+
+        # Sortable table
+        self._model = StatisticsModel(self)
+        self._proxy_model = QSortFilterProxyModel(self)
+        self._proxy_model.setSourceModel(self._model)
+        self._proxy_model.setSortRole(SORT_ROLE)
+        self._table = QTableView()
+        self._table.setModel(self._proxy_model)
+        self._table.setSortingEnabled(True)
+        self._table.sortByColumn(StatisticsModel.COLUMN_ID, Qt.SortOrder.AscendingOrder)
+        self._table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self._table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self._table.verticalHeader().setVisible(False)
+        self._table.horizontalHeader().setSectionResizeMode(
+            QHeaderView.ResizeMode.Stretch
+        )
+        # shown once frames of more than one channel were counted
+        self._table.setColumnHidden(StatisticsModel.COLUMN_CHANNEL, True)
+        self._layout.addWidget(self._table)
+
+        # button layout
+        self._button_layout = QHBoxLayout()
+        self._button_layout.addStretch()
+        self._layout.addLayout(self._button_layout)
+
+        # Button for reset statistics
+        reset_button = QPushButton("Reset")
+        reset_button.clicked.connect(self.clear)
+        self._button_layout.addWidget(reset_button)
+
+        # Button for export statistics
+        export_button = QPushButton("Export...")
+        export_button.clicked.connect(self._on_export_clicked)
+        self._button_layout.addWidget(export_button)
+
+        # Periodic refresh of the table from the engine
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.timeout.connect(self.refresh)
+        self._refresh_timer.start(max(1, round(1000 / refresh_hz)))
+
+    @Slot(list)
+    def add_frames(self, msgs: list[can.Message]) -> None:
+        self.engine.update_batch(msgs)
+
+    # Replace the statistics with those of recorded frames
+    def load_records(self, records: Iterable[tuple[float, int, int]]) -> None:
+        self.engine.clear()
+        self.engine.update_records(records)
+        self._update_model()
+
+    @Slot()
+    def refresh(self) -> None:
+        if not self.isVisible():
+            return
+        self._update_model()
+
+    def _update_model(self) -> None:
+        self._model.update_snapshot(self.engine.snapshot())
+        self._table.setColumnHidden(
+            StatisticsModel.COLUMN_CHANNEL, len(self.engine.channels()) < 2
+        )
+
+    @Slot()
+    def clear(self) -> None:
+        self.engine.clear()
+        self._update_model()
+
+    @Slot()
+    def _on_export_clicked(self) -> None:
+        path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Export Statistics",
+            "statistics.csv",
+            "CSV (*.csv);;JSON (*.json)",
+        )
+        if not path:
+            return
+        try:
+            self.engine.export(path)
+        except (OSError, ValueError) as e:
+            self.log_signal.emit(f"Failed to export statistics: {e}", "red")
+            return
+        self.log_signal.emit(f"Exported statistics to {path}", "green")
@@ -0,0 +1,143 @@
+from collections.abc import Callable
+
+from PySide6.QtCore import QTimer, Signal, Slot
+from PySide6.QtWidgets import QComboBox, QLabel, QStatusBar
+
+from ..utils.display_policy import (
+    DISPLAY_ALL,
+    DISPLAY_EVERY_NTH,
+    DISPLAY_MODE_LABELS,
+    DisplayPolicyStats,
+)
+from ..utils.frame_buffer import FrameBufferStats
+from ..utils.frame_store import HistoryStats
+from ..utils.pipeline_stats import PipelineStats
+
+PIPELINE_REFRESH_MS = 500
+
+
+def _format_us(value: float | None) -> str:
+    if value is None:
+        return "-"
+    return f"{value * 1_000_000:.1f} µs"
+
+
+def format_display_stats(stats: DisplayPolicyStats) -> str:
+    if stats.active_mode == DISPLAY_EVERY_NTH:
+        mode = f"1 in {stats.every_n} frames"
+    else:
+        mode = DISPLAY_MODE_LABELS[stats.active_mode]
+    if stats.active_mode == DISPLAY_ALL:
+        return f"View: {mode}"
+    text = f"View decimated: {mode}"
+    if stats.degraded:
+        text += f" (GUI behind, {stats.backlog} queued)"
+    return f"{text} | {stats.skipped} not shown"
+
+
+class PipelineStatusBar(QStatusBar):
+    display_mode_signal = Signal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._batch_size = 0
+        self._tick_hz = 0
+        self._pipeline_stats_source: Callable[[], PipelineStats] | None = None
+
+        # Counters of each stage of the receive path
+        self._pipeline_label = QLabel()
+        self._pipeline_label.setToolTip(
+            "Frames received, rejected by the ID filter, error frames and shown; "
+            "time per frame in the receive callback and per log cell formatted"
+        )
+        self.addPermanentWidget(self._pipeline_label)
+        self._pipeline_timer = QTimer(self)
+        self._pipeline_timer.timeout.connect(self._refresh_pipeline_stats)
+
+        # What the log shows, and whether it is decimated
+        self._display_label = QLabel()
+        self.addPermanentWidget(self._display_label)
+        self._display_mode_combobox = QComboBox()
+        self._display_mode_combobox.setToolTip(
+            "Frames shown in the log; statistics, trace and recording get all"
+        )
+        for mode, label in DISPLAY_MODE_LABELS.items():
+            self._display_mode_combobox.addItem(label, mode)
+        self._display_mode_combobox.currentIndexChanged.connect(
+            self._on_display_mode_changed
+        )
+        self.addPermanentWidget(self._display_mode_combobox)
+        # text and colour the display label shows
+        self._display_state: tuple[str, bool] | None = None
+
+        # Log history (frames kept, memory used, eviction)
+        self._history_label = QLabel()
+        self.addPermanentWidget(self._history_label)
+
+        # Receive pipeline (ring buffer between notifier thread and GUI)
+        self._receive_label = QLabel()
+        self.addPermanentWidget(self._receive_label)
+
+    # Polled while the status bar is visible
+    def set_pipeline_stats_source(self, source: Callable[[], PipelineStats]) -> None:
+        self._pipeline_stats_source = source
+        self._pipeline_timer.start(PIPELINE_REFRESH_MS)
+        self._refresh_pipeline_stats()
+
+    @Slot()
+    def _refresh_pipeline_stats(self) -> None:
+        if self._pipeline_stats_source is None or not self.isVisible():
+            return
+        self.update_pipeline_stats(self._pipeline_stats_source())
+
+    @Slot(PipelineStats)
+    def update_pipeline_stats(self, stats: PipelineStats) -> None:
+        self._pipeline_label.setText(
+            f"RX {stats.received} | filtered {stats.filtered_out} | "
+            f"error {stats.error_frames} | shown {stats.rendered} | "
+            f"rx {_format_us(stats.receive_time_per_frame)}/frame | "
+            f"format {_format_us(stats.format_time_per_cell)}/cell"
+        )
+
+    def set_display_mode(self, mode: str) -> None:
+        self._display_mode_combobox.blockSignals(True)
+        self._display_mode_combobox.setCurrentIndex(
+            self._display_mode_combobox.findData(mode)
+        )
+        self._display_mode_combobox.blockSignals(False)
+
+    @Slot()
+    def _on_display_mode_changed(self) -> None:
+        self.display_mode_signal.emit(self._display_mode_combobox.currentData())
+
+    # Called every receive tick; the label is only touched when what it
+    # shows changes
+    @Slot(DisplayPolicyStats)
+    def update_display_stats(self, stats: DisplayPolicyStats) -> None:
+        state = (format_display_stats(stats), stats.degraded)
+        if state == self._display_state:
+            return
+        self._display_state = state
+        self._display_label.setText(state[0])
+        self._display_label.setStyleSheet("color: red;" if stats.degraded else "")
+
+    def set_receive_config(self, batch_size: int, tick_hz: int) -> None:
+        self._batch_size = batch_size
+        self._tick_hz = tick_hz
+
+    @Slot(FrameBufferStats)
+    def update_receive_stats(self, stats: FrameBufferStats) -> None:
+        self._receive_label.setText(
+            f"RX batch {self._batch_size} @ {self._tick_hz} Hz | "
+            f"queued {stats.pending}/{stats.capacity} | dropped {stats.dropped}"
+        )
+
+    @Slot(HistoryStats)
+    def update_history_stats(self, stats: HistoryStats) -> None:
+        text = (
+            f"History {stats.count} frames | "
+            f"{stats.memory_bytes / (1024 * 1024):.1f} MB | evicted {stats.evicted}"
+        )
+        if stats.spilled:
+            text += f" (spilled {stats.spilled})"
+        self._history_label.setText(text)
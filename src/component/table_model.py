@@ -0,0 +1,5 @@
+from PySide6.QtCore import QModelIndex
+
+# Parent of every row: the table models are flat, so all their rows hang off
+# the invisible root
+ROOT_INDEX = QModelIndex()
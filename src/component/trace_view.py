@@ -0,0 +1,378 @@
+from bisect import bisect_left
+from typing import Any
+
+import can
+from PySide6.QtCore import (
+    QAbstractTableModel,
+    QModelIndex,
+    QPersistentModelIndex,
+    QRect,
+    Qt,
+    QTimer,
+    Slot,
+)
+from PySide6.QtGui import QColor, QFont, QPainter
+from PySide6.QtWidgets import (
+    QAbstractItemView,
+    QHeaderView,
+    QStyle,
+    QStyledItemDelegate,
+    QStyleOptionViewItem,
+    QTableView,
+)
+
+from ..utils.frame_store import message_channel
+from ..utils.signal_decoder import SignalDecoder
+from .table_model import ROOT_INDEX
+
+DEFAULT_REFRESH_HZ = 10
+
+# Extra item data roles used by the data column delegate
+DATA_BYTES_ROLE = Qt.ItemDataRole.UserRole + 1
+CHANGED_MASK_ROLE = Qt.ItemDataRole.UserRole + 2
+
+_CHANGED_BYTE_COLOR = QColor("#FFE08A")
+
+
+class _TraceEntry:
+    __slots__ = (
+        "arbitration_id",
+        "changed_mask",
+        "channel",
+        "count",
+        "data",
+        "dlc",
+        "is_extended_id",
+        "is_rx",
+        "last_timestamp",
+        "period",
+    )
+
+    def __init__(self, channel: str, arbitration_id: int, is_extended_id: bool):
+        self.channel = channel
+        self.arbitration_id = arbitration_id
+        self.is_extended_id = is_extended_id
+        self.is_rx = True
+        self.dlc = 0
+        self.data = b""
+        # bit n is set when byte n differs from the previous frame
+        self.changed_mask = 0
+        self.count = 0
+        self.last_timestamp: float | None = None
+        self.period: float | None = None
+
+
+def _changed_bytes(previous: bytes, current: bytes) -> int:
+    mask = 0
+    for index, byte in enumerate(current):
+        if index >= len(previous) or previous[index] != byte:
+            mask |= 1 << index
+    return mask
+
+
+class TraceModel(QAbstractTableModel):
+    COLUMN_CHANNEL = 0
+    COLUMN_ID = 1
+    COLUMN_DIR = 2
+    COLUMN_DLC = 3
+    COLUMN_DATA = 4
+    COLUMN_COUNT = 5
+    COLUMN_PERIOD = 6
+    COLUMN_DECODED = 7
+    HEADERS = (
+        "Channel",
+        "ID",
+        "Dir",
+        "DLC",
+        "Data",
+        "Count",
+        "Period (ms)",
+        "Decoded",
+    )
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # rows sorted by (channel, ext, id); '_keys' mirrors '_entries' for
+        # bisect and '_frame_keys' holds the (msg.channel, key) of each row
+        self._entries: list[_TraceEntry] = []
+        self._keys: list[tuple[str, int]] = []
+        self._frame_keys: list[tuple[object, int]] = []
+        self._rows: dict[tuple[object, int], int] = {}
+        # entries that are not shown yet, and rows updated since the last flush
+        self._pending: dict[tuple[object, int], _TraceEntry] = {}
+        self._dirty_rows: set[int] = set()
+        self._channels: set[str] = set()
+        self._signal_decoder: SignalDecoder | None = None
+
+    def rowCount(self, parent: QModelIndex | QPersistentModelIndex = ROOT_INDEX) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._entries)
+
+    def columnCount(
+        self, parent: QModelIndex | QPersistentModelIndex = ROOT_INDEX
+    ) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.HEADERS)
+
+    def headerData(
+        self,
+        section: int,
+        orientation: Qt.Orientation,
+        role: int = Qt.ItemDataRole.DisplayRole,
+    ) -> Any:
+        if (
+            role == Qt.ItemDataRole.DisplayRole
+            and orientation == Qt.Orientation.Horizontal
+        ):
+            return self.HEADERS[section]
+        return None
+
+    def data(
+        self,
+        index: QModelIndex | QPersistentModelIndex,
+        role: int = Qt.ItemDataRole.DisplayRole,
+    ) -> Any:
+        if not index.isValid():
+            return None
+        entry = self._entries[index.row()]
+        column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._format_cell(entry, column)
+        if role == DATA_BYTES_ROLE:
+            return entry.data
+        if role == CHANGED_MASK_ROLE:
+            return entry.changed_mask
+        if role == Qt.ItemDataRole.TextAlignmentRole and column in (
+            self.COLUMN_DLC,
+            self.COLUMN_COUNT,
+            self.COLUMN_PERIOD,
+        ):
+            return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        return None
+
+    # Only rows on screen are decoded, at most once per flush
+    def set_signal_decoder(self, decoder: SignalDecoder | None) -> None:
+        self._signal_decoder = decoder
+        if self._entries:
+            self.dataChanged.emit(
+                self.index(0, self.COLUMN_DECODED),
+                self.index(len(self._entries) - 1, self.COLUMN_DECODED),
+                [Qt.ItemDataRole.DisplayRole],
+            )
+
+    @staticmethod
+    def _key(arbitration_id: int, is_extended_id: bool) -> int:
+        return (int(is_extended_id) << 29) | arbitration_id
+
+    # names of the channels shown, "" excluded
+    def channels(self) -> set[str]:
+        return self._channels - {""}
+
+    # Cheap per-frame bookkeeping; the view is only told about it on flush()
+    def add_frames(self, msgs: list[can.Message]) -> None:
+        rows = self._rows
+        pending = self._pending
+        dirty_rows = self._dirty_rows
+        for msg in msgs:
+            if msg.is_error_frame:
+                continue
+            key = (msg.channel, self._key(msg.arbitration_id, msg.is_extended_id))
+            row = rows.get(key)
+            if row is not None:
+                entry = self._entries[row]
+                dirty_rows.add(row)
+            else:
+                pending_entry = pending.get(key)
+                if pending_entry is None:
+                    pending_entry = _TraceEntry(
+                        message_channel(msg), msg.arbitration_id, msg.is_extended_id
+                    )
+                    pending[key] = pending_entry
+                entry = pending_entry
+            data = bytes(msg.data) if msg.data is not None else b""
+            entry.changed_mask = _changed_bytes(entry.data, data) if entry.count else 0
+            entry.data = data
+            entry.dlc = msg.dlc
+            entry.is_rx = msg.is_rx
+            entry.count += 1
+            if entry.last_timestamp is not None:
+                entry.period = msg.timestamp - entry.last_timestamp
+            entry.last_timestamp = msg.timestamp
+
+    def flush(self) -> None:
+        if self._pending:
+            self._insert_pending()
+        if self._dirty_rows:
+            first = min(self._dirty_rows)
+            last = max(self._dirty_rows)
+            self._dirty_rows.clear()
+            self.dataChanged.emit(
+                self.index(first, 0),
+                self.index(last, len(self.HEADERS) - 1),
+                [Qt.ItemDataRole.DisplayRole, DATA_BYTES_ROLE, CHANGED_MASK_ROLE],
+            )
+
+    def _insert_pending(self) -> None:
+        for frame_key, entry in self._pending.items():
+            key = (entry.channel, frame_key[1])
+            row = bisect_left(self._keys, key)
+            self.beginInsertRows(ROOT_INDEX, row, row)
+            self._keys.insert(row, key)
+            self._frame_keys.insert(row, frame_key)
+            self._entries.insert(row, entry)
+            self.endInsertRows()
+            self._channels.add(entry.channel)
+        self._pending.clear()
+        # rows after each insertion point moved, so rebuild the lookup
+        self._rows = {key: row for row, key in enumerate(self._frame_keys)}
+        self._dirty_rows.clear()
+        if self._entries:
+            self._dirty_rows.update((0, len(self._entries) - 1))
+
+    def clear(self) -> None:
+        self.beginResetModel()
+        self._entries.clear()
+        self._keys.clear()
+        self._frame_keys.clear()
+        self._rows.clear()
+        self._channels.clear()
+        self._pending.clear()
+        self._dirty_rows.clear()
+        self.endResetModel()
+
+    def _format_cell(self, entry: _TraceEntry, column: int) -> str:
+        if column == self.COLUMN_CHANNEL:
+            return entry.channel
+        if column == self.COLUMN_ID:
+            if entry.is_extended_id:
+                return f"EXT {entry.arbitration_id:08X}"
+            return f"STD {entry.arbitration_id:03X}"
+        if column == self.COLUMN_DIR:
+            return "RX" if entry.is_rx else "TX"
+        if column == self.COLUMN_DLC:
+            return str(entry.dlc)
+        if column == self.COLUMN_DATA:
+            return entry.data.hex(" ").upper()
+        if column == self.COLUMN_COUNT:
+            return str(entry.count)
+        if column == self.COLUMN_PERIOD:
+            if entry.period is None:
+                return ""
+            return f"{entry.period * 1000:.3f}"
+        if column == self.COLUMN_DECODED:
+            decoder = self._signal_decoder
+            if decoder is None:
+                return ""
+            return decoder.format(
+                entry.arbitration_id, entry.is_extended_id, entry.data
+            )
+        return ""
+
+
+class ChangedBytesDelegate(QStyledItemDelegate):
+    """Paints the data column byte by byte, highlighting bytes that changed."""
+
+    def paint(
+        self,
+        painter: QPainter,
+        option: QStyleOptionViewItem,
+        index: QModelIndex | QPersistentModelIndex,
+    ) -> None:
+        data = index.data(DATA_BYTES_ROLE)
+        if not isinstance(data, bytes):
+            super().paint(painter, option, index)
+            return
+        changed_mask: int = index.data(CHANGED_MASK_ROLE) or 0
+
+        # background and selection only, the text is drawn below
+        self.initStyleOption(option, index)
+        option.text = ""
+        style = option.widget.style() if option.widget else None
+        if style is not None:
+            style.drawControl(
+                QStyle.ControlElement.CE_ItemViewItem, option, painter, option.widget
+            )
+
+        painter.save()
+        metrics = option.fontMetrics
+        byte_width = metrics.horizontalAdvance("00")
+        space_width = metrics.horizontalAdvance(" ")
+        rect = option.rect
+        x = rect.left() + 3
+        for offset, byte in enumerate(data):
+            byte_rect = QRect(x, rect.top(), byte_width, rect.height())
+            if changed_mask >> offset & 1:
+                painter.fillRect(byte_rect, _CHANGED_BYTE_COLOR)
+            painter.drawText(byte_rect, Qt.AlignmentFlag.AlignCenter, f"{byte:02X}")
+            x += byte_width + space_width
+            if x > rect.right():
+                break
+        painter.restore()
+
+
+class TraceView(QTableView):
+    def __init__(self, parent=None, refresh_hz: int = DEFAULT_REFRESH_HZ):
+        super().__init__(parent)
+        self._model = TraceModel(self)
+        self.setModel(self._model)
+        self.setItemDelegateForColumn(
+            TraceModel.COLUMN_DATA, ChangedBytesDelegate(self)
+        )
+
+        self.setFont(QFont("Menlo", 14))
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.setShowGrid(False)
+        self.setWordWrap(False)
+
+        vertical_header = self.verticalHeader()
+        vertical_header.setVisible(False)
+        vertical_header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        vertical_header.setDefaultSectionSize(self.fontMetrics().height() + 4)
+
+        char_width = self.fontMetrics().horizontalAdvance("0")
+        self.horizontalHeader().setStretchLastSection(True)
+        self.setColumnWidth(TraceModel.COLUMN_CHANNEL, char_width * 9)
+        # shown once frames of more than one channel arrived
+        self.setColumnHidden(TraceModel.COLUMN_CHANNEL, True)
+        self.setColumnWidth(TraceModel.COLUMN_ID, char_width * 14)
+        self.setColumnWidth(TraceModel.COLUMN_DIR, char_width * 4)
+        self.setColumnWidth(TraceModel.COLUMN_DLC, char_width * 5)
+        self.setColumnWidth(TraceModel.COLUMN_DATA, char_width * 3 * 8 + 8)
+        self.setColumnWidth(TraceModel.COLUMN_COUNT, char_width * 10)
+        self.setColumnWidth(TraceModel.COLUMN_PERIOD, char_width * 12)
+        # shown while a signal database is loaded
+        self.setColumnHidden(TraceModel.COLUMN_DECODED, True)
+
+        # Repaint at a capped rate regardless of the frame rate
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.timeout.connect(self._flush)
+        self.set_refresh_rate(refresh_hz)
+
+    def set_refresh_rate(self, refresh_hz: int) -> None:
+        if refresh_hz <= 0:
+            raise ValueError("Refresh rate must be greater than 0")
+        self._refresh_timer.start(max(1, round(1000 / refresh_hz)))
+
+    def set_signal_decoder(self, decoder: SignalDecoder | None) -> None:
+        self._model.set_signal_decoder(decoder)
+        self.setColumnHidden(TraceModel.COLUMN_DECODED, decoder is None)
+
+    @Slot(list)
+    def add_frames(self, msgs: list[can.Message]) -> None:
+        self._model.add_frames(msgs)
+
+    @Slot(can.Message)
+    def add_frame(self, msg: can.Message) -> None:
+        self._model.add_frames([msg])
+
+    @Slot()
+    def _flush(self) -> None:
+        self._model.flush()
+        self.setColumnHidden(TraceModel.COLUMN_CHANNEL, len(self._model.channels()) < 2)
+
+    @Slot()
+    def clear(self) -> None:
+        self._model.clear()
@@ -0,0 +1,400 @@
+from dataclasses import asdict, dataclass
+from typing import Any
+
+import can
+from PySide6.QtCore import (
+    QAbstractTableModel,
+    QModelIndex,
+    QPersistentModelIndex,
+    Qt,
+    QTimer,
+    Signal,
+    Slot,
+)
+from PySide6.QtWidgets import (
+    QAbstractItemView,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QPushButton,
+    QTableView,
+    QVBoxLayout,
+    QWidget,
+)
+
+from ..utils.tx_scheduler import TxScheduler
+from .table_model import ROOT_INDEX
+
+STATS_REFRESH_MS = 500
+DEFAULT_PERIOD_MS = 100.0
+_FD_DATA_LENGTHS = frozenset({12, 16, 20, 24, 32, 48, 64})
+
+
+@dataclass
+class TxTableRow:
+    arbitration_id: int
+    is_extended_id: bool
+    data: bytes
+    period_ms: float
+    offset_ms: float = 0.0
+    enabled: bool = True
+
+
+def _build_message(row: TxTableRow) -> can.Message:
+    # payloads longer than 8 bytes are sent as CAN-FD with bitrate switch
+    is_fd = len(row.data) > 8
+    return can.Message(
+        arbitration_id=row.arbitration_id,
+        is_extended_id=row.is_extended_id,
+        is_fd=is_fd,
+        bitrate_switch=is_fd,
+        data=row.data,
+    )
+
+
+def _parse_id(text: str, is_extended_id: bool) -> int:
+    value = int(text, 16)
+    if not 0 <= value <= (0x1FFFFFFF if is_extended_id else 0x7FF):
+        raise ValueError(f"ID out of range: {text}")
+    return value
+
+
+def _parse_data(text: str) -> bytes:
+    data = bytes.fromhex(text)
+    if len(data) > 8 and len(data) not in _FD_DATA_LENGTHS:
+        raise ValueError(f"Invalid CAN-FD data length: {len(data)}")
+    return data
+
+
+class TxTableModel(QAbstractTableModel):
+    COLUMN_ENABLED = 0
+    COLUMN_ID = 1
+    COLUMN_EXTENDED = 2
+    COLUMN_DATA = 3
+    COLUMN_PERIOD = 4
+    COLUMN_OFFSET = 5
+    COLUMN_SENT = 6
+    COLUMN_MISSED = 7
+    COLUMN_ERRORS = 8
+    HEADERS = (
+        "On",
+        "ID (hex)",
+        "Ext",
+        "Data (hex)",
+        "Period (ms)",
+        "Offset (ms)",
+        "Sent",
+        "Missed",
+        "Errors",
+    )
+    _CHECK_COLUMNS = (COLUMN_ENABLED, COLUMN_EXTENDED)
+    _EDIT_COLUMNS = (COLUMN_ID, COLUMN_DATA, COLUMN_PERIOD, COLUMN_OFFSET)
+
+    def __init__(self, scheduler: TxScheduler, parent=None):
+        super().__init__(parent)
+        self._scheduler = scheduler
+        self._rows: list[TxTableRow] = []
+        # scheduler key of every row
+        self._keys: list[int] = []
+
+    def rowCount(self, parent: QModelIndex | QPersistentModelIndex = ROOT_INDEX) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def columnCount(
+        self, parent: QModelIndex | QPersistentModelIndex = ROOT_INDEX
+    ) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.HEADERS)
+
+    def headerData(
+        self,
+        section: int,
+        orientation: Qt.Orientation,
+        role: int = Qt.ItemDataRole.DisplayRole,
+    ) -> Any:
+        if (
+            role == Qt.ItemDataRole.DisplayRole
+            and orientation == Qt.Orientation.Horizontal
+        ):
+            return self.HEADERS[section]
+        return None
+
+    def flags(self, index: QModelIndex | QPersistentModelIndex) -> Qt.ItemFlag:
+        flags = super().flags(index)
+        if index.column() in self._CHECK_COLUMNS:
+            flags |= Qt.ItemFlag.ItemIsUserCheckable
+        elif index.column() in self._EDIT_COLUMNS:
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def data(
+        self,
+        index: QModelIndex | QPersistentModelIndex,
+        role: int = Qt.ItemDataRole.DisplayRole,
+    ) -> Any:
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        column = index.column()
+        if role == Qt.ItemDataRole.CheckStateRole and column in self._CHECK_COLUMNS:
+            checked = (
+                row.enabled if column == self.COLUMN_ENABLED else row.is_extended_id
+            )
+            return Qt.CheckState.Checked if checked else Qt.CheckState.Unchecked
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return self._format_cell(index.row(), column)
+        if role == Qt.ItemDataRole.TextAlignmentRole and column >= self.COLUMN_PERIOD:
+            return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        return None
+
+    def setData(
+        self,
+        index: QModelIndex | QPersistentModelIndex,
+        value: Any,
+        role: int = Qt.ItemDataRole.EditRole,
+    ) -> bool:
+        if not index.isValid():
+            return False
+        row = self._rows[index.row()]
+        column = index.column()
+        edited = TxTableRow(**asdict(row))
+        try:
+            if role == Qt.ItemDataRole.CheckStateRole:
+                checked = Qt.CheckState(value) == Qt.CheckState.Checked
+                if column == self.COLUMN_ENABLED:
+                    edited.enabled = checked
+                elif column == self.COLUMN_EXTENDED:
+                    edited.is_extended_id = checked
+                    _parse_id(f"{row.arbitration_id:X}", checked)
+                else:
+                    return False
+            elif role == Qt.ItemDataRole.EditRole:
+                text = str(value).strip()
+                if column == self.COLUMN_ID:
+                    edited.arbitration_id = _parse_id(text, row.is_extended_id)
+                elif column == self.COLUMN_DATA:
+                    edited.data = _parse_data(text)
+                elif column == self.COLUMN_PERIOD:
+                    edited.period_ms = float(text)
+                elif column == self.COLUMN_OFFSET:
+                    edited.offset_ms = float(text)
+                else:
+                    return False
+            else:
+                return False
+            self._apply(index.row(), edited)
+        except ValueError:
+            return False
+        self.dataChanged.emit(
+            self.index(index.row(), 0),
+            self.index(index.row(), len(self.HEADERS) - 1),
+        )
+        return True
+
+    def rows(self) -> list[TxTableRow]:
+        return list(self._rows)
+
+    def add_row(self, row: TxTableRow) -> None:
+        key = self._scheduler.add(
+            _build_message(row), row.period_ms / 1000, row.offset_ms / 1000, row.enabled
+        )
+        position = len(self._rows)
+        self.beginInsertRows(ROOT_INDEX, position, position)
+        self._rows.append(row)
+        self._keys.append(key)
+        self.endInsertRows()
+
+    def remove_rows(self, positions: list[int]) -> None:
+        for position in sorted(set(positions), reverse=True):
+            self.beginRemoveRows(ROOT_INDEX, position, position)
+            self._scheduler.remove(self._keys.pop(position))
+            del self._rows[position]
+            self.endRemoveRows()
+
+    def refresh_stats(self) -> None:
+        if self._rows:
+            self.dataChanged.emit(
+                self.index(0, self.COLUMN_SENT),
+                self.index(len(self._rows) - 1, self.COLUMN_ERRORS),
+                [Qt.ItemDataRole.DisplayRole],
+            )
+
+    # Validates through the scheduler before the row is replaced
+    def _apply(self, position: int, row: TxTableRow) -> None:
+        key = self._keys[position]
+        self._scheduler.update(
+            key, _build_message(row), row.period_ms / 1000, row.offset_ms / 1000
+        )
+        if row.enabled != self._rows[position].enabled:
+            self._scheduler.set_enabled(key, row.enabled)
+        self._rows[position] = row
+
+    def _format_cell(self, position: int, column: int) -> str:
+        row = self._rows[position]
+        if column == self.COLUMN_ID:
+            if row.is_extended_id:
+                return f"{row.arbitration_id:08X}"
+            return f"{row.arbitration_id:03X}"
+        if column == self.COLUMN_DATA:
+            return row.data.hex(" ").upper()
+        if column == self.COLUMN_PERIOD:
+            return f"{row.period_ms:g}"
+        if column == self.COLUMN_OFFSET:
+            return f"{row.offset_ms:g}"
+        if column in (self.COLUMN_SENT, self.COLUMN_MISSED, self.COLUMN_ERRORS):
+            stats = self._scheduler.stats(self._keys[position])
+            if column == self.COLUMN_SENT:
+                return str(stats.sent)
+            if column == self.COLUMN_MISSED:
+                return str(stats.missed)
+            return str(stats.errors)
+        return ""
+
+
+class TxTable(QWidget):
+    """Editable table of cyclic messages, each with its own period and phase
+    offset, run by one TxScheduler."""
+
+    log_signal = Signal(str, str)
+
+    def __init__(self, scheduler: TxScheduler, parent=None):
+        super().__init__(parent)
+        self._scheduler = scheduler
+        self._connected = False
+
+        self._layout = QVBoxLayout()
+        self._layout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(self._layout)
+
+        # Message table
+        self._model = TxTableModel(scheduler, self)
+        self._table = QTableView()
+        self._table.setModel(self._model)
+        self._table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self._table.verticalHeader().setVisible(False)
+        self._table.horizontalHeader().setSectionResizeMode(
+            QHeaderView.ResizeMode.ResizeToContents
+        )
+        self._table.horizontalHeader().setSectionResizeMode(
+            TxTableModel.COLUMN_DATA, QHeaderView.ResizeMode.Stretch
+        )
+        self._layout.addWidget(self._table)
+
+        # button layout
+        self._button_layout = QHBoxLayout()
+        self._layout.addLayout(self._button_layout)
+
+        # Scheduler status
+        self._status_label = QLabel()
+        self._button_layout.addWidget(self._status_label)
+        self._button_layout.addStretch()
+
+        # Button for add a message
+        add_button = QPushButton("Add")
+        add_button.clicked.connect(self._on_add_clicked)
+        self._button_layout.addWidget(add_button)
+
+        # Button for remove the selected messages
+        remove_button = QPushButton("Remove")
+        remove_button.clicked.connect(self._on_remove_clicked)
+        self._button_layout.addWidget(remove_button)
+
+        # Button for reset the counters
+        reset_button = QPushButton("Reset")
+        reset_button.clicked.connect(self._on_reset_clicked)
+        self._button_layout.addWidget(reset_button)
+
+        # Start/Stop Button
+        self._start_button = QPushButton("Start")
+        self._start_button.clicked.connect(self._on_start_stop_clicked)
+        self._button_layout.addWidget(self._start_button)
+
+        self._stats_timer = QTimer(self)
+        self._stats_timer.timeout.connect(self._refresh)
+        self._update_status()
+
+    @Slot(bool)
+    def can_connection_change_callback(self, connected: bool) -> None:
+        self._connected = connected
+        if not connected:
+            # the handler stops the scheduler on disconnect
+            self._set_running(False)
+
+    def add_row(self, row: TxTableRow) -> None:
+        try:
+            self._model.add_row(row)
+        except ValueError as e:
+            self.log_signal.emit(f"Invalid transmit row: {e}", "red")
+        self._update_status()
+
+    # Rows as plain dicts, for QSettings
+    def saved_rows(self) -> list[dict[str, Any]]:
+        return [{**asdict(row), "data": row.data.hex()} for row in self._model.rows()]
+
+    def load_rows(self, rows: list[dict[str, Any]]) -> None:
+        for values in rows:
+            try:
+                row = TxTableRow(**{**values, "data": bytes.fromhex(values["data"])})
+            except (KeyError, TypeError, ValueError):
+                continue
+            self.add_row(row)
+
+    @Slot()
+    def _on_add_clicked(self) -> None:
+        rows = self._model.rows()
+        arbitration_id = rows[-1].arbitration_id + 1 if rows else 0x100
+        is_extended_id = rows[-1].is_extended_id if rows else False
+        if arbitration_id > (0x1FFFFFFF if is_extended_id else 0x7FF):
+            arbitration_id = 0
+        self.add_row(
+            TxTableRow(arbitration_id, is_extended_id, bytes(8), DEFAULT_PERIOD_MS)
+        )
+
+    @Slot()
+    def _on_remove_clicked(self) -> None:
+        positions = [
+            index.row() for index in self._table.selectionModel().selectedRows()
+        ]
+        self._model.remove_rows(positions)
+        self._update_status()
+
+    @Slot()
+    def _on_reset_clicked(self) -> None:
+        self._scheduler.reset_stats()
+        self._model.refresh_stats()
+
+    @Slot()
+    def _on_start_stop_clicked(self) -> None:
+        if self._scheduler.is_running():
+            self._set_running(False)
+            self.log_signal.emit("Stopped the transmit table", "green")
+            return
+        if not self._connected:
+            self.log_signal.emit("No connection!! Please connect to CAN device", "red")
+            return
+        self._set_running(True)
+        self.log_signal.emit(
+            f"Started the transmit table ({len(self._scheduler)} messages)", "green"
+        )
+
+    def _set_running(self, running: bool) -> None:
+        if running:
+            self._scheduler.start()
+            self._stats_timer.start(STATS_REFRESH_MS)
+        else:
+            self._scheduler.stop()
+            self._stats_timer.stop()
+        self._start_button.setText("Stop" if running else "Start")
+        self._refresh()
+
+    @Slot()
+    def _refresh(self) -> None:
+        self._model.refresh_stats()
+        self._update_status()
+
+    def _update_status(self) -> None:
+        state = "running" if self._scheduler.is_running() else "stopped"
+        self._status_label.setText(f"{len(self._scheduler)} messages | {state}")
@@ -0,0 +1,257 @@
+"""Capture and transmit from a plain event loop, without Qt.
+
+Uses the same bus setup, ID filter and recorder as the GUI. Nothing in this
+module (or what it imports) may import PySide6.
+"""
+
+import argparse
+import signal
+import sys
+import threading
+import time
+
+import can
+
+from .utils.can_bus import (
+    format_can_error_frame,
+    format_connection_error,
+    open_can_bus,
+)
+from .utils.id_filter import (
+    FILTER_MODE_BLOCK,
+    CompiledIdFilter,
+    build_can_filter_plan,
+    parse_filter_rule,
+)
+from .utils.periodic_sender import MODE_NATIVE, PeriodicSender
+from .utils.pipeline_stats import (
+    PipelineStats,
+    ReceiveCounters,
+    collect_pipeline_stats,
+)
+from .utils.recorder import FrameRecorder
+
+
+def parse_bitrate(text: str) -> int:
+    text = text.strip()
+    if text[-1:] in ("M", "m"):
+        return int(float(text[:-1]) * 1_000_000)
+    if text[-1:] in ("K", "k"):
+        return int(float(text[:-1]) * 1_000)
+    return int(text)
+
+
+def parse_frame(text: str) -> can.Message:
+    """Parse a frame in cansend syntax.
+
+    ``123#DEADBEEF`` (classic), ``123#R`` (remote), ``123##1DEADBEEF``
+    (CAN-FD, flag nibble 1 = bitrate switch). IDs with more than three hex
+    digits are extended.
+    """
+    id_text, separator, body = text.strip().partition("#")
+    if separator == "" or id_text == "":
+        raise ValueError(f"Invalid frame '{text}', expected ID#DATA")
+    arbitration_id = int(id_text, 16)
+    is_extended_id = len(id_text) > 3
+    if body.startswith("#"):
+        if len(body) < 2:
+            raise ValueError(f"Invalid CAN-FD frame '{text}', expected ID##FLAGSDATA")
+        flags = int(body[1], 16)
+        return can.Message(
+            arbitration_id=arbitration_id,
+            is_extended_id=is_extended_id,
+            is_fd=True,
+            bitrate_switch=bool(flags & 0x1),
+            data=bytes.fromhex(body[2:].replace(".", "")),
+        )
+    if body[:1] in ("R", "r"):
+        return can.Message(
+            arbitration_id=arbitration_id,
+            is_extended_id=is_extended_id,
+            is_remote_frame=True,
+            dlc=int(body[1:] or "0"),
+        )
+    return can.Message(
+        arbitration_id=arbitration_id,
+        is_extended_id=is_extended_id,
+        data=bytes.fromhex(body.replace(".", "")),
+    )
+
+
+class _HeadlessListener:
+    """Runs on the notifier thread: filter, then record and print."""
+
+    def __init__(
+        self,
+        id_filter: CompiledIdFilter,
+        recorder: FrameRecorder | None,
+        print_frames: bool,
+    ):
+        self._id_filter = id_filter
+        self._recorder = recorder
+        self._print_frames = print_frames
+        self._reported_error_frames: set[tuple[int, tuple[int, ...]]] = set()
+        # the same stage counters as the GUI's receive path
+        self.counters = ReceiveCounters()
+
+    def stats(self) -> PipelineStats:
+        return collect_pipeline_stats([self.counters])
+
+    def on_message_received(self, msg: can.Message) -> None:
+        started = time.perf_counter_ns()
+        counters = self.counters
+        counters.received += 1
+        self._handle_message(msg, counters)
+        counters.receive_ns += time.perf_counter_ns() - started
+
+    def _handle_message(self, msg: can.Message, counters: ReceiveCounters) -> None:
+        msg.is_rx = True
+        if msg.is_error_frame:
+            counters.error_frames += 1
+            if self._recorder is not None:
+                self._recorder.record(msg)
+            data = list(msg.data) if msg.data is not None else []
+            error_key = (msg.arbitration_id, tuple(data[:6]))
+            if error_key not in self._reported_error_frames:
+                self._reported_error_frames.add(error_key)
+                print(format_can_error_frame(msg), file=sys.stderr)
+            return
+        if not self._id_filter.accepts(msg.arbitration_id, msg.is_extended_id):
+            counters.filtered_out += 1
+            return
+        if self._recorder is not None:
+            self._recorder.record(msg)
+        if self._print_frames:
+            print(msg)
+
+    def record_sent(self, msg: can.Message) -> None:
+        if self._recorder is not None:
+            self._recorder.record(msg)
+        if self._print_frames:
+            print(msg)
+
+
+def _status_line(
+    listener: _HeadlessListener,
+    recorder: FrameRecorder | None,
+    senders: list[PeriodicSender],
+) -> str:
+    pipeline = listener.stats()
+    accepted = pipeline.received - pipeline.filtered_out - pipeline.error_frames
+    text = (
+        f"received {pipeline.received} | accepted {accepted} | "
+        f"filtered {pipeline.filtered_out} | error frames {pipeline.error_frames}"
+    )
+    if pipeline.receive_time_per_frame is not None:
+        text += f" | {pipeline.receive_time_per_frame * 1_000_000:.1f} µs/frame"
+    for sender in senders:
+        send_stats = sender.stats()
+        if send_stats.mode == MODE_NATIVE:
+            continue
+        text += f" | sent {send_stats.sent}"
+        if send_stats.period_mean is not None and send_stats.jitter is not None:
+            text += (
+                f" period {send_stats.period_mean * 1000:.3f} ms"
+                f" jitter {send_stats.jitter * 1000:.3f} ms"
+            )
+        if send_stats.errors:
+            text += f" errors {send_stats.errors}"
+    if recorder is not None:
+        record_stats = recorder.stats()
+        megabytes = record_stats.bytes_written / (1024 * 1024)
+        text += (
+            f" | recorded {record_stats.written} ({megabytes:.1f} MB)"
+            f" | queue {record_stats.queued}/{record_stats.queue_capacity}"
+            f" | dropped {record_stats.dropped}"
+        )
+    return text
+
+
+def run_headless(args: argparse.Namespace) -> int:
+    if not args.channel:
+        print("--headless needs --channel", file=sys.stderr)
+        return 2
+    try:
+        bitrate = parse_bitrate(args.bitrate)
+        data_bitrate = parse_bitrate(args.data_bitrate) if args.data_bitrate else None
+        id_filter = CompiledIdFilter(
+            [parse_filter_rule(rule, "hex") for rule in args.filter or []],
+            args.filter_mode or FILTER_MODE_BLOCK,
+        )
+        frames = [parse_frame(text) for text in args.send or []]
+        recorder = FrameRecorder(args.record) if args.record else None
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    try:
+        bus = open_can_bus(
+            args.channel, bitrate, args.can, data_bitrate is not None, data_bitrate
+        )
+    except (can.CanError, OSError, ValueError) as e:
+        print(format_connection_error(e, args.can), file=sys.stderr)
+        return 1
+
+    plan = build_can_filter_plan(id_filter)
+    try:
+        bus.set_filters(plan.can_filters)
+    except (can.CanError, NotImplementedError, OSError) as e:
+        bus.set_filters(None)
+        print(f"Bus filters not applied, filtering in software: {e}", file=sys.stderr)
+
+    stop = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+
+    listener = _HeadlessListener(id_filter, recorder, args.print_frames)
+    notifier: can.Notifier | None = None
+    senders: list[PeriodicSender] = []
+    try:
+        if recorder is not None:
+            recorder.start()
+        notifier = can.Notifier(bus, [listener.on_message_received], timeout=0.1)
+        for msg in frames:
+            if args.interval_ms:
+                # frames sent by the kernel (SocketCAN BCM) are not recorded
+                senders.append(
+                    PeriodicSender(
+                        bus,
+                        args.can,
+                        msg,
+                        args.interval_ms / 1000,
+                        listener.record_sent,
+                    )
+                )
+            else:
+                msg.timestamp = time.time()
+                msg.is_rx = False
+                bus.send(msg)
+                listener.record_sent(msg)
+
+        deadline = time.monotonic() + args.duration if args.duration else None
+        status_interval = args.status_interval
+        next_status = time.monotonic() + status_interval if status_interval else None
+        while not stop.is_set():
+            now = time.monotonic()
+            if deadline is not None and now >= deadline:
+                break
+            wake = min(t for t in (deadline, next_status, now + 1.0) if t is not None)
+            stop.wait(max(0.0, wake - now))
+            if next_status is not None and time.monotonic() >= next_status:
+                print(_status_line(listener, recorder, senders), file=sys.stderr)
+                next_status += status_interval
+    except (can.CanError, OSError) as e:
+        print(e, file=sys.stderr)
+        return 1
+    finally:
+        for sender in senders:
+            sender.stop()
+        if notifier is not None:
+            notifier.stop()
+        bus.shutdown()
+        if recorder is not None:
+            recorder.stop()
+            if recorder.error is not None:
+                print(f"Recording failed: {recorder.error}", file=sys.stderr)
+        print(_status_line(listener, recorder, senders), file=sys.stderr)
+    return 0
@@ -0,0 +1,744 @@
+import json
+
+import can
+from PySide6.QtCore import QSettings, Signal, Slot
+from PySide6.QtGui import QAction, QKeySequence
+from PySide6.QtWidgets import (
+    QFileDialog,
+    QHBoxLayout,
+    QInputDialog,
+    QMainWindow,
+    QTabWidget,
+    QVBoxLayout,
+    QWidget,
+)
+from returns.pipeline import is_successful
+
+from .component.bitrate_selector import BitrateSelector
+from .component.burst_dialog import BurstDialog
+from .component.bus_load_indicator import BusLoadIndicator
+from .component.can_message_editor import CanMessageEditor
+from .component.channel_selector import ChannelSelector
+from .component.communication_controller import CommunicationController
+from .component.latency_panel import LatencyPanel
+from .component.logbox import TIME_MODE_ABSOLUTE, TIME_MODES, LogBox
+from .component.message_filter import MessageFilter
+from .component.record_controller import RecordController
+from .component.replay_controller import ReplayController
+from .component.signal_database_controller import SignalDatabaseController
+from .component.statistics_view import StatisticsView
+from .component.status_bar import PipelineStatusBar
+from .component.trace_view import TraceView
+from .component.tx_table import TxTable
+from .utils.burst import BurstConfig, BurstSender
+from .utils.can_bus import channel_label
+from .utils.can_handler import CANHandler
+from .utils.capture_file import CAPTURE_SUFFIX, CaptureFile
+from .utils.display_policy import DISPLAY_MODES, DisplayPolicy
+from .utils.frame_buffer import FrameBufferStats
+from .utils.frame_store import DEFAULT_MAX_FRAMES
+from .utils.pipeline_stats import PipelineStats
+
+
+class MainWindow(QMainWindow):
+    radix_status_signal = Signal(str)
+    log_signal = Signal(str, str)
+    can_log_signal = Signal(can.Message)
+    can_connection_status_signal = Signal(bool)
+
+    def __init__(self, can_type, initial_radix_type="dec"):
+        super().__init__()
+        self.radix_type = initial_radix_type
+        self.can_type = can_type
+        self.can_fd_enabled = False
+
+        self._update_window_title()
+        self.setGeometry(500, 200, 800, 300)
+
+        self._central_widget = QWidget()
+        self.setCentralWidget(self._central_widget)
+
+        # Components
+        self.can_handler = CANHandler()
+        self.channel_selector = ChannelSelector(preferred_interface=self.can_type)
+        self.can_message_editor = CanMessageEditor()
+        self.bitrate_selector = BitrateSelector()
+        self.data_bitrate_selector = BitrateSelector(
+            default_bitrate="2M",
+            label="Data Bitrate:",
+            bitrate_options=["2M", "5M"],
+            allow_custom=False,
+        )
+        self.bus_load_indicator = BusLoadIndicator()
+        self.communication_controller = CommunicationController()
+        self.record_controller = RecordController()
+        self.replay_controller = ReplayController()
+        self.signal_database_controller = SignalDatabaseController()
+        self.message_filter = MessageFilter()
+        self.log_box = LogBox()
+        self._history_spill_path: str | None = None
+        self.trace_view = TraceView()
+        self.statistics_view = StatisticsView()
+        self.tx_table = TxTable(self.can_handler.tx_scheduler)
+        self.status_bar = PipelineStatusBar()
+        self.setStatusBar(self.status_bar)
+        self.latency_panel = LatencyPanel(self.log_box.latency_histogram)
+        self.status_bar.addPermanentWidget(self.latency_panel)
+
+        # Layout
+        self._layout_main = QVBoxLayout()
+        self._layout_holizontal = QHBoxLayout()
+        self._layout_holizontal.addLayout(self._layout_main, 800)
+        self._central_widget.setLayout(self._layout_holizontal)
+
+        self._layout_main.addWidget(self.channel_selector)
+        self._layout_main.addWidget(self.can_message_editor)
+        # Scrolling log and fixed trace (one row per ID)
+        self._view_tabs = QTabWidget()
+        self._view_tabs.addTab(self.log_box, "Log")
+        self._view_tabs.addTab(self.trace_view, "Trace")
+        self._view_tabs.addTab(self.statistics_view, "Statistics")
+        self._view_tabs.addTab(self.tx_table, "Transmit")
+        self._layout_main.addWidget(self._view_tabs)
+        self._layout_holizontal.addWidget(self.message_filter, 300)
+        self._layout_main.addWidget(self.replay_controller)
+
+        # Bottom Layout
+        self._layout_bottom = QHBoxLayout()
+        self._layout_bottom.addWidget(self.bitrate_selector)
+        self._layout_bottom.addWidget(self.data_bitrate_selector)
+        self._layout_bottom.addWidget(self.bus_load_indicator)
+        self._layout_bottom.addWidget(self.signal_database_controller)
+        self._layout_bottom.addWidget(self.record_controller)
+        self._layout_bottom.addWidget(self.communication_controller)
+        self._layout_main.addLayout(self._layout_bottom)
+        self.data_bitrate_selector.setVisible(False)
+
+        # Hide Message Filter Default
+        self.message_filter.setVisible(False)
+        self.replay_controller.setVisible(False)
+
+        # Set Key-Board Shortcuts
+        # Ctrl + D : Change Radix to DEC
+        change_radix_to_dec_aciton = QAction("Change Radix to Dec", self)
+        change_radix_to_dec_aciton.setShortcuts(
+            [
+                QKeySequence("Ctrl+D"),
+                QKeySequence("Ctrl+F"),
+            ]
+        )
+        change_radix_to_dec_aciton.triggered.connect(self._change_radix_to_dec)
+        self.addAction(change_radix_to_dec_aciton)
+
+        # Ctrl + H :  Change Radix to HEX
+        change_radix_to_hex_aciton = QAction("Change Radix to Hex", self)
+        change_radix_to_hex_aciton.setShortcuts(
+            [
+                QKeySequence("Ctrl+H"),
+                QKeySequence("Ctrl+J"),
+            ]
+        )
+        change_radix_to_hex_aciton.triggered.connect(self._change_radix_to_hex)
+        self.addAction(change_radix_to_hex_aciton)
+
+        # Ctrl + P : Extend Pro Mode
+        _toggle_message_filter = QAction("Show and Hide the Message Filter", self)
+        _toggle_message_filter.setShortcuts([QKeySequence("Ctrl+P")])
+        _toggle_message_filter.triggered.connect(self._toggle_message_filter)
+        self.addAction(_toggle_message_filter)
+
+        # Ctrl + T : Cycle the log time mode (absolute/relative/delta per ID)
+        cycle_time_mode_action = QAction("Cycle Time Mode", self)
+        cycle_time_mode_action.setShortcuts([QKeySequence("Ctrl+T")])
+        cycle_time_mode_action.triggered.connect(self.log_box.cycle_time_mode)
+        self.addAction(cycle_time_mode_action)
+
+        # Ctrl + L : Switch between the log, the fixed trace and the statistics
+        toggle_view_action = QAction("Switch Log/Trace/Statistics View", self)
+        toggle_view_action.setShortcuts([QKeySequence("Ctrl+L")])
+        toggle_view_action.triggered.connect(self._toggle_view)
+        self.addAction(toggle_view_action)
+
+        # Ctrl + O : Open a capture file (.cvc) in the log and statistics
+        open_capture_action = QAction("Open Capture File", self)
+        open_capture_action.setShortcuts([QKeySequence("Ctrl+O")])
+        open_capture_action.triggered.connect(self._open_capture_dialog)
+        self.addAction(open_capture_action)
+
+        # Ctrl + R : Show and hide the replay bar
+        toggle_replay_action = QAction("Show and Hide the Replay Controls", self)
+        toggle_replay_action.setShortcuts([QKeySequence("Ctrl+R")])
+        toggle_replay_action.triggered.connect(self._toggle_replay_controller)
+        self.addAction(toggle_replay_action)
+
+        # Ctrl + G : Go to a time (seconds from the start) or the next frame of an ID
+        go_to_action = QAction("Go to Time or ID", self)
+        go_to_action.setShortcuts([QKeySequence("Ctrl+G")])
+        go_to_action.triggered.connect(self._go_to_dialog)
+        self.addAction(go_to_action)
+
+        # Ctrl + Enter : Send CAN Message
+        send_can_msg_with_keybind_action = QAction("Send CAN Message", self)
+        send_can_msg_with_keybind_action.setShortcuts([QKeySequence("Ctrl+Return")])
+        send_can_msg_with_keybind_action.triggered.connect(self.send_can_msg)
+        self.addAction(send_can_msg_with_keybind_action)
+
+        # Signal Connection
+
+        # When the Radix changes, notify new radix
+        self.radix_status_signal.connect(self.can_message_editor.update_radix)
+        self.radix_status_signal.connect(self.message_filter.update_radix)
+        self.can_message_editor.radix_toggle_signal.connect(self.toggle_radix)
+
+        # Send log data to logbox
+        self.log_signal.connect(self.log_box.log)
+
+        # Send CAN-BUS Message to logbox
+        self.can_log_signal.connect(self.log_box.can_msg_log)
+        # the log view may be decimated; everything below gets every frame
+        self.display_policy = DisplayPolicy()
+        self.can_handler.receive_batch_signal.connect(self._show_received_frames)
+
+        # Send CAN-BUS Message to the fixed trace
+        self.can_log_signal.connect(self.trace_view.add_frame)
+        self.can_handler.receive_batch_signal.connect(self.trace_view.add_frames)
+
+        # Per-ID statistics from the receive path
+        self.can_handler.receive_batch_signal.connect(self.statistics_view.add_frames)
+        self.statistics_view.log_signal.connect(self.log)
+        self.tx_table.log_signal.connect(self.log)
+
+        # Stream every received and sent frame to the recording, if any
+        self.can_handler.add_frame_tap(self.record_controller.record)
+        self.record_controller.log_signal.connect(self.log)
+
+        # Decoded signals in the log and the trace
+        self.signal_database_controller.decoder_signal.connect(
+            self.log_box.set_signal_decoder
+        )
+        self.signal_database_controller.decoder_signal.connect(
+            self.trace_view.set_signal_decoder
+        )
+        self.signal_database_controller.log_signal.connect(self.log)
+
+        # Replayed frames take the same path as received ones
+        self.replay_controller.set_frame_sink(
+            self.can_handler.inject_frame, self.can_handler.is_receive_backlogged
+        )
+        self.replay_controller.set_transmitter(self.can_handler.can_send)
+        self.replay_controller.log_signal.connect(self.log)
+
+        # Bus load from received and sent frames, including the ones the ID
+        # filter hides, the ones the kernel sends periodically and the ones
+        # of a burst kept out of the log
+        self.can_log_signal.connect(self.bus_load_indicator.add_frame)
+        self.can_handler.receive_batch_signal.connect(
+            self.bus_load_indicator.add_frames
+        )
+        self.can_handler.filtered_batch_signal.connect(
+            self.bus_load_indicator.add_frames
+        )
+        self.bus_load_indicator.set_unseen_load_source(
+            self.can_handler.unseen_send_load
+        )
+        self.can_handler.error_log_signal.connect(self.log)
+
+        # Show receive pipeline statistics on the status bar
+        self.can_handler.receive_stats_signal.connect(
+            self.status_bar.update_receive_stats
+        )
+        self.can_handler.receive_stats_signal.connect(self._update_display_backlog)
+        self.status_bar.display_mode_signal.connect(self._on_display_mode_changed)
+        self.log_box.history_stats_signal.connect(self.status_bar.update_history_stats)
+        self.status_bar.set_pipeline_stats_source(self.pipeline_stats)
+
+        # Notify the CAN-BUS connection status
+        self.can_connection_status_signal.connect(
+            self.communication_controller.can_connection_change_callback
+        )
+        self.can_connection_status_signal.connect(
+            self.tx_table.can_connection_change_callback
+        )
+
+        ###############################################
+        # Send a Trigger when the 'communication_controller' order to send a message
+        self.communication_controller.send_can_msg_trigger_signal.connect(
+            self.send_can_msg
+        )
+
+        # Periodic sending runs in the kernel or a sender thread
+        self.communication_controller.start_periodic_signal.connect(
+            self._start_periodic_send
+        )
+        self.communication_controller.stop_periodic_signal.connect(
+            self.can_handler.stop_periodic
+        )
+        self.communication_controller.set_periodic_stats_source(
+            self.can_handler.get_periodic_stats
+        )
+        self.can_message_editor.message_edited_signal.connect(
+            self._update_periodic_send
+        )
+
+        # Burst transmit runs on its own thread, controlled from a dialog
+        self._burst_dialog: BurstDialog | None = None
+        self.communication_controller.open_burst_signal.connect(self._open_burst_dialog)
+
+        # Handle Log data from 'communication_controller'
+        self.communication_controller.log_signal.connect(self.log)
+
+        # Clear Log data from 'communication_controller'
+        self.communication_controller.log_clear_signal.connect(self.log_box.clear)
+        self.communication_controller.log_clear_signal.connect(self.trace_view.clear)
+
+        ###############################################
+        # Connect/Disconnect CAN-BUS Interface(with receiving 'channel name')
+        self.channel_selector.channel_signal.connect(
+            self._toggle_can_interface_connection
+        )
+        self.channel_selector.mode_signal.connect(self._on_can_mode_changed)
+        self.channel_selector.selection_signal.connect(self._on_channel_selected)
+
+        ###############################################
+        # Handle Log data from 'can_message_editor'
+        self.can_message_editor.log_signal.connect(self.log)
+
+        ###############################################
+        # Update the ID filter from 'message_filter'
+        self.message_filter.update_filter_signal.connect(
+            self.can_handler.update_id_filter
+        )
+        self.can_handler.filter_placement_signal.connect(
+            self.message_filter.set_rule_placement
+        )
+
+        # load settings
+        self.settings = QSettings("CANViewer", "CANViewer")
+        saved_bitrate = self.settings.value("bitrate", self.settings.value("bps", "1M"))
+        if not isinstance(saved_bitrate, str):
+            saved_bitrate = "1M"
+        self.bitrate_selector.set_bitrate_text(saved_bitrate)
+        saved_data_bitrate = self.settings.value(
+            "data_bitrate", self.settings.value("data_bps", "2M")
+        )
+        if not isinstance(saved_data_bitrate, str):
+            saved_data_bitrate = "2M"
+        self.data_bitrate_selector.set_bitrate_text(saved_data_bitrate)
+        self.configure_receive_pipeline(
+            self._settings_int("rx_batch_size"),
+            self._settings_int("rx_tick_hz"),
+            self._settings_int("rx_buffer_capacity"),
+        )
+        saved_tx_table = self.settings.value("tx_table", "")
+        if isinstance(saved_tx_table, str) and saved_tx_table:
+            try:
+                self.tx_table.load_rows(json.loads(saved_tx_table))
+            except ValueError:
+                pass
+        saved_time_mode = self.settings.value("time_mode", TIME_MODE_ABSOLUTE)
+        if saved_time_mode in TIME_MODES:
+            self.log_box.set_time_mode(saved_time_mode)
+        saved_history_spill = self.settings.value("history_spill", "")
+        self.configure_history(
+            self._settings_int("history_frames", DEFAULT_MAX_FRAMES),
+            self._settings_float("history_mb"),
+            saved_history_spill if isinstance(saved_history_spill, str) else "",
+        )
+        saved_display_mode = self.settings.value("display_mode", None)
+        self.configure_display(
+            saved_display_mode if saved_display_mode in DISPLAY_MODES else None,
+            self._settings_int("display_every_n"),
+            self._settings_int("display_threshold"),
+        )
+
+    def closeEvent(self, event) -> None:
+        self.settings.setValue("bitrate", self.bitrate_selector.get_bitrate_text())
+        self.settings.setValue(
+            "data_bitrate", self.data_bitrate_selector.get_bitrate_text()
+        )
+        batch_size, tick_hz, buffer_capacity = self.can_handler.get_receive_config()
+        self.settings.setValue("rx_batch_size", batch_size)
+        self.settings.setValue("rx_tick_hz", tick_hz)
+        self.settings.setValue("rx_buffer_capacity", buffer_capacity)
+        history = self.log_box.history_stats()
+        self.settings.setValue("history_frames", history.max_frames or 0)
+        self.settings.setValue(
+            "history_mb",
+            history.max_bytes / (1024 * 1024) if history.max_bytes else 0,
+        )
+        self.settings.setValue("history_spill", self._history_spill_path or "")
+        self.settings.setValue("time_mode", self.log_box.time_mode())
+        self.settings.setValue("display_mode", self.display_policy.mode)
+        self.settings.setValue("display_every_n", self.display_policy.every_n)
+        self.settings.setValue("display_threshold", self.display_policy.threshold or 0)
+        self.settings.setValue("tx_table", json.dumps(self.tx_table.saved_rows()))
+        if self._burst_dialog is not None:
+            self._burst_dialog.close()
+        self.can_handler.stop_burst()
+        self.can_handler.disconnect_devive()
+        self.replay_controller.close_replay()
+        self.record_controller.stop_recording()
+        self.log_box.close_history()
+        self.channel_selector.shutdown()
+        event.accept()
+
+    def configure_receive_pipeline(
+        self,
+        batch_size: int | None = None,
+        tick_hz: int | None = None,
+        buffer_capacity: int | None = None,
+    ) -> None:
+        try:
+            self.can_handler.configure_receive_pipeline(
+                batch_size, tick_hz, buffer_capacity
+            )
+        except ValueError as e:
+            self.log(f"Invalid receive pipeline setting: {e}", color="red")
+        batch_size, tick_hz, _ = self.can_handler.get_receive_config()
+        self.status_bar.set_receive_config(batch_size, tick_hz)
+        self.status_bar.update_receive_stats(self.can_handler.get_receive_stats())
+
+    # Counters of every stage from the bus to the log view
+    def pipeline_stats(self) -> PipelineStats:
+        return self.can_handler.get_pipeline_stats(self.log_box.render_counters())
+
+    # None keeps the current value. Limits of 0 mean unlimited and an empty
+    # spill path disables spilling.
+    def configure_history(
+        self,
+        max_frames: int | None = None,
+        max_mb: float | None = None,
+        spill_path: str | None = None,
+    ) -> None:
+        current = self.log_box.history_stats()
+        if max_frames is None:
+            max_frames = current.max_frames
+        if max_mb is None and current.max_bytes is not None:
+            max_mb = current.max_bytes / (1024 * 1024)
+        if spill_path is None:
+            spill_path = self._history_spill_path
+        try:
+            self.log_box.set_history_limits(
+                max_frames or None, max_mb or None, spill_path or None
+            )
+        except ValueError as e:
+            self.log(f"Invalid history setting: {e}", color="red")
+            return
+        self._history_spill_path = spill_path or None
+
+    # None keeps the current value; a threshold of 0 never decimates "all"
+    def configure_display(
+        self,
+        mode: str | None = None,
+        every_n: int | None = None,
+        threshold: int | None = None,
+    ) -> None:
+        try:
+            self.display_policy.configure(mode, every_n, threshold)
+        except ValueError as e:
+            self.log(f"Invalid display setting: {e}", color="red")
+        self.status_bar.set_display_mode(self.display_policy.mode)
+        self.status_bar.update_display_stats(self.display_policy.stats())
+
+    @Slot(list)
+    def _show_received_frames(self, msgs: list[can.Message]) -> None:
+        self.log_box.can_msg_batch_log(self.display_policy.select(msgs))
+
+    @Slot(FrameBufferStats)
+    def _update_display_backlog(self, stats: FrameBufferStats) -> None:
+        self.display_policy.set_backlog(stats.pending)
+        self.status_bar.update_display_stats(self.display_policy.stats())
+
+    @Slot(str)
+    def _on_display_mode_changed(self, mode: str) -> None:
+        self.configure_display(mode)
+
+    def _settings_int(self, key: str, default: int | None = None) -> int | None:
+        value = self.settings.value(key)
+        if value is None:
+            return default
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return default
+
+    def _settings_float(self, key: str) -> float | None:
+        value = self.settings.value(key)
+        if value is None:
+            return None
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+
+    @Slot()
+    def send_can_msg(self) -> None:
+        # Check CAN connection status
+        if not self.can_handler.get_connect_status():
+            self.log("No connection!! Please connect to CAN device", color="red")
+            return
+
+        # Get CAN Message from 'can_message_editor'
+        msg: can.Message | None  # msg: can.Message | None
+        usable: bool  # message is usable or not
+        msg, usable = self.can_message_editor.get_message()
+
+        if not usable:
+            return
+        if msg is None:
+            return
+
+        try:
+            self.can_handler.can_send(msg)  # Send CAN Message
+            self.can_log_signal.emit(msg)  # Log CAN Message to logbox
+        except can.CanError as e:
+            self.log(f"Failed to send: {e}", color="red")
+
+    @Slot(float)
+    def _start_periodic_send(self, period: float) -> None:
+        if not self.can_handler.get_connect_status():
+            self.log("No connection!! Please connect to CAN device", color="red")
+            return
+        msg, usable = self.can_message_editor.get_message()
+        if not usable or msg is None:
+            return
+        try:
+            sender = self.can_handler.start_periodic(msg, period)
+        except (can.CanError, ValueError, OSError) as e:
+            self.log(f"Failed to start sending: {e}", color="red")
+            return
+        self.communication_controller.set_periodic_running(True)
+        note = "" if sender.observed else " (sent frames are not logged)"
+        self.log(
+            f"Started sending data every {period * 1000:g} ms via {sender.mode}{note}"
+        )
+
+    # Edits in the message editor go to the running periodic send
+    @Slot()
+    def _update_periodic_send(self) -> None:
+        if self.can_handler.get_periodic_stats() is None:
+            return
+        msg, usable = self.can_message_editor.get_message(log_errors=False)
+        if not usable or msg is None:
+            return
+        try:
+            self.can_handler.update_periodic(msg)
+        except (can.CanError, ValueError, OSError) as e:
+            self.log(f"Failed to update periodic data: {e}", color="red")
+
+    @Slot()
+    def _open_burst_dialog(self) -> None:
+        if self._burst_dialog is None:
+            self._burst_dialog = BurstDialog(
+                self._burst_template,
+                self._start_burst,
+                self.can_handler.stop_burst,
+                self.can_handler.get_burst_stats,
+                self,
+            )
+            self._burst_dialog.log_signal.connect(self.log)
+        self._burst_dialog.show()
+        self._burst_dialog.raise_()
+
+    def _burst_template(self) -> can.Message | None:
+        msg, usable = self.can_message_editor.get_message()
+        return msg if usable else None
+
+    def _start_burst(self, msg: can.Message, config: BurstConfig) -> BurstSender:
+        if not self.can_handler.get_connect_status():
+            raise can.CanOperationError("Not connected")
+        sender = self.can_handler.start_burst(msg, config)
+        limits = []
+        if config.count is not None:
+            limits.append(f"{config.count} frames")
+        if config.duration is not None:
+            limits.append(f"{config.duration:g} s")
+        self.log(
+            f"Started a burst of {' or '.join(limits)} "
+            f"on {self.can_handler.transmit_channel()}"
+        )
+        return sender
+
+    # This method handles the logbox. If you want to show log-data on the logbox, you can use this method.
+    @Slot(str, str)
+    def log(self, text: str, color: str | None = None) -> None:
+        self.log_signal.emit(text, color)
+
+    @Slot(str, str, bool)
+    def _toggle_can_interface_connection(
+        self, channel: str, can_type: str, can_fd: bool
+    ) -> None:
+        label = channel_label(channel, can_type)
+        # check the connection status of the selected channel
+        if not self.can_handler.is_channel_connected(label):
+            first_connection = not self.can_handler.get_connect_status()
+            self.can_type = can_type
+            self.can_fd_enabled = can_fd
+            self.can_message_editor.set_can_fd_mode(self.can_fd_enabled)
+            self._update_window_title()
+            # Get bitrate from 'bitrate_selector'
+            bitrate: int = self.bitrate_selector.get_bitrate()
+            data_bitrate: int | None = None
+            if self.can_fd_enabled:
+                data_bitrate = self.data_bitrate_selector.get_bitrate()
+            # Make a connection
+            rslt = self.can_handler.connect_device(
+                channel, bitrate, can_type, self.can_fd_enabled, data_bitrate
+            )
+
+            if is_successful(rslt):
+                if first_connection:
+                    self.bus_load_indicator.reset()
+                self.bus_load_indicator.set_channels(
+                    self.can_handler.channel_bitrates()
+                )
+                self.message_filter.set_channels(self.can_handler.connected_channels())
+                self.log_box.set_live_channels(self.can_handler.connected_channels())
+                self.can_handler.set_transmit_channel(label)
+                # set statuses
+                self.bitrate_selector.set_disable()  # Make bitrate_selector uneditable
+                self.data_bitrate_selector.set_disable()
+                # Notify the channel is connected to the 'channel_selector'
+                self.channel_selector.channel_connection_change_callback(
+                    channel, can_type, True
+                )
+                if first_connection:
+                    self.can_connection_status_signal.emit(True)
+                data_bitrate_text = (
+                    f" / data {data_bitrate} bit/s" if data_bitrate else ""
+                )
+                self.log(
+                    f"Connected to {channel} : {bitrate} bit/s{data_bitrate_text}",
+                    color="green",
+                )
+            else:
+                self.log(f"{rslt.failure()}", color="red")
+
+        else:
+            self.can_handler.disconnect_devive(label)
+            self.bus_load_indicator.set_channels(self.can_handler.channel_bitrates())
+            self.log_box.set_live_channels(self.can_handler.connected_channels())
+            # Notify the channel is disconnected to the 'channel_selector'
+            self.channel_selector.channel_connection_change_callback(
+                channel, can_type, False
+            )
+            if not self.can_handler.get_connect_status():
+                self.can_connection_status_signal.emit(False)
+            elif (
+                self.communication_controller.sendable
+                and self.can_handler.get_periodic_stats() is None
+            ):
+                # the periodic send ran on the disconnected channel
+                self.communication_controller.set_periodic_running(False)
+            self.log(f"Disconnected from {channel}", color="green")
+
+    # The selected channel is the one frames are sent on; bitrates can be
+    # edited for a channel that is not connected yet
+    @Slot(str, str)
+    def _on_channel_selected(self, channel: str, can_type: str) -> None:
+        label = channel_label(channel, can_type)
+        if self.can_handler.is_channel_connected(label):
+            self.can_handler.set_transmit_channel(label)
+            self.bitrate_selector.set_disable()
+            self.data_bitrate_selector.set_disable()
+        else:
+            self.bitrate_selector.set_enable()
+            self.data_bitrate_selector.set_enable()
+
+    @Slot()
+    def _toggle_message_filter(self) -> None:
+        if self.message_filter.isVisible():
+            self.message_filter.setHidden(True)
+            self.resize(800, 300)
+        else:
+            self.message_filter.setVisible(True)
+            self.resize(1100, 300)
+
+    @Slot()
+    def _toggle_replay_controller(self) -> None:
+        self.replay_controller.setVisible(not self.replay_controller.isVisible())
+
+    def open_replay(self, path: str) -> bool:
+        self.replay_controller.setVisible(True)
+        return self.replay_controller.open_replay(path)
+
+    @Slot()
+    def _toggle_view(self) -> None:
+        index = self._view_tabs.currentIndex()
+        self._view_tabs.setCurrentIndex((index + 1) % self._view_tabs.count())
+
+    def open_capture(self, path: str) -> bool:
+        try:
+            capture = CaptureFile(path)
+        except (OSError, ValueError) as e:
+            self.log(f"Failed to open capture: {e}", color="red")
+            return False
+        self.log_box.open_capture(capture)
+        self.statistics_view.load_records(capture.iter_headers())
+        self._view_tabs.setCurrentWidget(self.log_box)
+        self.log(f"Opened {path} ({len(capture)} frames)", color="green")
+        return True
+
+    @Slot()
+    def _open_capture_dialog(self) -> None:
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Open Capture", "", f"CANViewer capture (*{CAPTURE_SUFFIX})"
+        )
+        if path:
+            self.open_capture(path)
+
+    @Slot()
+    def _go_to_dialog(self) -> None:
+        text, accepted = QInputDialog.getText(
+            self,
+            "Go to",
+            "Seconds from the first frame (e.g. 12.5) or an ID (e.g. 0x123, x1ABCDEF):",
+        )
+        text = text.strip().lower()
+        if not accepted or text == "":
+            return
+        try:
+            if text.startswith("0x"):
+                found = self.log_box.scroll_to_next_id(int(text, 16), False)
+            elif text.startswith("x"):
+                found = self.log_box.scroll_to_next_id(int(text[1:], 16), True)
+            else:
+                self.log_box.scroll_to_time(float(text))
+                found = True
+        except ValueError:
+            self.log(f"Cannot go to '{text}'", color="red")
+            return
+        if not found:
+            self.log(f"ID {text} not found", color="red")
+
+    @Slot()
+    def toggle_radix(self) -> None:
+        if self.radix_type == "hex":  # hex -> dec
+            self._change_radix_to_dec()
+        elif self.radix_type == "dec":  # dec -> hex
+            self._change_radix_to_hex()
+
+    @Slot()
+    def _change_radix_to_dec(self) -> None:
+        self.radix_type = "dec"
+        self._update_window_title()
+        self.radix_status_signal.emit(self.radix_type)
+
+    @Slot()
+    def _change_radix_to_hex(self) -> None:
+        self.radix_type = "hex"
+        self._update_window_title()
+        self.radix_status_signal.emit(self.radix_type)
+
+    @Slot(bool)
+    def _on_can_mode_changed(self, can_fd: bool) -> None:
+        self.can_fd_enabled = can_fd
+        self.can_message_editor.set_can_fd_mode(self.can_fd_enabled)
+        self.data_bitrate_selector.setVisible(self.can_fd_enabled)
+        self._update_window_title()
+
+    def _update_window_title(self) -> None:
+        can_mode = "CAN-FD" if self.can_fd_enabled else "CAN"
+        self.setWindowTitle(
+            f"CANViewer | {self.can_type} | {can_mode} | {self.radix_type}"
+        )
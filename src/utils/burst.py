@@ -0,0 +1,250 @@
+import errno
+import threading
+import time
+from array import array
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import can
+
+from .bus_load import message_bit_lengths
+from .can_bus import SEND_TIMEOUT_S
+from .periodic_sender import copy_sent_message
+
+# A send that found no room in the TX queue within SEND_TIMEOUT_S is
+# retried after a backoff that doubles up to BACKOFF_MAX_S, at most
+# MAX_BUFFER_FULL_RETRIES times
+BACKOFF_MIN_S = 0.0001
+BACKOFF_MAX_S = 0.005
+MAX_BUFFER_FULL_RETRIES = 32
+LATENCY_SAMPLES = 65536
+# frames of the sequence used to estimate the average frame length
+_BIT_LENGTH_SAMPLES = 256
+_BUFFER_FULL_ERRNOS = frozenset({errno.ENOBUFS, errno.EAGAIN})
+
+
+@dataclass(frozen=True)
+class BurstConfig:
+    # stop after this many frames and/or seconds; None for no limit
+    count: int | None = None
+    duration: float | None = None
+    # step the ID (within the standard or extended range) or the payload,
+    # read as a big-endian counter, by one per frame
+    increment_id: bool = False
+    increment_data: bool = False
+    # also show every sent frame in the log (costs throughput); the frames
+    # reach on_sent, and so the recorder and bus load, either way
+    log_frames: bool = False
+
+
+@dataclass(frozen=True)
+class BurstStats:
+    interface: str | None
+    running: bool
+    sent: int
+    errors: int
+    buffer_full: int
+    elapsed: float
+    frames_per_second: float
+    # fraction of the bus time, estimated from the frame sequence
+    bus_load: float | None
+    # bus.send latency in seconds over the last LATENCY_SAMPLES sends
+    latency_p50: float | None
+    latency_p99: float | None
+    latency_max: float | None
+    last_error: Exception | None
+
+
+# SocketCAN reports a full queue as ENOBUFS from the socket, or without an
+# error code when no room came up before the timeout; other backends raise
+# CanOperationError for full queues and send timeouts
+def _is_buffer_full(error: can.CanError, interface: str | None) -> bool:
+    if not isinstance(error, can.CanOperationError):
+        return False
+    if interface == "socketcan":
+        return error.error_code is None or error.error_code in _BUFFER_FULL_ERRNOS
+    return True
+
+
+class BurstSender:
+    """Sends frames back to back on its own thread, as fast as the adapter
+    accepts them, and measures the achieved rate and send latency.
+
+    ``send`` is called with each frame and a timeout, like ``bus.send``;
+    ``on_sent`` gets a copy of every frame that was sent.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[can.Message, float | None], None],
+        interface: str | None,
+        template: can.Message,
+        config: BurstConfig,
+        bitrate: int | None = None,
+        data_bitrate: int | None = None,
+        on_sent: Callable[[can.Message], None] | None = None,
+    ):
+        if config.count is None and config.duration is None:
+            raise ValueError("A burst needs a frame count or a duration")
+        if config.count is not None and config.count <= 0:
+            raise ValueError("Frame count must be greater than 0")
+        if config.duration is not None and config.duration <= 0:
+            raise ValueError("Duration must be greater than 0")
+        self._send = send
+        self._interface = interface
+        self._template = template
+        self._config = config
+        self._on_sent = on_sent
+        self._id_span = 0x20000000 if template.is_extended_id else 0x800
+        self._data_base = int.from_bytes(template.data, "big")
+        self._data_modulus = 1 << (8 * len(template.data))
+        self._seconds_per_frame = self._estimate_frame_time(bitrate, data_bitrate)
+
+        self._latencies = array("d", bytes(8 * LATENCY_SAMPLES))
+        self._latency_max = 0.0
+        self._sent = 0
+        self._errors = 0
+        self._buffer_full = 0
+        self._last_error: Exception | None = None
+        self._started = 0.0
+        self._finished: float | None = None
+        self._stopping = False
+        self._thread = threading.Thread(
+            target=self._run, name="BurstSender", daemon=True
+        )
+
+    def start(self) -> None:
+        self._started = time.perf_counter()
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping = True
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def is_running(self) -> bool:
+        return self._thread.is_alive()
+
+    @property
+    def config(self) -> BurstConfig:
+        return self._config
+
+    # Frames sent so far; cheap enough to poll, unlike stats()
+    @property
+    def sent(self) -> int:
+        return self._sent
+
+    # Estimated bus time of one frame of the sequence; None without a bitrate
+    @property
+    def frame_time(self) -> float | None:
+        return self._seconds_per_frame
+
+    def stats(self) -> BurstStats:
+        sent = self._sent
+        end = self._finished if self._finished is not None else time.perf_counter()
+        elapsed = end - self._started if self._started else 0.0
+        samples = sorted(self._latencies[: min(sent, LATENCY_SAMPLES)])
+        return BurstStats(
+            interface=self._interface,
+            running=self.is_running(),
+            sent=sent,
+            errors=self._errors,
+            buffer_full=self._buffer_full,
+            elapsed=elapsed,
+            frames_per_second=sent / elapsed if elapsed > 0 else 0.0,
+            bus_load=(
+                sent * self._seconds_per_frame / elapsed
+                if self._seconds_per_frame is not None and elapsed > 0
+                else None
+            ),
+            latency_p50=_percentile(samples, 0.50),
+            latency_p99=_percentile(samples, 0.99),
+            latency_max=self._latency_max if samples else None,
+            last_error=self._last_error,
+        )
+
+    # Writes frame 'index' of the sequence into 'msg'
+    def _step(self, msg: can.Message, index: int) -> None:
+        template = self._template
+        if self._config.increment_id:
+            msg.arbitration_id = (template.arbitration_id + index) % self._id_span
+        if self._config.increment_data and self._data_modulus > 1:
+            value = (self._data_base + index) % self._data_modulus
+            msg.data = bytearray(value.to_bytes(len(template.data), "big"))
+
+    def _estimate_frame_time(
+        self, bitrate: int | None, data_bitrate: int | None
+    ) -> float | None:
+        if not bitrate:
+            return None
+        samples = min(self._config.count or _BIT_LENGTH_SAMPLES, _BIT_LENGTH_SAMPLES)
+        msg = copy_sent_message(self._template)
+        nominal_bits = 0
+        data_bits = 0
+        for index in range(samples):
+            self._step(msg, index)
+            nominal, fast = message_bit_lengths(msg)
+            nominal_bits += nominal
+            data_bits += fast
+        seconds = nominal_bits / bitrate + data_bits / (data_bitrate or bitrate)
+        return seconds / samples
+
+    def _run(self) -> None:
+        send = self._send
+        config = self._config
+        on_sent = self._on_sent
+        latencies = self._latencies
+        mask = LATENCY_SAMPLES - 1
+        msg = copy_sent_message(self._template)
+        count = config.count
+        deadline = (
+            self._started + config.duration if config.duration is not None else None
+        )
+        stepping = config.increment_id or config.increment_data
+        index = 0
+        retries = 0
+        backoff = BACKOFF_MIN_S
+        try:
+            while not self._stopping and (count is None or index < count):
+                if stepping:
+                    self._step(msg, index)
+                before = time.perf_counter()
+                if deadline is not None and before >= deadline:
+                    break
+                try:
+                    send(msg, SEND_TIMEOUT_S)
+                except can.CanError as e:
+                    self._last_error = e
+                    if (
+                        _is_buffer_full(e, self._interface)
+                        and retries < MAX_BUFFER_FULL_RETRIES
+                    ):
+                        # retry the same frame once the adapter drains
+                        self._buffer_full += 1
+                        retries += 1
+                        time.sleep(backoff)
+                        backoff = min(2 * backoff, BACKOFF_MAX_S)
+                        continue
+                    self._errors += 1
+                    index += 1
+                    retries = 0
+                    backoff = BACKOFF_MIN_S
+                    continue
+                latency = time.perf_counter() - before
+                latencies[self._sent & mask] = latency
+                self._latency_max = max(self._latency_max, latency)
+                self._sent += 1
+                index += 1
+                retries = 0
+                backoff = BACKOFF_MIN_S
+                if on_sent is not None:
+                    on_sent(copy_sent_message(msg))
+        finally:
+            self._finished = time.perf_counter()
+
+
+def _percentile(sorted_samples: list[float], fraction: float) -> float | None:
+    if not sorted_samples:
+        return None
+    position = min(len(sorted_samples) - 1, int(fraction * len(sorted_samples)))
+    return sorted_samples[position]
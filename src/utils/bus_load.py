@@ -0,0 +1,250 @@
+import re
+import time
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+
+import can
+from can.util import len2dlc
+
+# Bits after the CRC field that are never stuffed:
+# CRC delimiter, ACK slot, ACK delimiter, end of frame (7) and intermission (3)
+_FRAME_TAIL_BITS = 1 + 1 + 1 + 7 + 3
+
+_CRC15_POLY = 0x4599
+_RUN_PATTERN = re.compile(r"0+|1+")
+
+SAMPLE_INTERVAL_S = 0.1
+
+
+def _build_crc15_table() -> tuple[int, ...]:
+    table = []
+    for byte in range(256):
+        crc = byte << 7
+        for _ in range(8):
+            crc <<= 1
+            if crc & 0x8000:
+                crc ^= _CRC15_POLY
+        table.append(crc & 0x7FFF)
+    return tuple(table)
+
+
+_CRC15_TABLE = _build_crc15_table()
+
+
+def _crc15(value: int, bit_count: int) -> int:
+    # The CRC starts at zero, so leading zero bits do not change it and the
+    # bit stream can be padded to whole bytes on the left.
+    crc = 0
+    for byte in value.to_bytes((bit_count + 7) // 8, "big"):
+        crc = ((crc << 8) & 0x7FFF) ^ _CRC15_TABLE[((crc >> 7) ^ byte) & 0xFF]
+    return crc
+
+
+def _count_stuff_bits(value: int, bit_count: int, boundary: int) -> tuple[int, int]:
+    """Count dynamic stuff bits, split at raw bit index ``boundary``.
+
+    A stuff bit follows every five equal bits and then counts as the first bit
+    of the next run, which always has the stuff bit's value.
+    """
+    before = 0
+    after = 0
+    position = 0
+    carry = 0
+    for run in _RUN_PATTERN.findall(format(value, f"0{bit_count}b")):
+        length = len(run)
+        total = carry + length
+        if total < 5:
+            carry = 0
+            position += length
+            continue
+        if position + total - carry <= boundary:
+            # the whole run is before the boundary
+            before += total // 5
+            carry = 1 if total % 5 == 0 else 0
+            position += length
+            continue
+        for index in range(1, total // 5 + 1):
+            if position + 5 * index - carry <= boundary:
+                before += 1
+            else:
+                after += 1
+        carry = 1 if total % 5 == 0 else 0
+        position += length
+    return before, after
+
+
+@lru_cache(maxsize=65536)
+def frame_bit_lengths(
+    arbitration_id: int,
+    is_extended_id: bool,
+    is_remote_frame: bool,
+    is_fd: bool,
+    bitrate_switch: bool,
+    dlc: int,
+    data: bytes,
+) -> tuple[int, int]:
+    """Exact on-wire length of a frame as (nominal-phase bits, data-phase bits).
+
+    Includes bit stuffing, CRC, ACK, EOF and intermission. For CAN-FD frames
+    with bitrate switching, the bits between BRS and the CRC delimiter are
+    sent at the data bitrate.
+    """
+    value = 0
+    bit_count = 0
+
+    def push(bits: int, width: int) -> None:
+        nonlocal value, bit_count
+        value = (value << width) | (bits & ((1 << width) - 1))
+        bit_count += width
+
+    push(0, 1)  # SOF
+    if is_extended_id:
+        push(arbitration_id >> 18, 11)
+        push(1, 1)  # SRR
+        push(1, 1)  # IDE
+        push(arbitration_id, 18)
+    else:
+        push(arbitration_id, 11)
+
+    if not is_fd:
+        push(int(is_remote_frame), 1)  # RTR
+        if is_extended_id:
+            push(0, 2)  # r1, r0
+        else:
+            push(0, 2)  # IDE, r0
+        push(dlc, 4)
+        if not is_remote_frame:
+            push(int.from_bytes(data, "big"), 8 * len(data))
+        push(_crc15(value, bit_count), 15)
+        stuff_bits, _ = _count_stuff_bits(value, bit_count, bit_count)
+        return bit_count + stuff_bits + _FRAME_TAIL_BITS, 0
+
+    push(0, 1)  # RRS
+    if not is_extended_id:
+        push(0, 1)  # IDE
+    push(1, 1)  # FDF
+    push(0, 1)  # res
+    push(int(bitrate_switch), 1)  # BRS
+    arbitration_bits = bit_count
+    push(0, 1)  # ESI
+    push(len2dlc(len(data)), 4)
+    push(int.from_bytes(data, "big"), 8 * len(data))
+
+    stuff_before, stuff_after = _count_stuff_bits(value, bit_count, arbitration_bits)
+    # stuff count (3 bits + parity) and CRC with fixed stuff bits
+    if len(data) <= 16:
+        crc_field_bits = 4 + 17 + 6
+    else:
+        crc_field_bits = 4 + 21 + 7
+    fast_bits = bit_count - arbitration_bits + stuff_after + crc_field_bits
+    slow_bits = arbitration_bits + stuff_before + _FRAME_TAIL_BITS
+    if bitrate_switch:
+        return slow_bits, fast_bits
+    return slow_bits + fast_bits, 0
+
+
+def message_bit_lengths(msg: can.Message) -> tuple[int, int]:
+    return frame_bit_lengths(
+        msg.arbitration_id,
+        msg.is_extended_id,
+        msg.is_remote_frame,
+        msg.is_fd,
+        msg.bitrate_switch,
+        msg.dlc,
+        bytes(msg.data) if msg.data is not None else b"",
+    )
+
+
+def message_bus_time(
+    msg: can.Message, bitrate: int, data_bitrate: int | None = None
+) -> float:
+    """Time in seconds one frame occupies the bus."""
+    nominal, fast = message_bit_lengths(msg)
+    seconds = nominal / bitrate
+    if fast:
+        seconds += fast / (data_bitrate or bitrate)
+    return seconds
+
+
+def batch_bus_time(
+    msgs: list[can.Message], bitrate: int, data_bitrate: int | None = None
+) -> float:
+    """Total time in seconds the frames of a batch occupy the bus."""
+    nominal_bits = 0
+    data_bits = 0
+    for msg in msgs:
+        if msg.is_error_frame:
+            continue
+        nominal, fast = message_bit_lengths(msg)
+        nominal_bits += nominal
+        data_bits += fast
+    seconds = nominal_bits / bitrate
+    if data_bits:
+        seconds += data_bits / (data_bitrate or bitrate)
+    return seconds
+
+
+@dataclass(frozen=True)
+class BusLoadStats:
+    # percentages of bus time
+    current: float
+    peak: float
+    average_1s: float
+    average_10s: float
+
+
+class BusLoadEstimator:
+    """Bus load from the frames actually seen, plus the load of frames sent
+    out of sight (see set_unseen_load), sampled every 100 ms."""
+
+    def __init__(self, bitrate: int = 500_000, data_bitrate: int | None = None):
+        self._bitrate = bitrate
+        self._data_bitrate = data_bitrate
+        self._busy_time = 0.0
+        # fraction of bus time used by frames that are sent without being
+        # seen (e.g. by the kernel broadcast manager or an unlogged burst)
+        self._unseen_load = 0.0
+        self._window_start = time.monotonic()
+        self._samples: deque[float] = deque(maxlen=round(10 / SAMPLE_INTERVAL_S))
+        self._peak = 0.0
+
+    def set_bitrates(self, bitrate: int, data_bitrate: int | None = None) -> None:
+        if bitrate <= 0:
+            raise ValueError("Bitrate must be greater than 0")
+        self._bitrate = bitrate
+        self._data_bitrate = data_bitrate
+
+    def add_frames(self, msgs: list[can.Message]) -> None:
+        self._busy_time += batch_bus_time(msgs, self._bitrate, self._data_bitrate)
+
+    def set_unseen_load(self, load: float) -> None:
+        self._unseen_load = load
+
+    # Close the current window; call every SAMPLE_INTERVAL_S
+    def sample(self) -> BusLoadStats:
+        now = time.monotonic()
+        elapsed = now - self._window_start
+        load = 100.0 * self._busy_time / elapsed if elapsed > 0 else 0.0
+        load += 100.0 * self._unseen_load
+        self._busy_time = 0.0
+        self._window_start = now
+        self._samples.append(load)
+        self._peak = max(self._peak, load)
+        return self.stats()
+
+    def stats(self) -> BusLoadStats:
+        samples = self._samples
+        last_1s = list(samples)[-round(1 / SAMPLE_INTERVAL_S) :]
+        return BusLoadStats(
+            current=samples[-1] if samples else 0.0,
+            peak=self._peak,
+            average_1s=sum(last_1s) / len(last_1s) if last_1s else 0.0,
+            average_10s=sum(samples) / len(samples) if samples else 0.0,
+        )
+
+    def reset(self) -> None:
+        self._busy_time = 0.0
+        self._window_start = time.monotonic()
+        self._samples.clear()
+        self._peak = 0.0
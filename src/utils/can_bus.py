@@ -0,0 +1,189 @@
+import gc
+import logging
+import traceback
+
+import can
+
+from .id_filter import PLACEMENT_BUS, PLACEMENT_BUS_PREFILTER
+
+# bus.send waits at most this long for room in the TX queue, so a full
+# queue raises instead of blocking every other sender
+SEND_TIMEOUT_S = 0.1
+
+# CAN error bit definitions based on Linux SocketCAN error frames
+# source : https://git.kernel.org/pub/scm/linux/kernel/git/torvalds/linux.git/tree/include/uapi/linux/can/error.h
+CAN_ERR_TX_TIMEOUT = 0x00000001
+CAN_ERR_LOSTARB = 0x00000002
+CAN_ERR_CRTL = 0x00000004
+CAN_ERR_PROT = 0x00000008
+CAN_ERR_TRX = 0x00000010
+CAN_ERR_ACK = 0x00000020
+CAN_ERR_BUSOFF = 0x00000040
+CAN_ERR_BUSERROR = 0x00000080
+CAN_ERR_RESTARTED = 0x00000100
+
+CAN_ERROR_CLASSES = (
+    (CAN_ERR_TX_TIMEOUT, "TX timeout"),
+    (CAN_ERR_LOSTARB, "lost arbitration"),
+    (CAN_ERR_CRTL, "controller problem"),
+    (CAN_ERR_PROT, "protocol violation"),
+    (CAN_ERR_TRX, "transceiver status"),
+    (CAN_ERR_ACK, "ACK error"),
+    (CAN_ERR_BUSOFF, "bus off"),
+    (CAN_ERR_BUSERROR, "bus error"),
+    (CAN_ERR_RESTARTED, "controller restarted"),
+)
+
+
+# Backend packages (pyusb, gs_usb) are imported only when that interface is
+# used, so slcan and socketcan users never load them
+def format_connection_error(error: Exception, interface: str) -> Exception:
+    if interface != "gs_usb":
+        return error
+    import usb.core  # type: ignore[import-untyped]
+
+    if isinstance(error, usb.core.USBError) and getattr(error, "errno", None) == 13:
+        return PermissionError(
+            "Access denied opening gs_usb device. On macOS, grant libusb access "
+            "by running CANViewer with sufficient USB permissions, for example "
+            "`sudo uv run main.py -c gs_usb`, then reconnect the adapter if needed."
+        )
+    return error
+
+
+def check_gs_usb_access(index: int) -> None:
+    from gs_usb.gs_usb import GsUsb  # type: ignore[import-untyped]
+
+    devs = GsUsb.scan()
+    if len(devs) <= index:
+        raise ValueError(
+            f"Cannot find gs_usb device {index}. Devices found: {len(devs)}"
+        )
+    _ = devs[index].device_capability
+
+
+def create_can_bus(
+    channel: str | int,
+    bitrate: int,
+    interface: str,
+    can_fd: bool = False,
+    data_bitrate: int | None = None,
+) -> can.BusABC:
+    can_bus_logger = logging.getLogger("can.bus")
+    previous_disabled = can_bus_logger.disabled
+    if interface == "gs_usb":
+        can_bus_logger.disabled = True
+
+    try:
+        if can_fd and interface == "gs_usb":
+            raise ValueError("CAN-FD is not supported for gs_usb channels yet")
+        if can_fd and interface == "slcan" and data_bitrate is not None:
+            timing = can.BitTimingFd.from_sample_point(
+                f_clock=80_000_000,
+                nom_bitrate=bitrate,
+                nom_sample_point=75.0,
+                data_bitrate=data_bitrate,
+                data_sample_point=75.0,
+            )
+            return can.interface.Bus(
+                channel=channel,
+                receive_own_messages=False,
+                interface=interface,
+                timing=timing,
+            )
+        if can_fd and interface == "socketcan":
+            if data_bitrate is not None:
+                return can.interface.Bus(
+                    channel=channel,
+                    bitrate=bitrate,
+                    receive_own_messages=False,
+                    interface=interface,
+                    fd=True,
+                    data_bitrate=data_bitrate,
+                )
+            return can.interface.Bus(
+                channel=channel,
+                bitrate=bitrate,
+                receive_own_messages=False,
+                interface=interface,
+                fd=True,
+            )
+        return can.interface.Bus(
+            channel=channel,
+            bitrate=bitrate,
+            receive_own_messages=False,
+            interface=interface,
+        )
+    except Exception as error:
+        if interface == "gs_usb":
+            traceback.clear_frames(error.__traceback__)
+            error.__traceback__ = None
+            gc.collect()
+        raise error from None
+    finally:
+        can_bus_logger.disabled = previous_disabled
+
+
+# Validate the channel for the interface and open the bus; shared by the GUI
+# (CANHandler.connect_device) and headless mode.
+def open_can_bus(
+    channel: str,
+    bitrate: int,
+    interface: str,
+    can_fd: bool = False,
+    data_bitrate: int | None = None,
+) -> can.BusABC:
+    if channel == "":
+        raise ValueError("No CAN channel is selected")
+    if can_fd and interface == "gs_usb":
+        raise ValueError("CAN-FD is not supported for gs_usb channels yet")
+
+    bus_channel: str | int = channel
+    if interface == "gs_usb":
+        bus_channel = int(channel)
+        check_gs_usb_access(bus_channel)
+    return create_can_bus(bus_channel, bitrate, interface, can_fd, data_bitrate)
+
+
+# Short name of a channel for the channel column, e.g. "can0", "ttyACM0" or
+# "gs_usb0" for a device index
+def channel_label(channel: str, interface: str) -> str:
+    name = channel.rstrip("/").rsplit("/", 1)[-1]
+    return f"{interface}{name}" if name.isdigit() else name
+
+
+# Interfaces whose bus.set_filters is enforced below python-can (kernel or
+# adapter); the others filter inside python-can's BusABC.recv.
+KERNEL_FILTER_INTERFACES = ("socketcan",)
+
+
+def describe_filter_placement(placement: str, interface: str | None) -> str:
+    if interface is None or placement not in (PLACEMENT_BUS, PLACEMENT_BUS_PREFILTER):
+        return "software"
+    location = "kernel" if interface in KERNEL_FILTER_INTERFACES else "python-can"
+    if placement == PLACEMENT_BUS_PREFILTER:
+        return f"{location}+software"
+    return location
+
+
+def format_can_error_frame(msg: can.Message) -> str:
+    error_classes = [
+        label
+        for error_bit, label in CAN_ERROR_CLASSES
+        if msg.arbitration_id & error_bit
+    ]
+    error_text = ", ".join(error_classes) if error_classes else "unknown CAN error"
+    details = [f"CAN error frame: {error_text}"]
+
+    data = list(msg.data) if msg.data is not None else []
+    if msg.arbitration_id & CAN_ERR_ACK:
+        details.append(
+            "no other CAN node acknowledged the transmitted frame; "
+            "check bus wiring, termination, bitrate, peer power, and listen-only peers"
+        )
+    if msg.arbitration_id & CAN_ERR_BUSOFF:
+        details.append("controller entered bus-off state")
+    if len(data) >= 8 and (msg.arbitration_id & CAN_ERR_CRTL):
+        details.append(f"tx error counter={data[6]}, rx error counter={data[7]}")
+
+    return ". ".join(details)
@@ -1,157 +1,255 @@
-import gc
-import logging
-import traceback
+import functools
+import heapq
+import threading
+import time
+from collections.abc import Callable
+from operator import attrgetter
 
 import can
-import usb.core  # type: ignore[import-untyped]
-from gs_usb.gs_usb import GsUsb  # type: ignore[import-untyped]
-from PySide6.QtCore import QThread, Signal, Slot
+from PySide6.QtCore import QThread, QTimer, Signal, Slot
 from returns.result import Failure, Result, Success
 
-# CAN error bit definitions based on Linux SocketCAN error frames
-# source : https://git.kernel.org/pub/scm/linux/kernel/git/torvalds/linux.git/tree/include/uapi/linux/can/error.h
-CAN_ERR_TX_TIMEOUT = 0x00000001
-CAN_ERR_LOSTARB = 0x00000002
-CAN_ERR_CRTL = 0x00000004
-CAN_ERR_PROT = 0x00000008
-CAN_ERR_TRX = 0x00000010
-CAN_ERR_ACK = 0x00000020
-CAN_ERR_BUSOFF = 0x00000040
-CAN_ERR_BUSERROR = 0x00000080
-CAN_ERR_RESTARTED = 0x00000100
-
-CAN_ERROR_CLASSES = (
-    (CAN_ERR_TX_TIMEOUT, "TX timeout"),
-    (CAN_ERR_LOSTARB, "lost arbitration"),
-    (CAN_ERR_CRTL, "controller problem"),
-    (CAN_ERR_PROT, "protocol violation"),
-    (CAN_ERR_TRX, "transceiver status"),
-    (CAN_ERR_ACK, "ACK error"),
-    (CAN_ERR_BUSOFF, "bus off"),
-    (CAN_ERR_BUSERROR, "bus error"),
-    (CAN_ERR_RESTARTED, "controller restarted"),
+from .burst import BurstConfig, BurstSender, BurstStats
+from .bus_load import message_bus_time
+from .can_bus import (
+    SEND_TIMEOUT_S,
+    channel_label,
+    describe_filter_placement,
+    format_can_error_frame,
+    format_connection_error,
+    open_can_bus,
 )
+from .channel_merge import MergeStats, TimelineMerger, device_clock_offset
+from .frame_buffer import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_BUFFER_CAPACITY,
+    DEFAULT_TICK_HZ,
+    FrameBufferStats,
+    FrameRingBuffer,
+)
+from .frame_store import message_channel
+from .id_filter import ChannelIdFilters, CompiledIdFilter, build_can_filter_plan
+from .periodic_sender import MODE_NATIVE, PeriodicSender, PeriodicSendStats
+from .pipeline_stats import (
+    PipelineStats,
+    ReceiveCounters,
+    RenderCounters,
+    collect_pipeline_stats,
+)
+from .tx_scheduler import TxScheduler
 
 
-def _format_connection_error(error: Exception, interface: str) -> Exception:
-    if (
-        interface == "gs_usb"
-        and isinstance(error, usb.core.USBError)
-        and getattr(error, "errno", None) == 13
-    ):
-        return PermissionError(
-            "Access denied opening gs_usb device. On macOS, grant libusb access "
-            "by running CANViewer with sufficient USB permissions, for example "
-            "`sudo uv run main.py -c gs_usb`, then reconnect the adapter if needed."
-        )
-    return error
-
+class _Connection:
+    """One connected channel: its bus, notifier thread, receive buffer and
+    ID filter."""
 
-def _check_gs_usb_access(index: int) -> None:
-    devs = GsUsb.scan()
-    if len(devs) <= index:
-        raise ValueError(
-            f"Cannot find gs_usb device {index}. Devices found: {len(devs)}"
-        )
-    _ = devs[index].device_capability
-
-
-def _create_can_bus(
-    channel: str | int,
-    bitrate: int,
-    interface: str,
-    can_fd: bool = False,
-    data_bitrate: int | None = None,
-) -> can.BusABC:
-    can_bus_logger = logging.getLogger("can.bus")
-    previous_disabled = can_bus_logger.disabled
-    if interface == "gs_usb":
-        can_bus_logger.disabled = True
-
-    try:
-        if can_fd and interface == "gs_usb":
-            raise ValueError("CAN-FD is not supported for gs_usb channels yet")
-        if can_fd and interface == "slcan" and data_bitrate is not None:
-            timing = can.BitTimingFd.from_sample_point(
-                f_clock=80_000_000,
-                nom_bitrate=bitrate,
-                nom_sample_point=75.0,
-                data_bitrate=data_bitrate,
-                data_sample_point=75.0,
-            )
-            return can.interface.Bus(
-                channel=channel,
-                receive_own_messages=False,
-                interface=interface,
-                timing=timing,
-            )
-        if can_fd and interface == "socketcan":
-            if data_bitrate is not None:
-                return can.interface.Bus(
-                    channel=channel,
-                    bitrate=bitrate,
-                    receive_own_messages=False,
-                    interface=interface,
-                    fd=True,
-                    data_bitrate=data_bitrate,
-                )
-            return can.interface.Bus(
-                channel=channel,
-                bitrate=bitrate,
-                receive_own_messages=False,
-                interface=interface,
-                fd=True,
-            )
-        return can.interface.Bus(
-            channel=channel,
-            bitrate=bitrate,
-            receive_own_messages=False,
-            interface=interface,
+    def __init__(
+        self,
+        label: str,
+        channel: str,
+        interface: str,
+        bus: can.BusABC,
+        bitrate: int,
+        data_bitrate: int | None,
+        id_filter: CompiledIdFilter,
+        buffer_capacity: int,
+    ):
+        self.label = label
+        # the channel the bus was opened with
+        self.channel = channel
+        self.interface = interface
+        self.bus = bus
+        self.bitrate = bitrate
+        self.data_bitrate = data_bitrate
+        self.id_filter = id_filter
+        # where each rule of 'id_filter' runs, None when not pushed to the bus
+        self.filter_placements: tuple[str, ...] | None = None
+        self.receive_buffer: FrameRingBuffer[can.Message] = FrameRingBuffer(
+            buffer_capacity
         )
-    except Exception as error:
-        if interface == "gs_usb":
-            traceback.clear_frames(error.__traceback__)
-            error.__traceback__ = None
-            gc.collect()
-        raise error from None
-    finally:
-        can_bus_logger.disabled = previous_disabled
-
-
-def _format_can_error_frame(msg: can.Message) -> str:
-    error_classes = [
-        label
-        for error_bit, label in CAN_ERROR_CLASSES
-        if msg.arbitration_id & error_bit
-    ]
-    error_text = ", ".join(error_classes) if error_classes else "unknown CAN error"
-    details = [f"CAN error frame: {error_text}"]
-
-    data = list(msg.data) if msg.data is not None else []
-    if msg.arbitration_id & CAN_ERR_ACK:
-        details.append(
-            "no other CAN node acknowledged the transmitted frame; "
-            "check bus wiring, termination, bitrate, peer power, and listen-only peers"
+        # frames the software ID filter rejected; they still count towards
+        # the bus load
+        self.filtered_buffer: FrameRingBuffer[can.Message] = FrameRingBuffer(
+            buffer_capacity
         )
-    if msg.arbitration_id & CAN_ERR_BUSOFF:
-        details.append("controller entered bus-off state")
-    if len(data) >= 8 and (msg.arbitration_id & CAN_ERR_CRTL):
-        details.append(f"tx error counter={data[6]}, rx error counter={data[7]}")
-
-    return ". ".join(details)
+        self.notifier: can.Notifier | None = None
+        # held for every send: the GUI, replay, burst, periodic and scheduler
+        # threads share the bus, which is not safe for concurrent sends
+        self.send_lock = threading.Lock()
+        self.reported_error_frames: set[tuple[int, tuple[int, ...]]] = set()
+        # set from the first frame, see device_clock_offset
+        self.clock_offset: float | None = None
+        # written by the notifier thread only
+        self.counters = ReceiveCounters()
 
 
 class CANHandler(QThread):
-    send_can_signal = Signal(can.Message)
+    receive_batch_signal = Signal(list)
+    receive_stats_signal = Signal(FrameBufferStats)
+    # frames on the bus that the software ID filter rejected
+    filtered_batch_signal = Signal(list)
+    # {channel: where each rule of its filter runs}; "" while disconnected
+    filter_placement_signal = Signal(dict)
     error_log_signal = Signal(str, str)
 
     def __init__(self):
         super().__init__()
-        self.ignore_ids = []
+        self.id_filters = ChannelIdFilters.accept_all()
+        # Connected channels by label, each received on its own notifier
+        # thread; frames are sent on the transmit channel
+        self._connections: dict[str, _Connection] = {}
+        self._transmit_label: str | None = None
+        # Called with every received frame (before ID filtering) and every
+        # sent frame, on the notifier thread for RX; taps must not block.
+        self._frame_taps: tuple[Callable[[can.Message], None], ...] = ()
+        # labels of the channels the periodic and burst senders run on
+        self._periodic_sender: PeriodicSender | None = None
+        self._periodic_label: str | None = None
+        self._burst_sender: BurstSender | None = None
+        self._burst_label: str | None = None
+        # (time, sent frames) of the burst when its load was last polled
+        self._burst_load_mark: tuple[float | None, int] = (None, 0)
+        # Cyclic messages of the transmit table, sent from one thread; each
+        # row stays on the transmit channel it was started on
+        self.tx_scheduler = TxScheduler(
+            self._send_scheduled, self._push_sent_frame, self.transmit_channel
+        )
+
+        # Received frames are queued by the notifier threads and drained in
+        # batches on the GUI thread, so Qt only sees one event per tick. The
+        # queues of several channels are merged into one timeline first.
+        self._buffer_capacity = DEFAULT_BUFFER_CAPACITY
+        self._merger = TimelineMerger()
+        # frames fed in with inject_frame (replay) are passed on unmerged
+        self._inject_buffer: FrameRingBuffer[can.Message] = FrameRingBuffer(
+            DEFAULT_BUFFER_CAPACITY
+        )
+        self._inject_counters = ReceiveCounters()
+        # frames sent from the periodic, burst and scheduler threads; the
+        # buffer takes one producer, so they push under a lock
+        self._sent_buffer: FrameRingBuffer[can.Message] = FrameRingBuffer(
+            DEFAULT_BUFFER_CAPACITY
+        )
+        self._sent_lock = threading.Lock()
+        # counters of channels that were disconnected
+        self._retired_receive_counters = ReceiveCounters()
         self._reported_error_frames: set[tuple[int, tuple[int, ...]]] = set()
-        self.can_bus: can.BusABC | None = None
-        self.can_notifier: can.Notifier | None = None
+        # pushed/drained/dropped of channels that were disconnected
+        self._retired_counters = (0, 0, 0)
+        self._batch_size = DEFAULT_BATCH_SIZE
+        self._tick_hz = DEFAULT_TICK_HZ
+        self._drain_timer = QTimer(self)
+        self._drain_timer.timeout.connect(self._drain_receive_buffer)
+        self._drain_timer.start(self._tick_interval_ms())
+
+    def configure_receive_pipeline(
+        self,
+        batch_size: int | None = None,
+        tick_hz: int | None = None,
+        buffer_capacity: int | None = None,
+    ) -> None:
+        if batch_size is not None:
+            if batch_size <= 0:
+                raise ValueError("Batch size must be greater than 0")
+            self._batch_size = batch_size
+        if tick_hz is not None:
+            if not 1 <= tick_hz <= 1000:
+                raise ValueError("Tick rate must be between 1 and 1000 Hz")
+            self._tick_hz = tick_hz
+            self._drain_timer.setInterval(self._tick_interval_ms())
+        if buffer_capacity is not None and buffer_capacity != self._buffer_capacity:
+            self._buffer_capacity = buffer_capacity
+            # resized in place: the producers keep their buffer, and frames
+            # beyond a smaller capacity are dropped and counted as usual
+            for buffer in self._receive_buffers():
+                buffer.resize(buffer_capacity)
+            for connection in self._connections.values():
+                connection.filtered_buffer.resize(buffer_capacity)
+        self.receive_stats_signal.emit(self.get_receive_stats())
 
+    def get_receive_config(self) -> tuple[int, int, int]:
+        return self._batch_size, self._tick_hz, self._buffer_capacity
+
+    # Totals over every channel's buffer, the merge queues and injected frames
+    def get_receive_stats(self) -> FrameBufferStats:
+        pushed, drained, dropped = self._retired_counters
+        pending = self._merger.pending()
+        for buffer in self._receive_buffers():
+            stats = buffer.stats()
+            pending += stats.pending
+            pushed += stats.pushed
+            drained += stats.drained
+            dropped += stats.dropped
+        return FrameBufferStats(
+            capacity=self._buffer_capacity * max(1, len(self._connections)),
+            pending=pending,
+            pushed=pushed,
+            drained=drained,
+            dropped=dropped,
+        )
+
+    def get_merge_stats(self) -> MergeStats:
+        return self._merger.stats()
+
+    # Stage counters of the receive path; the GUI adds its render counters
+    def get_pipeline_stats(
+        self, render_counters: RenderCounters | None = None
+    ) -> PipelineStats:
+        receive_counters = [
+            connection.counters for connection in self._connections.values()
+        ]
+        receive_counters += [self._inject_counters, self._retired_receive_counters]
+        return collect_pipeline_stats(
+            receive_counters, self.get_receive_stats(), render_counters
+        )
+
+    def _receive_buffers(self) -> list[FrameRingBuffer[can.Message]]:
+        buffers = [
+            connection.receive_buffer for connection in self._connections.values()
+        ]
+        buffers.append(self._sent_buffer)
+        buffers.append(self._inject_buffer)
+        return buffers
+
+    def _tick_interval_ms(self) -> int:
+        return max(1, round(1000 / self._tick_hz))
+
+    @Slot()
+    def _drain_receive_buffer(self) -> None:
+        batch_size = self._batch_size
+        merger = self._merger
+        connections = list(self._connections.values())
+        if len(connections) == 1 and not merger.pending():
+            # nothing to merge with
+            batch = connections[0].receive_buffer.drain(batch_size)
+        else:
+            # each channel queues at most one batch in the merger, the rest
+            # waits in its bounded ring buffer
+            for connection in connections:
+                room = batch_size - merger.pending(connection.label)
+                if room > 0:
+                    frames = connection.receive_buffer.drain(room)
+                    if frames:
+                        merger.push(connection.label, frames)
+            batch = merger.pop_ready(time.time(), batch_size)
+        if len(batch) < batch_size:
+            sent = self._sent_buffer.drain(batch_size - len(batch))
+            if sent and batch:
+                batch = list(heapq.merge(batch, sent, key=attrgetter("timestamp")))
+            else:
+                batch.extend(sent)
+        if len(batch) < batch_size:
+            batch.extend(self._inject_buffer.drain(batch_size - len(batch)))
+        if batch:
+            self.receive_batch_signal.emit(batch)
+        filtered: list[can.Message] = []
+        for connection in connections:
+            filtered.extend(connection.filtered_buffer.drain())
+        if filtered:
+            self.filtered_batch_signal.emit(filtered)
+        self.receive_stats_signal.emit(self.get_receive_stats())
+
+    # Connects one more channel; returns its label
     def connect_device(
         self,
         channel: str,
@@ -159,65 +257,408 @@ class CANHandler(QThread):
         interface: str,
         can_fd: bool = False,
         data_bitrate: int | None = None,
-    ) -> Result[bool, Exception]:
+    ) -> Result[str, Exception]:
+        label = channel_label(channel, interface)
+        if label in self._connections:
+            return Failure(ValueError(f"{label} is already connected"))
+        can_bus: can.BusABC | None = None
         try:
-            if channel == "":
-                raise ValueError("No CAN channel is selected")
-            if can_fd and interface == "gs_usb":
-                raise ValueError("CAN-FD is not supported for gs_usb channels yet")
-
-            bus_channel: str | int = channel
-            if interface == "gs_usb":
-                bus_channel = int(channel)
-                _check_gs_usb_access(bus_channel)
-
-            self.can_bus = _create_can_bus(
-                bus_channel, bitrate, interface, can_fd, data_bitrate
+            can_bus = open_can_bus(channel, bitrate, interface, can_fd, data_bitrate)
+            if not self._connections:
+                self._reset_receive_counters()
+            connection = _Connection(
+                label,
+                channel,
+                interface,
+                can_bus,
+                bitrate,
+                data_bitrate if can_fd else None,
+                self.id_filters.for_channel(label),
+                self._buffer_capacity,
+            )
+            self._apply_bus_filters(connection)
+            self._connections[label] = connection
+            self._merger.add_channel(label)
+            connection.notifier = can.Notifier(
+                can_bus, [functools.partial(self._on_can_recieve, connection)]
             )
-            self._reported_error_frames.clear()
-            self.can_notifier = can.Notifier(self.can_bus, [self._on_can_recieve])
-            return Success(True)
         except Exception as e:
-            e = _format_connection_error(e, interface)
+            e = format_connection_error(e, interface)
             print(e)
-            self.can_bus = None
+            if label in self._connections:
+                del self._connections[label]
+                self._merger.remove_channel(label)
+            if can_bus is not None:
+                can_bus.shutdown()
             return Failure(e)
+        self._emit_filter_placement()
+        return Success(label)
+
+    # Disconnects one channel, or all of them when no label is given
+    def disconnect_devive(self, label: str | None = None) -> None:
+        labels = list(self._connections) if label is None else [label]
+        for channel in labels:
+            connection = self._connections.pop(channel, None)
+            if connection is None:
+                continue
+            if self._periodic_label == channel:
+                self.stop_periodic()
+            if self._burst_label == channel:
+                self.stop_burst()
+            if connection.notifier is not None:
+                connection.notifier.stop()
+            connection.bus.shutdown()
+            # frames already received are still shown
+            buffer = connection.receive_buffer
+            self._merger.push(channel, buffer.drain())
+            self._merger.remove_channel(channel)
+            self._retired_receive_counters.add(connection.counters)
+            stats = buffer.stats()
+            pushed, drained, dropped = self._retired_counters
+            self._retired_counters = (
+                pushed + stats.pushed,
+                drained + stats.drained,
+                dropped + stats.dropped,
+            )
+        if not self._connections:
+            self.tx_scheduler.stop()
+            self._reported_error_frames.clear()
+        self._emit_filter_placement()
 
-    def disconnect_devive(self) -> None:
-        if self.can_notifier is not None:
-            self.can_notifier.stop()
-        if self.can_bus is not None:
-            self.can_bus.shutdown()
-        self.can_notifier = None
-        self.can_bus = None
-        self._reported_error_frames.clear()
+    def _reset_receive_counters(self) -> None:
+        self._retired_counters = (0, 0, 0)
+        self._sent_buffer.reset_counters()
+        self._inject_buffer.reset_counters()
+        self._inject_counters.reset()
+        self._retired_receive_counters.reset()
 
     def get_connect_status(self) -> bool:
-        if self.can_bus is None:
-            return False
-        else:
-            return True
+        return bool(self._connections)
+
+    def connected_channels(self) -> list[str]:
+        return list(self._connections)
+
+    def is_channel_connected(self, label: str) -> bool:
+        return label in self._connections
+
+    # {label: (bitrate, data bitrate or None)} of the connected channels
+    def channel_bitrates(self) -> dict[str, tuple[int, int | None]]:
+        return {
+            label: (connection.bitrate, connection.data_bitrate)
+            for label, connection in self._connections.items()
+        }
+
+    # Frames are sent on this channel; when it is not connected, on the
+    # first connected one
+    def set_transmit_channel(self, label: str | None) -> None:
+        self._transmit_label = label
+
+    def transmit_channel(self) -> str | None:
+        connection = self._transmit_connection()
+        return connection.label if connection is not None else None
+
+    def _transmit_connection(self) -> _Connection | None:
+        connection = self._connections.get(self._transmit_label or "")
+        if connection is None and self._connections:
+            connection = next(iter(self._connections.values()))
+        return connection
 
     def can_send(self, msg: can.Message) -> None:
-        if self.can_bus is None:
+        connection = self._transmit_connection()
+        if connection is None:
             return
         msg.is_rx = False
-        self.can_bus.send(msg)
+        msg.channel = connection.label
+        msg.timestamp = time.time()
+        self._send_on(connection, msg)
+        for tap in self._frame_taps:
+            tap(msg)
+
+    # Every send on a connection goes through here, one at a time per bus
+    def _send_on(
+        self,
+        connection: _Connection,
+        msg: can.Message,
+        timeout: float | None = SEND_TIMEOUT_S,
+    ) -> None:
+        with connection.send_lock:
+            connection.bus.send(msg, timeout)
+
+    # Cyclic transmit on the kernel or a sender thread instead of a GUI
+    # timer. Sent frames reach the taps and the log through the sent-frame
+    # buffer, so fast periods are batched like received traffic.
+    def start_periodic(self, msg: can.Message, period: float) -> PeriodicSender:
+        connection = self._transmit_connection()
+        if connection is None:
+            raise can.CanOperationError("Not connected")
+        return self._start_periodic_on(connection, msg, period)
+
+    def _start_periodic_on(
+        self, connection: _Connection, msg: can.Message, period: float
+    ) -> PeriodicSender:
+        self.stop_periodic()
+        msg.channel = connection.label
+        self._periodic_sender = PeriodicSender(
+            connection.bus,
+            connection.interface,
+            msg,
+            period,
+            self._push_sent_frame,
+            functools.partial(self._send_on, connection),
+            connection.channel,
+        )
+        self._periodic_label = connection.label
+        return self._periodic_sender
+
+    # Changes the data in place; a new ID or frame type restarts the task
+    def update_periodic(self, msg: can.Message) -> None:
+        sender = self._periodic_sender
+        connection = self._connections.get(self._periodic_label or "")
+        if sender is None or connection is None:
+            return
+        msg.channel = connection.label
+        try:
+            sender.modify_data(msg)
+        except (ValueError, TypeError):
+            self._start_periodic_on(connection, msg, sender.period)
+
+    def stop_periodic(self) -> None:
+        if self._periodic_sender is not None:
+            self._periodic_sender.stop()
+            self._periodic_sender = None
+            self._periodic_label = None
+
+    # {label: fraction of bus time} of frames sent without reaching the
+    # receive path: the periodic send while the kernel sends it unobserved
+    # (no loopback socket), and a burst that is kept out of the log
+    def unseen_send_load(self) -> dict[str, float]:
+        loads: dict[str, float] = {}
+        sender = self._periodic_sender
+        connection = self._connections.get(self._periodic_label or "")
+        if (
+            sender is not None
+            and connection is not None
+            and sender.mode == MODE_NATIVE
+            and not sender.observed
+        ):
+            frame_time = message_bus_time(
+                sender.message, connection.bitrate, connection.data_bitrate
+            )
+            loads[connection.label] = frame_time / sender.period
+        burst_load = self._unlogged_burst_load()
+        if burst_load is not None and self._burst_label is not None:
+            label = self._burst_label
+            loads[label] = loads.get(label, 0.0) + burst_load
+        return loads
+
+    # Load of the unlogged burst since the previous call
+    def _unlogged_burst_load(self) -> float | None:
+        burst = self._burst_sender
+        if burst is None or burst.config.log_frames or burst.frame_time is None:
+            return None
+        now = time.perf_counter()
+        sent = burst.sent
+        last_time, last_sent = self._burst_load_mark
+        self._burst_load_mark = (now, sent)
+        if last_time is None or now <= last_time:
+            return None
+        return (sent - last_sent) * burst.frame_time / (now - last_time)
+
+    def get_periodic_stats(self) -> PeriodicSendStats | None:
+        sender = self._periodic_sender
+        return sender.stats() if sender is not None else None
+
+    # Back-to-back transmit for load tests, on its own thread
+    def start_burst(self, msg: can.Message, config: BurstConfig) -> BurstSender:
+        connection = self._transmit_connection()
+        if connection is None:
+            raise can.CanOperationError("Not connected")
+        self.stop_burst()
+        msg.channel = connection.label
+        # every burst frame reaches the taps (recorder); only the log is
+        # optional, the bus load of an unlogged burst is polled instead
+        self._burst_sender = BurstSender(
+            functools.partial(self._send_on, connection),
+            connection.interface,
+            msg,
+            config,
+            connection.bitrate,
+            connection.data_bitrate,
+            self._push_sent_frame if config.log_frames else self._tap_frame,
+        )
+        self._burst_label = connection.label
+        self._burst_load_mark = (None, 0)
+        self._burst_sender.start()
+        return self._burst_sender
+
+    def stop_burst(self) -> None:
+        if self._burst_sender is not None:
+            self._burst_sender.stop()
+
+    def get_burst_stats(self) -> BurstStats | None:
+        sender = self._burst_sender
+        return sender.stats() if sender is not None else None
+
+    # Frames sent from a sender thread join the receive path, bypassing the
+    # ID filter like frames sent from the GUI
+    def _push_sent_frame(self, msg: can.Message) -> None:
+        self._tap_frame(msg)
+        with self._sent_lock:
+            self._sent_buffer.push(msg)
 
-    def _on_can_recieve(self, msg: can.Message) -> None:
+    def _tap_frame(self, msg: can.Message) -> None:
+        for tap in self._frame_taps:
+            tap(msg)
+
+    def _send_scheduled(self, msg: can.Message) -> None:
+        # rows are bound to a channel when the scheduler starts
+        if msg.channel is None:
+            connection = self._transmit_connection()
+        else:
+            connection = self._connections.get(str(msg.channel))
+        if connection is None:
+            raise can.CanOperationError(f"{msg.channel or 'CAN'} is not connected")
+        msg.channel = connection.label
+        self._send_on(connection, msg)
+
+    # The tap tuple is replaced rather than mutated, so the notifier thread
+    # always iterates over a consistent snapshot.
+    def add_frame_tap(self, tap: Callable[[can.Message], None]) -> None:
+        if tap not in self._frame_taps:
+            self._frame_taps = (*self._frame_taps, tap)
+
+    def remove_frame_tap(self, tap: Callable[[can.Message], None]) -> None:
+        self._frame_taps = tuple(t for t in self._frame_taps if t != tap)
+
+    # Runs on the notifier thread of the connection
+    def _on_can_recieve(self, connection: _Connection, msg: can.Message) -> None:
+        started = time.perf_counter_ns()
+        if not msg.is_rx:
+            # the kernel's loopback of a native periodic send arrives through
+            # the sender's own socket
+            sender = self._periodic_sender
+            if (
+                sender is not None
+                and self._periodic_label == connection.label
+                and sender.is_echo(msg)
+            ):
+                return
         msg.is_rx = True
+        msg.channel = connection.label
+        offset = connection.clock_offset
+        if offset is None:
+            offset = connection.clock_offset = device_clock_offset(
+                msg.timestamp, time.time()
+            )
+        if offset:
+            msg.timestamp += offset
+        counters = connection.counters
+        self._handle_frame(
+            msg,
+            connection.id_filter,
+            connection.receive_buffer,
+            connection.reported_error_frames,
+            counters,
+            connection.filtered_buffer,
+        )
+        counters.receive_ns += time.perf_counter_ns() - started
+
+    # Feed a frame that did not come from the bus (e.g. a replayed capture)
+    # through the receive path: taps, ID filter and the receive buffer.
+    def inject_frame(self, msg: can.Message) -> None:
+        started = time.perf_counter_ns()
+        counters = self._inject_counters
+        self._handle_frame(
+            msg,
+            self.id_filters.for_channel(message_channel(msg)),
+            self._inject_buffer,
+            self._reported_error_frames,
+            counters,
+        )
+        counters.receive_ns += time.perf_counter_ns() - started
+
+    # True while the GUI is more than half a buffer behind; producers that
+    # can wait (replay at max speed) should back off instead of dropping.
+    def is_receive_backlogged(self) -> bool:
+        buffer = self._inject_buffer
+        return len(buffer) >= buffer.capacity // 2
+
+    def _handle_frame(
+        self,
+        msg: can.Message,
+        id_filter: CompiledIdFilter,
+        buffer: FrameRingBuffer[can.Message],
+        reported_error_frames: set[tuple[int, tuple[int, ...]]],
+        counters: ReceiveCounters,
+        filtered_buffer: FrameRingBuffer[can.Message] | None = None,
+    ) -> None:
+        counters.received += 1
+        for tap in self._frame_taps:
+            tap(msg)
         if msg.is_error_frame:
+            counters.error_frames += 1
             data = list(msg.data) if msg.data is not None else []
             detail_without_counters = tuple(data[:6])
             error_key = (msg.arbitration_id, detail_without_counters)
-            if error_key not in self._reported_error_frames:
-                self._reported_error_frames.add(error_key)
-                self.error_log_signal.emit(_format_can_error_frame(msg), "red")
+            if error_key not in reported_error_frames:
+                reported_error_frames.add(error_key)
+                text = format_can_error_frame(msg)
+                if len(self._connections) > 1:
+                    text = f"{message_channel(msg)}: {text}"
+                self.error_log_signal.emit(text, "red")
             return
-        if msg.arbitration_id in self.ignore_ids:
+        if not id_filter.accepts(msg.arbitration_id, msg.is_extended_id):
+            counters.filtered_out += 1
+            if filtered_buffer is not None:
+                filtered_buffer.push(msg)
             return
-        self.send_can_signal.emit(msg)
+        buffer.push(msg)
 
-    @Slot()
-    def update_ignore_ids(self, ignore_ids: list[int]) -> None:
-        self.ignore_ids = ignore_ids
+    # The rules of a compiled filter never change, so swapping a connection's
+    # reference is atomic for its notifier thread.
+    @Slot(ChannelIdFilters)
+    def update_id_filter(self, id_filters: ChannelIdFilters) -> None:
+        if id_filters == self.id_filters:
+            return
+        self.id_filters = id_filters
+        for connection in self._connections.values():
+            id_filter = id_filters.for_channel(connection.label)
+            if id_filter == connection.id_filter:
+                continue
+            connection.id_filter = id_filter
+            self._apply_bus_filters(connection)
+        self._emit_filter_placement()
+
+    # Push what the bus can express down to the kernel/adapter; the software
+    # filter above stays in place for everything else.
+    def _apply_bus_filters(self, connection: _Connection) -> None:
+        plan = build_can_filter_plan(connection.id_filter)
+        try:
+            connection.bus.set_filters(plan.can_filters)
+        except (can.CanError, NotImplementedError, OSError) as e:
+            connection.bus.set_filters(None)
+            self.error_log_signal.emit(
+                f"Bus filters of {connection.label} not applied, "
+                f"filtering in software: {e}",
+                "red",
+            )
+            connection.filter_placements = None
+            return
+        connection.filter_placements = plan.placements
+
+    def _emit_filter_placement(self) -> None:
+        if not self._connections:
+            rules = self.id_filters.default.rules
+            self.filter_placement_signal.emit({"": ["software"] * len(rules)})
+            return
+        placements: dict[str, list[str]] = {}
+        for label, connection in self._connections.items():
+            if connection.filter_placements is None:
+                labels = ["software"] * len(connection.id_filter.rules)
+            else:
+                labels = [
+                    describe_filter_placement(placement, connection.interface)
+                    for placement in connection.filter_placements
+                ]
+            placements[label] = labels
+        self.filter_placement_signal.emit(placements)
@@ -0,0 +1,267 @@
+"""CANViewer capture file (.cvc)
+
+    header   32 bytes  magic, version, record size, records per chunk
+    records  88 bytes each, appended in chunks
+             timestamp f64, delta f64, ID u32, flags u8, DLC u8,
+             payload length u8, pad, 64-byte payload slot
+    index    written on close
+             u64 chunk count, f64 first timestamp of every chunk
+             u64 ID count, (key u32, count u32, offset u64) per ID,
+             u64 record numbers of every ID
+    trailer  32 bytes  index offset, record count, reserved, end magic
+
+A file without a trailer (recording interrupted) is still readable; its
+index is rebuilt with one sequential pass on open.
+"""
+
+import math
+import mmap
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterator
+from pathlib import Path
+
+import can
+
+from .frame_store import FLAG_EXTENDED, FrameRow, message_flags, row_to_message
+
+CAPTURE_SUFFIX = ".cvc"
+DEFAULT_CHUNK_RECORDS = 4096
+
+_MAGIC = b"CVCAP\x00\r\n"
+_END_MAGIC = b"CVCEND\r\n"
+_VERSION = 1
+_HEADER = struct.Struct("<8sHHI16x")
+_RECORD = struct.Struct("<ddIBBBx64s")
+# Same layout with only timestamp, ID and flags decoded
+_RECORD_HEADER = struct.Struct("<d8xIB67x")
+_ID_ENTRY = struct.Struct("<IIQ")
+_COUNT = struct.Struct("<Q")
+_TRAILER = struct.Struct("<QQ8x8s")
+PAYLOAD_SLOT = 64
+
+
+def _id_key(arbitration_id: int, is_extended_id: bool) -> int:
+    return (int(is_extended_id) << 29) | arbitration_id
+
+
+class CaptureWriter(can.Listener):
+    """Append-only writer; also usable as a python-can Listener."""
+
+    def __init__(self, path: str | Path, chunk_records: int = DEFAULT_CHUNK_RECORDS):
+        if chunk_records <= 0:
+            raise ValueError("Chunk size must be greater than 0")
+        # closed in stop(), after the index is written
+        self._file = open(path, "wb")  # noqa: SIM115
+        self._file.write(_HEADER.pack(_MAGIC, _VERSION, _RECORD.size, chunk_records))
+        self._chunk_records = chunk_records
+        self._chunk = bytearray()
+        self._count = 0
+        self._chunk_starts = array("d")
+        self._id_records: dict[int, array] = {}
+        self._last_timestamps: dict[int, float] = {}
+
+    def on_message_received(self, msg: can.Message) -> None:
+        timestamp = msg.timestamp
+        if self._count % self._chunk_records == 0:
+            self._chunk_starts.append(timestamp)
+        key = _id_key(msg.arbitration_id, msg.is_extended_id)
+        previous = self._last_timestamps.get(key)
+        self._last_timestamps[key] = timestamp
+        records = self._id_records.get(key)
+        if records is None:
+            records = self._id_records[key] = array("Q")
+        records.append(self._count)
+
+        data = bytes(msg.data[:PAYLOAD_SLOT]) if msg.data is not None else b""
+        self._chunk += _RECORD.pack(
+            timestamp,
+            math.nan if previous is None else timestamp - previous,
+            msg.arbitration_id,
+            message_flags(msg),
+            min(msg.dlc, 0xFF),
+            len(data),
+            data,
+        )
+        self._count += 1
+        if self._count % self._chunk_records == 0:
+            self._flush_chunk()
+
+    def _flush_chunk(self) -> None:
+        self._file.write(self._chunk)
+        self._chunk.clear()
+
+    def stop(self) -> None:
+        if self._file.closed:
+            return
+        self._flush_chunk()
+        index_offset = self._file.tell()
+        self._file.write(_COUNT.pack(len(self._chunk_starts)))
+        self._file.write(self._chunk_starts.tobytes())
+
+        keys = sorted(self._id_records)
+        self._file.write(_COUNT.pack(len(keys)))
+        offset = self._file.tell() + _ID_ENTRY.size * len(keys)
+        for key in keys:
+            count = len(self._id_records[key])
+            self._file.write(_ID_ENTRY.pack(key, count, offset))
+            offset += count * _COUNT.size
+        for key in keys:
+            self._file.write(self._id_records[key].tobytes())
+
+        self._file.write(_TRAILER.pack(index_offset, self._count, _END_MAGIC))
+        self._file.close()
+
+
+class CaptureFile:
+    """Read-only, memory-mapped view of a capture file.
+
+    Rows are decoded straight from the mapping on demand, so opening a
+    multi-GB file only reads the index. Provides the same ``row``/``len``
+    interface as FrameStore, so the log view can display it directly.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = str(path)
+        self._length = 0
+        self._chunk_records = DEFAULT_CHUNK_RECORDS
+        # views into the mapping, or arrays when the index was rebuilt
+        self._chunk_starts: memoryview[float] | array[float] = array("d")
+        self._id_records: dict[int, memoryview[int] | array[int]] = {}
+        # closed in close(), which also unmaps the file
+        self._file = open(path, "rb")  # noqa: SIM115
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Empty capture file: {path}") from None
+        self._view = memoryview(self._mmap)
+        try:
+            self._read_header()
+            if not self._read_index():
+                self._rebuild_index()
+        except ValueError:
+            self.close()
+            raise
+
+    def _read_header(self) -> None:
+        if len(self._view) < _HEADER.size:
+            raise ValueError(f"Not a CANViewer capture file: {self.path}")
+        magic, version, record_size, chunk_records = _HEADER.unpack_from(self._view)
+        if magic != _MAGIC:
+            raise ValueError(f"Not a CANViewer capture file: {self.path}")
+        if version != _VERSION or record_size != _RECORD.size:
+            raise ValueError(f"Unsupported capture file version: {version}")
+        self._chunk_records = chunk_records
+
+    def _read_index(self) -> bool:
+        view = self._view
+        if len(view) < _HEADER.size + _TRAILER.size:
+            return False
+        index_offset, count, end_magic = _TRAILER.unpack_from(
+            view, len(view) - _TRAILER.size
+        )
+        if end_magic != _END_MAGIC:
+            return False
+        self._length = count
+
+        (chunk_count,) = _COUNT.unpack_from(view, index_offset)
+        offset = index_offset + _COUNT.size
+        self._chunk_starts = view[offset : offset + chunk_count * 8].cast("d")
+        offset += chunk_count * 8
+
+        (id_count,) = _COUNT.unpack_from(view, offset)
+        offset += _COUNT.size
+        for key, records, records_offset in _ID_ENTRY.iter_unpack(
+            view[offset : offset + id_count * _ID_ENTRY.size]
+        ):
+            self._id_records[key] = view[
+                records_offset : records_offset + records * _COUNT.size
+            ].cast("Q")
+        return True
+
+    # Sequential scan for files whose recording was interrupted
+    def _rebuild_index(self) -> None:
+        self._length = (len(self._view) - _HEADER.size) // _RECORD.size
+        chunk_starts = array("d")
+        id_records: dict[int, array[int]] = {}
+        for number, (timestamp, arbitration_id, flags) in enumerate(
+            self.iter_headers()
+        ):
+            if number % self._chunk_records == 0:
+                chunk_starts.append(timestamp)
+            key = _id_key(arbitration_id, bool(flags & FLAG_EXTENDED))
+            records = id_records.get(key)
+            if records is None:
+                records = id_records[key] = array("Q")
+            records.append(number)
+        self._chunk_starts = chunk_starts
+        self._id_records = dict(id_records)
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def start_timestamp(self) -> float | None:
+        return self._chunk_starts[0] if len(self._chunk_starts) else None
+
+    def timestamp(self, index: int) -> float:
+        return _RECORD_HEADER.unpack_from(
+            self._view, _HEADER.size + index * _RECORD.size
+        )[0]
+
+    def row(self, index: int) -> FrameRow:
+        if not 0 <= index < self._length:
+            raise IndexError(index)
+        timestamp, delta, arbitration_id, flags, dlc, length, payload = (
+            _RECORD.unpack_from(self._view, _HEADER.size + index * _RECORD.size)
+        )
+        return FrameRow(timestamp, delta, arbitration_id, flags, dlc, payload[:length])
+
+    def message(self, index: int) -> can.Message:
+        return row_to_message(self.row(index))
+
+    # (timestamp, arbitration ID, flags) of every record, without payloads
+    def iter_headers(self) -> Iterator[tuple[float, int, int]]:
+        end = _HEADER.size + self._length * _RECORD.size
+        return _RECORD_HEADER.iter_unpack(self._view[_HEADER.size : end])
+
+    # First record at or after 'timestamp', assuming records are in time order
+    def index_at_time(self, timestamp: float) -> int:
+        chunk = bisect_right(self._chunk_starts, timestamp) - 1
+        if chunk < 0:
+            return 0
+        first = chunk * self._chunk_records
+        last = min(first + self._chunk_records, self._length)
+        return bisect_left(range(first, last), timestamp, key=self.timestamp) + first
+
+    def ids(self) -> list[tuple[int, bool]]:
+        return [(key & 0x1FFFFFFF, bool(key >> 29)) for key in self._id_records]
+
+    # Record numbers of one ID in file order, a view into the mapping
+    def records_for_id(
+        self, arbitration_id: int, is_extended_id: bool
+    ) -> memoryview | array:
+        return self._id_records.get(_id_key(arbitration_id, is_extended_id), array("Q"))
+
+    # Next record of an ID after record 'index', or None
+    def next_index_for_id(
+        self, arbitration_id: int, is_extended_id: bool, index: int = -1
+    ) -> int | None:
+        records = self.records_for_id(arbitration_id, is_extended_id)
+        position = bisect_right(records, index)
+        return records[position] if position < len(records) else None
+
+    # Views returned by records_for_id must be dropped before closing
+    def close(self) -> None:
+        for records in self._id_records.values():
+            if isinstance(records, memoryview):
+                records.release()
+        if isinstance(self._chunk_starts, memoryview):
+            self._chunk_starts.release()
+        self._chunk_starts = array("d")
+        self._id_records = {}
+        self._view.release()
+        self._mmap.close()
+        self._file.close()
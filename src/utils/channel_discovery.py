@@ -0,0 +1,145 @@
+import os
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+
+@dataclass(frozen=True)
+class CanChannel:
+    interface: str
+    channel: str | int
+    label: str
+
+
+SLCAN_EXCLUDED_KEYWORDS = (
+    "BLUETOOTH",
+    "DEBUG-CONSOLE",
+)
+
+SLCAN_INCLUDED_KEYWORDS = (
+    "CAN",
+    "USB2CAN",
+    "CANABLE",
+    "CANDLELIGHT",
+)
+
+_SERIAL_DEVICE_PREFIXES = ("tty", "cu.", "rfcomm")
+
+
+def _get_gs_usb_device_label(index: int, device: Any) -> str:
+    return str(index)
+
+
+def _is_slcan_candidate(port_info: Any) -> bool:
+    text = f"{port_info.device} {port_info.description} {port_info.hwid}".upper()
+    if any(keyword in text for keyword in SLCAN_EXCLUDED_KEYWORDS):
+        return False
+    return any(keyword in text for keyword in SLCAN_INCLUDED_KEYWORDS)
+
+
+# Backend packages are imported by their discovery function, not at startup
+def discover_slcan_channels() -> list[CanChannel]:
+    from serial.tools.list_ports import comports
+
+    channels: list[CanChannel] = []
+    port_infos = sorted(
+        (port_info for port_info in comports() if _is_slcan_candidate(port_info)),
+        key=lambda port_info: (
+            "CAN" not in f"{port_info.description} {port_info.hwid}".upper(),
+            port_info.device,
+        ),
+    )
+    for port_info in port_infos:
+        port = port_info.device
+        desc = port_info.description
+        label = f"SLCAN - {port}"
+        if desc:
+            label = f"{label} ({desc})"
+        channels.append(CanChannel(interface="slcan", channel=port, label=label))
+    return channels
+
+
+def discover_gs_usb_channels() -> list[CanChannel]:
+    try:
+        from gs_usb.gs_usb import GsUsb  # type: ignore[import-untyped]
+    except ImportError:
+        print("gs_usb is not installed")
+        return []
+
+    channels: list[CanChannel] = []
+    try:
+        devices = GsUsb.scan()
+    except Exception as error:
+        print(f"gs_usb scan failed: {error}")
+        return []
+
+    for index, device in enumerate(devices):
+        device_label = _get_gs_usb_device_label(index, device)
+        channels.append(
+            CanChannel(
+                interface="gs_usb",
+                channel=index,
+                label=f"gs_usb - {device_label}",
+            )
+        )
+    return channels
+
+
+def discover_socketcan_channels() -> list[CanChannel]:
+    net_dir = Path("/sys/class/net")
+    if not net_dir.exists():
+        return []
+
+    channels: list[CanChannel] = []
+    for net_device in sorted(net_dir.iterdir()):
+        name = net_device.name
+        if name.startswith(("can", "vcan")):
+            channels.append(
+                CanChannel(
+                    interface="socketcan",
+                    channel=name,
+                    label=f"SocketCAN - {name}",
+                )
+            )
+    return channels
+
+
+def _list_dir(path: str) -> tuple[str, ...] | None:
+    try:
+        return tuple(sorted(os.listdir(path)))
+    except OSError:
+        return None
+
+
+def _serial_fingerprint() -> Hashable | None:
+    names = _list_dir("/dev")
+    if names is None:
+        return None
+    return tuple(name for name in names if name.startswith(_SERIAL_DEVICE_PREFIXES))
+
+
+def _usb_fingerprint() -> Hashable | None:
+    return _list_dir("/sys/bus/usb/devices")
+
+
+def _net_fingerprint() -> Hashable | None:
+    return _list_dir("/sys/class/net")
+
+
+@dataclass(frozen=True)
+class DiscoveryBackend:
+    interface: str
+    discover: Callable[[], list[CanChannel]]
+    # Cheap snapshot of the device nodes behind the backend; the backend is
+    # rescanned only when it changes. None when the platform has no cheap
+    # source, in which case hotplug polls rescan it only rarely.
+    fingerprint: Callable[[], Hashable | None]
+
+
+# In combobox order
+DISCOVERY_BACKENDS = (
+    DiscoveryBackend("slcan", discover_slcan_channels, _serial_fingerprint),
+    DiscoveryBackend("gs_usb", discover_gs_usb_channels, _usb_fingerprint),
+    DiscoveryBackend("socketcan", discover_socketcan_channels, _net_fingerprint),
+)
@@ -0,0 +1,140 @@
+import heapq
+import math
+from collections import deque
+from dataclasses import dataclass
+
+import can
+
+# How long a frame is held back waiting for frames of other channels with an
+# earlier timestamp; a channel that is later than this is merged out of order
+MERGE_DELAY_S = 0.05
+# A channel whose first timestamp is further than this from the wall clock
+# runs on a device clock and is shifted onto the wall clock
+DEVICE_CLOCK_OFFSET_S = 60.0
+
+
+@dataclass(frozen=True)
+class MergeStats:
+    channels: int
+    pending: int
+    merged: int
+    # frames released after a frame with a later timestamp
+    late: int
+
+
+class TimelineMerger:
+    """Merges the frames of several channels into one time-ordered stream.
+
+    Every channel delivers its frames in time order, so a frame can be
+    released once each channel has shown a later one (the watermark), or
+    once it is MERGE_DELAY_S old for channels that stay quiet. Releasing is
+    a k-way heap merge over the channel queues: one heap operation per frame
+    and nothing when a single channel is connected.
+    """
+
+    def __init__(self, delay: float = MERGE_DELAY_S):
+        self._delay = delay
+        self._queues: dict[str, deque[can.Message]] = {}
+        # channels that still deliver frames; a removed channel's queue is
+        # flushed without waiting for it
+        self._active: set[str] = set()
+        self._last_released = -math.inf
+        self._merged = 0
+        self._late = 0
+
+    def add_channel(self, channel: str) -> None:
+        self._queues.setdefault(channel, deque())
+        self._active.add(channel)
+
+    def remove_channel(self, channel: str) -> None:
+        self._active.discard(channel)
+        queue = self._queues.get(channel)
+        if queue is not None and not queue:
+            del self._queues[channel]
+
+    def push(self, channel: str, frames: list[can.Message]) -> None:
+        self._queues[channel].extend(frames)
+
+    def pending(self, channel: str | None = None) -> int:
+        if channel is not None:
+            queue = self._queues.get(channel)
+            return len(queue) if queue is not None else 0
+        return sum(len(queue) for queue in self._queues.values())
+
+    def stats(self) -> MergeStats:
+        return MergeStats(
+            channels=len(self._active),
+            pending=self.pending(),
+            merged=self._merged,
+            late=self._late,
+        )
+
+    def _watermark(self, now: float) -> float:
+        watermark = now - self._delay
+        latest = []
+        for channel in self._active:
+            queue = self._queues[channel]
+            if not queue:
+                return watermark
+            latest.append(queue[-1].timestamp)
+        if latest:
+            watermark = max(watermark, min(latest))
+        return watermark
+
+    # Up to 'limit' frames with a timestamp at or before the watermark, in
+    # time order
+    def pop_ready(self, now: float, limit: int) -> list[can.Message]:
+        watermark = self._watermark(now)
+        released: list[can.Message] = []
+        queues = [queue for queue in self._queues.values() if queue]
+        if len(queues) == 1:
+            queue = queues[0]
+            popleft = queue.popleft
+            while queue and len(released) < limit and queue[0].timestamp <= watermark:
+                released.append(popleft())
+        elif queues:
+            heap = [
+                (queue[0].timestamp, index)
+                for index, queue in enumerate(queues)
+                if queue[0].timestamp <= watermark
+            ]
+            heapq.heapify(heap)
+            while heap and len(released) < limit:
+                _, index = heapq.heappop(heap)
+                queue = queues[index]
+                released.append(queue.popleft())
+                if queue and queue[0].timestamp <= watermark:
+                    heapq.heappush(heap, (queue[0].timestamp, index))
+        if not released:
+            return released
+
+        first = released[0].timestamp
+        if first < self._last_released:
+            self._late += sum(
+                1 for msg in released if msg.timestamp < self._last_released
+            )
+        self._last_released = max(self._last_released, released[-1].timestamp)
+        self._merged += len(released)
+        if len(self._queues) > len(self._active):
+            self._drop_drained_channels()
+        return released
+
+    def _drop_drained_channels(self) -> None:
+        for channel in list(self._queues):
+            if channel not in self._active and not self._queues[channel]:
+                del self._queues[channel]
+
+    def clear(self) -> None:
+        for queue in self._queues.values():
+            queue.clear()
+        self._drop_drained_channels()
+        self._last_released = -math.inf
+        self._merged = 0
+        self._late = 0
+
+
+# Offset that moves the timestamps of a channel onto the wall clock, from its
+# first frame; 0.0 when the channel already stamps frames with wall time
+def device_clock_offset(first_timestamp: float, now: float) -> float:
+    offset = now - first_timestamp
+    return offset if abs(offset) > DEVICE_CLOCK_OFFSET_S else 0.0
@@ -0,0 +1,146 @@
+from dataclasses import dataclass
+
+import can
+
+# What the log view shows of each received batch
+DISPLAY_ALL = "all"
+DISPLAY_LATEST_PER_ID = "latest_per_id"  # the last frame of each ID per batch
+DISPLAY_EVERY_NTH = "every_nth"  # one frame in every_n
+DISPLAY_MODES = (DISPLAY_ALL, DISPLAY_LATEST_PER_ID, DISPLAY_EVERY_NTH)
+DISPLAY_MODE_LABELS = {
+    DISPLAY_ALL: "All frames",
+    DISPLAY_LATEST_PER_ID: "Latest per ID",
+    DISPLAY_EVERY_NTH: "Every Nth",
+}
+
+DEFAULT_EVERY_N = 10
+# Frames queued for the GUI at which showing every frame is given up
+DEFAULT_DEGRADE_THRESHOLD = 16384
+
+
+@dataclass(frozen=True)
+class DisplayPolicyStats:
+    # the mode chosen, and the one applied to the last batch
+    mode: str
+    active_mode: str
+    # True while the mode is DISPLAY_ALL but the queue forced decimation
+    degraded: bool
+    every_n: int
+    backlog: int
+    shown: int
+    skipped: int
+
+
+class DisplayPolicy:
+    """Backpressure for the log view.
+
+    Capture, recording, statistics and the trace always get every frame;
+    only what the log view appends is decimated. In DISPLAY_ALL mode the
+    policy degrades to ``degraded_mode`` while more than ``threshold``
+    frames wait for the GUI, and recovers once the queue is below half of
+    it, so a short burst does not flip the mode on every tick.
+    """
+
+    def __init__(
+        self,
+        mode: str = DISPLAY_ALL,
+        every_n: int = DEFAULT_EVERY_N,
+        threshold: int | None = DEFAULT_DEGRADE_THRESHOLD,
+        degraded_mode: str = DISPLAY_LATEST_PER_ID,
+    ):
+        self.mode = DISPLAY_ALL
+        self.every_n = DEFAULT_EVERY_N
+        self.threshold: int | None = None
+        self.degraded_mode = DISPLAY_LATEST_PER_ID
+        self._degraded = False
+        self._backlog = 0
+        # position in the every-nth cycle carried over between batches
+        self._nth_offset = 0
+        self._shown = 0
+        self._skipped = 0
+        self.configure(mode, every_n, threshold, degraded_mode)
+
+    # None keeps the current value; a threshold of 0 disables degrading
+    def configure(
+        self,
+        mode: str | None = None,
+        every_n: int | None = None,
+        threshold: int | None = None,
+        degraded_mode: str | None = None,
+    ) -> None:
+        for value in (mode, degraded_mode):
+            if value is not None and value not in DISPLAY_MODES:
+                raise ValueError(f"Unknown display mode: {value}")
+        if every_n is not None and every_n <= 0:
+            raise ValueError("Every N must be greater than 0")
+        if threshold is not None and threshold < 0:
+            raise ValueError("Degrade threshold must not be negative")
+        if mode is not None:
+            self.mode = mode
+        if every_n is not None:
+            self.every_n = every_n
+        if threshold is not None:
+            self.threshold = threshold or None
+        if degraded_mode is not None:
+            self.degraded_mode = degraded_mode
+        if self.threshold is None:
+            self._degraded = False
+
+    # Frames queued for the GUI after the last drain
+    def set_backlog(self, pending: int) -> None:
+        self._backlog = pending
+        threshold = self.threshold
+        if threshold is None:
+            self._degraded = False
+        elif pending >= threshold:
+            self._degraded = True
+        elif pending < threshold // 2:
+            self._degraded = False
+
+    def active_mode(self) -> str:
+        if self.mode == DISPLAY_ALL and self._degraded:
+            return self.degraded_mode
+        return self.mode
+
+    def select(self, msgs: list[can.Message]) -> list[can.Message]:
+        mode = self.active_mode()
+        if mode == DISPLAY_LATEST_PER_ID:
+            shown = self._latest_per_id(msgs)
+        elif mode == DISPLAY_EVERY_NTH:
+            shown = msgs[self._nth_offset :: self.every_n]
+            self._nth_offset = (self._nth_offset - len(msgs)) % self.every_n
+        else:
+            shown = msgs
+        self._shown += len(shown)
+        self._skipped += len(msgs) - len(shown)
+        return shown
+
+    @staticmethod
+    def _latest_per_id(msgs: list[can.Message]) -> list[can.Message]:
+        # walk backwards so the first frame seen of an ID is its latest, then
+        # restore time order
+        seen: set[tuple[object, int]] = set()
+        latest: list[can.Message] = []
+        for msg in reversed(msgs):
+            key = (msg.channel, (int(msg.is_extended_id) << 29) | msg.arbitration_id)
+            if key in seen:
+                continue
+            seen.add(key)
+            latest.append(msg)
+        latest.reverse()
+        return latest
+
+    def stats(self) -> DisplayPolicyStats:
+        return DisplayPolicyStats(
+            mode=self.mode,
+            active_mode=self.active_mode(),
+            degraded=self.mode == DISPLAY_ALL and self._degraded,
+            every_n=self.every_n,
+            backlog=self._backlog,
+            shown=self._shown,
+            skipped=self._skipped,
+        )
+
+    def reset_counters(self) -> None:
+        self._shown = 0
+        self._skipped = 0
@@ -0,0 +1,98 @@
+from collections import deque
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_BUFFER_CAPACITY = 65536
+DEFAULT_BATCH_SIZE = 4096
+DEFAULT_TICK_HZ = 30
+
+
+@dataclass(frozen=True)
+class FrameBufferStats:
+    capacity: int
+    pending: int
+    pushed: int
+    drained: int
+    dropped: int
+
+
+class FrameRingBuffer(Generic[T]):
+    """Bounded FIFO between the python-can notifier thread and the GUI thread.
+
+    ``deque.append`` and ``deque.popleft`` are atomic under the GIL, so producers
+    and the single consumer never take a lock. When the buffer is full the
+    producer drops the oldest frame and counts it. The capacity is a plain
+    attribute rather than the deque's maxlen, so ``resize`` works in place
+    while the producer keeps pushing.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_BUFFER_CAPACITY):
+        if capacity <= 0:
+            raise ValueError("Buffer capacity must be greater than 0")
+        self._capacity = capacity
+        self._frames: deque[T] = deque()
+        self._pushed = 0
+        self._drained = 0
+        self._dropped = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    # Called by the consumer; a smaller buffer sheds its oldest frames on the
+    # next push
+    def resize(self, capacity: int) -> None:
+        if capacity <= 0:
+            raise ValueError("Buffer capacity must be greater than 0")
+        self._capacity = capacity
+
+    def push(self, frame: T) -> None:
+        frames = self._frames
+        while len(frames) >= self._capacity:
+            try:
+                frames.popleft()
+            except IndexError:
+                # the consumer drained it meanwhile
+                break
+            self._dropped += 1
+        frames.append(frame)
+        self._pushed += 1
+
+    def drain(self, max_frames: int | None = None) -> list[T]:
+        frames = self._frames
+        count = len(frames)
+        if max_frames is not None:
+            count = min(count, max_frames)
+        popleft = frames.popleft
+        batch: list[T] = []
+        append = batch.append
+        try:
+            for _ in range(count):
+                append(popleft())
+        except IndexError:
+            # the producer side evicted frames while we were draining
+            pass
+        self._drained += len(batch)
+        return batch
+
+    def clear(self) -> None:
+        self._frames.clear()
+
+    def reset_counters(self) -> None:
+        self._pushed = 0
+        self._drained = 0
+        self._dropped = 0
+
+    def stats(self) -> FrameBufferStats:
+        return FrameBufferStats(
+            capacity=self._capacity,
+            pending=len(self._frames),
+            pushed=self._pushed,
+            drained=self._drained,
+            dropped=self._dropped,
+        )
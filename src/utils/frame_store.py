@@ -0,0 +1,399 @@
+import math
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+
+import can
+
+if TYPE_CHECKING:
+    from .recorder import FrameRecorder
+
+# Flag bits stored per row
+FLAG_RX = 0x01
+FLAG_EXTENDED = 0x02
+FLAG_FD = 0x04
+FLAG_ERROR = 0x08
+FLAG_REMOTE = 0x10
+FLAG_BRS = 0x20
+FLAG_TEXT = 0x80
+
+DEFAULT_CHUNK_SIZE = 4096
+DEFAULT_MAX_FRAMES = 1_000_000
+
+# Approximate cost of one row: the typed-array columns, the list slot holding
+# the payload and the bytes object header.
+_ROW_COLUMN_BYTES = 8 + 8 + 4 + 1 + 1 + 2 + 8
+_BYTES_OBJECT_OVERHEAD = sys.getsizeof(b"")
+# Evicted chunks waiting for the spill writer; more are dropped rather than
+# kept in memory
+_SPILL_QUEUE_CHUNKS = 8
+
+
+class FrameRow(NamedTuple):
+    timestamp: float
+    # seconds since the previous frame with the same ID (NaN for the first one)
+    delta: float
+    arbitration_id: int
+    flags: int
+    dlc: int
+    # bytes for CAN frames, (text, color) for log lines
+    payload: bytes | tuple[str, str | None]
+    # name of the channel the frame was received or sent on ("" if unknown)
+    channel: str = ""
+
+
+@dataclass(frozen=True)
+class HistoryStats:
+    count: int
+    memory_bytes: int
+    evicted: int
+    spilled: int
+    max_frames: int | None
+    max_bytes: int | None
+
+
+def row_to_message(row: FrameRow) -> can.Message:
+    data: bytes = row.payload  # type: ignore[assignment]
+    return can.Message(
+        timestamp=row.timestamp,
+        channel=row.channel or None,
+        arbitration_id=row.arbitration_id,
+        is_extended_id=bool(row.flags & FLAG_EXTENDED),
+        is_remote_frame=bool(row.flags & FLAG_REMOTE),
+        is_error_frame=bool(row.flags & FLAG_ERROR),
+        is_fd=bool(row.flags & FLAG_FD),
+        bitrate_switch=bool(row.flags & FLAG_BRS),
+        is_rx=bool(row.flags & FLAG_RX),
+        dlc=row.dlc,
+        data=data,
+        check=False,
+    )
+
+
+def message_channel(msg: can.Message) -> str:
+    channel = msg.channel
+    return "" if channel is None else str(channel)
+
+
+def message_flags(msg: can.Message) -> int:
+    flags = 0
+    if msg.is_rx:
+        flags |= FLAG_RX
+    if msg.is_extended_id:
+        flags |= FLAG_EXTENDED
+    if msg.is_fd:
+        flags |= FLAG_FD
+    if msg.is_error_frame:
+        flags |= FLAG_ERROR
+    if msg.is_remote_frame:
+        flags |= FLAG_REMOTE
+    if msg.bitrate_switch:
+        flags |= FLAG_BRS
+    return flags
+
+
+class _Chunk:
+    __slots__ = (
+        "arbitration_ids",
+        "channels",
+        "deltas",
+        "dlcs",
+        "flags",
+        "memory_bytes",
+        "payloads",
+        "timestamps",
+    )
+
+    def __init__(self):
+        self.timestamps = array("d")
+        self.deltas = array("d")
+        self.arbitration_ids = array("I")
+        self.flags = array("B")
+        self.dlcs = array("B")
+        # index into FrameStore's channel names
+        self.channels = array("H")
+        self.payloads: list[bytes | tuple[str, str | None]] = []
+        self.memory_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+
+class FrameStore:
+    """Append-only, columnar store for the log view.
+
+    Rows are kept in fixed-size chunks of typed arrays, so a frame costs a few
+    bytes of columns plus its payload instead of a formatted document block.
+    History can be capped by frame count and/or memory; the oldest whole chunk
+    is evicted first, and evicted frames can be spilled to a python-can log
+    file instead of being dropped. Spilled chunks are written on a
+    FrameRecorder thread, so eviction never waits for the disk.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_frames: int | None = DEFAULT_MAX_FRAMES,
+        max_bytes: int | None = None,
+        spill_path: str | None = None,
+    ):
+        if chunk_size <= 0:
+            raise ValueError("Chunk size must be greater than 0")
+        self._chunk_size = chunk_size
+        self._chunks: list[_Chunk] = []
+        self._length = 0
+        self._memory_bytes = 0
+        self._start_timestamp: float | None = None
+        self._last_timestamps: dict[int, float] = {}
+        # channel names are stored once; rows keep an index
+        self._channel_names: list[str] = [""]
+        self._channel_indices: dict[object, int] = {None: 0}
+        self._evicted = 0
+        self._spilled = 0
+        self._max_frames: int | None = None
+        self._max_bytes: int | None = None
+        self._spill_path: str | None = None
+        self._spill_recorder: FrameRecorder | None = None
+        self.set_limits(max_frames, max_bytes, spill_path)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def set_limits(
+        self,
+        max_frames: int | None = None,
+        max_bytes: int | None = None,
+        spill_path: str | None = None,
+    ) -> None:
+        if max_frames is not None and max_frames < self._chunk_size:
+            raise ValueError(f"History limit must be at least {self._chunk_size}")
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError("History memory limit must be greater than 0")
+        # the recorder imports this module through capture_file
+        from .recorder import RECORD_FORMATS
+
+        if spill_path is not None and Path(spill_path).suffix.lower() not in (
+            RECORD_FORMATS
+        ):
+            raise ValueError(f"Unsupported spill format: {Path(spill_path).name}")
+        self._max_frames = max_frames
+        self._max_bytes = max_bytes
+        if spill_path != self._spill_path:
+            self.close_spill()
+            self._spill_path = spill_path
+
+    # timestamp of the first frame since the store was created or cleared
+    @property
+    def start_timestamp(self) -> float | None:
+        return self._start_timestamp
+
+    # names of the channels seen since the store was created, "" excluded
+    def channels(self) -> list[str]:
+        return self._channel_names[1:]
+
+    def stats(self) -> HistoryStats:
+        return HistoryStats(
+            count=self._length,
+            memory_bytes=self._memory_bytes,
+            evicted=self._evicted,
+            spilled=self._spilled,
+            max_frames=self._max_frames,
+            max_bytes=self._max_bytes,
+        )
+
+    def _writable_chunk(self) -> _Chunk:
+        if not self._chunks or len(self._chunks[-1]) >= self._chunk_size:
+            self._chunks.append(_Chunk())
+        return self._chunks[-1]
+
+    def _append(
+        self,
+        timestamp: float,
+        delta: float,
+        arbitration_id: int,
+        flags: int,
+        dlc: int,
+        payload: bytes | tuple[str, str | None],
+        channel_index: int = 0,
+    ) -> None:
+        chunk = self._writable_chunk()
+        chunk.timestamps.append(timestamp)
+        chunk.deltas.append(delta)
+        chunk.arbitration_ids.append(arbitration_id)
+        chunk.flags.append(flags)
+        chunk.dlcs.append(dlc)
+        chunk.channels.append(channel_index)
+        chunk.payloads.append(payload)
+        if isinstance(payload, bytes):
+            row_bytes = _ROW_COLUMN_BYTES + _BYTES_OBJECT_OVERHEAD + len(payload)
+        else:
+            row_bytes = _ROW_COLUMN_BYTES + sys.getsizeof(payload[0])
+        chunk.memory_bytes += row_bytes
+        self._memory_bytes += row_bytes
+        self._length += 1
+
+    def append_message(self, msg: can.Message) -> None:
+        data = bytes(msg.data) if msg.data is not None else b""
+        timestamp = msg.timestamp
+        if self._start_timestamp is None:
+            self._start_timestamp = timestamp
+        channel_index = self._channel_indices.get(msg.channel)
+        if channel_index is None:
+            channel_index = self._add_channel(msg)
+        # the delta is per ID and channel, so a gateway's two sides differ
+        id_key = ((msg.arbitration_id << 1 | msg.is_extended_id) << 16) | channel_index
+        previous = self._last_timestamps.get(id_key)
+        self._last_timestamps[id_key] = timestamp
+        self._append(
+            timestamp,
+            math.nan if previous is None else timestamp - previous,
+            msg.arbitration_id,
+            message_flags(msg),
+            min(msg.dlc, 0xFF),
+            data,
+            channel_index,
+        )
+
+    def _add_channel(self, msg: can.Message) -> int:
+        name = message_channel(msg)
+        if name in self._channel_names:
+            channel_index = self._channel_names.index(name)
+        else:
+            channel_index = len(self._channel_names)
+            self._channel_names.append(name)
+        self._channel_indices[msg.channel] = channel_index
+        return channel_index
+
+    def append_text(self, text: str, color: str | None, timestamp: float) -> None:
+        self._append(timestamp, math.nan, 0, FLAG_TEXT, 0, (text, color))
+
+    def row(self, index: int) -> FrameRow:
+        if not 0 <= index < self._length:
+            raise IndexError(index)
+        chunk = self._chunks[index // self._chunk_size]
+        offset = index % self._chunk_size
+        return FrameRow(
+            chunk.timestamps[offset],
+            chunk.deltas[offset],
+            chunk.arbitration_ids[offset],
+            chunk.flags[offset],
+            chunk.dlcs[offset],
+            chunk.payloads[offset],
+            self._channel_names[chunk.channels[offset]],
+        )
+
+    # First row at or after 'timestamp', assuming rows are in time order
+    def index_at_time(self, timestamp: float) -> int:
+        starts = [chunk.timestamps[0] for chunk in self._chunks]
+        chunk_index = bisect_right(starts, timestamp) - 1
+        if chunk_index < 0:
+            return 0
+        return chunk_index * self._chunk_size + bisect_left(
+            self._chunks[chunk_index].timestamps, timestamp
+        )
+
+    # Next row of an ID after row 'index', or None
+    def next_index_for_id(
+        self, arbitration_id: int, is_extended_id: bool, index: int = -1
+    ) -> int | None:
+        start = index + 1
+        for chunk_index in range(start // self._chunk_size, len(self._chunks)):
+            chunk = self._chunks[chunk_index]
+            offset = max(0, start - chunk_index * self._chunk_size)
+            ids = chunk.arbitration_ids
+            while True:
+                try:
+                    offset = ids.index(arbitration_id, offset)
+                except ValueError:
+                    break
+                flags = chunk.flags[offset]
+                if (
+                    not flags & FLAG_TEXT
+                    and bool(flags & FLAG_EXTENDED) == is_extended_id
+                ):
+                    return chunk_index * self._chunk_size + offset
+                offset += 1
+        return None
+
+    # Number of rows (always whole chunks) that must go to honour the limits
+    def eviction_count(self) -> int:
+        count = 0
+        length = self._length
+        memory_bytes = self._memory_bytes
+        # the chunk being written is never evicted
+        for chunk in self._chunks[:-1]:
+            over_frames = self._max_frames is not None and length > self._max_frames
+            over_bytes = self._max_bytes is not None and memory_bytes > self._max_bytes
+            if not (over_frames or over_bytes):
+                break
+            count += len(chunk)
+            length -= len(chunk)
+            memory_bytes -= chunk.memory_bytes
+        return count
+
+    def evict(self, count: int) -> None:
+        while count > 0 and len(self._chunks) > 1:
+            chunk = self._chunks[0]
+            if len(chunk) > count:
+                break
+            self._chunks.pop(0)
+            if self._spill_path is not None:
+                self._spill_chunk(chunk)
+            count -= len(chunk)
+            self._length -= len(chunk)
+            self._memory_bytes -= chunk.memory_bytes
+            self._evicted += len(chunk)
+
+    def _spill_chunk(self, chunk: _Chunk) -> None:
+        if self._spill_recorder is None:
+            from .recorder import FrameRecorder
+
+            assert self._spill_path is not None
+            Path(self._spill_path).parent.mkdir(parents=True, exist_ok=True)
+            recorder = FrameRecorder(self._spill_path, _SPILL_QUEUE_CHUNKS)
+            recorder.start()
+            self._spill_recorder = recorder
+        count = sum(isinstance(payload, bytes) for payload in chunk.payloads)
+        # the chunk is no longer in the store, so the writer thread can read
+        # it while the store goes on
+        messages = _chunk_messages(chunk, self._channel_names)
+        if self._spill_recorder.record_batch(messages, count):
+            self._spilled += count
+
+    def close_spill(self) -> None:
+        if self._spill_recorder is not None:
+            self._spill_recorder.stop()
+            self._spill_recorder = None
+
+    def clear(self) -> None:
+        self._chunks.clear()
+        self._length = 0
+        self._memory_bytes = 0
+        self._start_timestamp = None
+        self._last_timestamps.clear()
+        self._channel_names = [""]
+        self._channel_indices = {None: 0}
+        self._evicted = 0
+        self._spilled = 0
+
+
+# Frames of an evicted chunk, built by whoever iterates (the spill writer)
+def _chunk_messages(chunk: _Chunk, channel_names: list[str]) -> Iterator[can.Message]:
+    for offset, payload in enumerate(chunk.payloads):
+        if not isinstance(payload, bytes):
+            continue
+        yield row_to_message(
+            FrameRow(
+                chunk.timestamps[offset],
+                chunk.deltas[offset],
+                chunk.arbitration_ids[offset],
+                chunk.flags[offset],
+                chunk.dlcs[offset],
+                payload,
+                channel_names[chunk.channels[offset]],
+            )
+        )
@@ -0,0 +1,335 @@
+from bisect import bisect_right
+from dataclasses import dataclass
+
+from can.typechecking import CanFilter
+
+FILTER_MODE_BLOCK = "block"  # hide frames matching a rule
+FILTER_MODE_PASS = "pass"  # show only frames matching a rule
+
+ID_SPACE_ANY = "any"
+ID_SPACE_STD = "std"
+ID_SPACE_EXT = "ext"
+
+RULE_EXACT = "exact"  # "123"
+RULE_RANGE = "range"  # "100-1FF" (inclusive)
+RULE_MASK = "mask"  # "100/7F0" (id & mask == can_id & mask)
+
+STD_ID_MAX = 0x7FF
+EXT_ID_MAX = 0x1FFFFFFF
+
+# Where a rule is evaluated once the filter is pushed to the bus
+PLACEMENT_SOFTWARE = "software"  # only in CANHandler
+PLACEMENT_BUS = "bus"  # exactly by bus.set_filters (kernel/adapter)
+PLACEMENT_BUS_PREFILTER = "bus+software"  # superset on the bus, refined in software
+
+# A range is split into at most this many aligned id/mask blocks before it is
+# approximated by a single superset mask instead.
+MAX_RANGE_BUS_FILTERS = 8
+
+# Decisions are memoised per (ID, ext) key; the cache is dropped when it
+# grows past this size so a bus sweeping every extended ID stays bounded
+# (lookups then fall back to the tables until it refills).
+_DECISION_CACHE_LIMIT = 1 << 16
+
+
+@dataclass(frozen=True)
+class FilterRule:
+    kind: str
+    can_id: int
+    # last ID for RULE_RANGE, mask for RULE_MASK, can_id for RULE_EXACT
+    value: int
+    id_space: str = ID_SPACE_ANY
+
+    def __str__(self) -> str:
+        return format_filter_rule(self)
+
+
+def _parse_number(text: str, radix_type: str) -> int:
+    text = text.replace(",", "").strip()
+    if text == "":
+        raise ValueError("Empty filter value")
+    return int(text, 16 if radix_type == "hex" else 10)
+
+
+def parse_filter_rule(
+    text: str, radix_type: str = "dec", id_space: str = ID_SPACE_ANY
+) -> FilterRule:
+    if id_space not in (ID_SPACE_ANY, ID_SPACE_STD, ID_SPACE_EXT):
+        raise ValueError(f"Unknown ID space: {id_space}")
+    text = text.strip()
+    if "-" in text:
+        first_text, last_text = text.split("-", 1)
+        first = _parse_number(first_text, radix_type)
+        last = _parse_number(last_text, radix_type)
+        if last < first:
+            first, last = last, first
+        rule = FilterRule(RULE_RANGE, first, last, id_space)
+    elif "/" in text:
+        id_text, mask_text = text.split("/", 1)
+        mask = _parse_number(mask_text, radix_type)
+        can_id = _parse_number(id_text, radix_type)
+        rule = FilterRule(RULE_MASK, can_id & mask, mask, id_space)
+    else:
+        can_id = _parse_number(text, radix_type)
+        rule = FilterRule(RULE_EXACT, can_id, can_id, id_space)
+
+    id_max = STD_ID_MAX if id_space == ID_SPACE_STD else EXT_ID_MAX
+    if rule.can_id > id_max or (rule.kind == RULE_RANGE and rule.value > id_max):
+        raise ValueError(f"Filter ID out of range: {text}")
+    if rule.kind == RULE_MASK and rule.value > id_max:
+        raise ValueError(f"Filter mask out of range: {text}")
+    return rule
+
+
+def format_filter_rule(rule: FilterRule, radix_type: str = "hex") -> str:
+    def number(value: int) -> str:
+        return f"{value:X}" if radix_type == "hex" else str(value)
+
+    if rule.kind == RULE_RANGE:
+        return f"{number(rule.can_id)}-{number(rule.value)}"
+    if rule.kind == RULE_MASK:
+        return f"{number(rule.can_id)}/{number(rule.value)}"
+    return number(rule.can_id)
+
+
+# Re-write the numbers of a filter entry ("100", "100-1FF", "100/7F0") in another radix
+def convert_filter_text_radix(text: str, new_radix: str) -> str:
+    old_radix = "dec" if new_radix == "hex" else "hex"
+    for separator in ("-", "/"):
+        if separator in text:
+            parts = text.split(separator, 1)
+            return separator.join(
+                convert_filter_text_radix(part, new_radix) for part in parts
+            )
+    text = text.replace(",", "").strip()
+    if text == "":
+        return ""
+    value = _parse_number(text, old_radix)
+    return f"{value:X}" if new_radix == "hex" else str(value)
+
+
+@dataclass(frozen=True)
+class CanFilterPlan:
+    # python-can filter list for bus.set_filters, None to receive everything
+    can_filters: list[CanFilter] | None
+    # one PLACEMENT_* per rule of the compiled filter
+    placements: tuple[str, ...]
+
+
+def _range_to_masks(first: int, last: int, id_max: int) -> list[tuple[int, int]]:
+    blocks: list[tuple[int, int]] = []
+    while first <= last:
+        size = first & -first if first else id_max + 1
+        while first + size - 1 > last:
+            size >>= 1
+        blocks.append((first, id_max & ~(size - 1)))
+        first += size
+    return blocks
+
+
+def _superset_mask(first: int, last: int, id_max: int) -> tuple[int, int]:
+    mask = id_max & ~((1 << (first ^ last).bit_length()) - 1)
+    return first & mask, mask
+
+
+def _rule_to_bus_filters(
+    rule: FilterRule, extended: bool
+) -> tuple[list[CanFilter], bool]:
+    id_max = EXT_ID_MAX if extended else STD_ID_MAX
+    blocks: list[tuple[int, int]]
+    exact = True
+    if rule.kind == RULE_EXACT:
+        if rule.can_id > id_max:
+            return [], True
+        blocks = [(rule.can_id, id_max)]
+    elif rule.kind == RULE_MASK:
+        blocks = [(rule.can_id & id_max, rule.value & id_max)]
+    else:
+        if rule.can_id > id_max:
+            return [], True
+        last = min(rule.value, id_max)
+        blocks = _range_to_masks(rule.can_id, last, id_max)
+        if len(blocks) > MAX_RANGE_BUS_FILTERS:
+            blocks = [_superset_mask(rule.can_id, last, id_max)]
+            exact = False
+    return [
+        CanFilter(can_id=can_id, can_mask=mask, extended=extended)
+        for can_id, mask in blocks
+    ], exact
+
+
+def build_can_filter_plan(id_filter: "CompiledIdFilter") -> CanFilterPlan:
+    """Translate a compiled filter into python-can ``can_filters``.
+
+    Bus filters can only accept frames, so a block-list stays in software,
+    and a range that needs too many id/mask pairs is sent as a superset and
+    refined in software. The software filter always runs as well, so the
+    result is the same wherever a rule ends up.
+    """
+    if id_filter.mode != FILTER_MODE_PASS or not id_filter.rules:
+        return CanFilterPlan(None, tuple(PLACEMENT_SOFTWARE for _ in id_filter.rules))
+
+    can_filters: list[CanFilter] = []
+    placements: list[str] = []
+    for rule in id_filter.rules:
+        exact = True
+        for extended in (False, True):
+            if rule.id_space == (ID_SPACE_EXT if not extended else ID_SPACE_STD):
+                continue
+            rule_filters, rule_exact = _rule_to_bus_filters(rule, extended)
+            can_filters.extend(rule_filters)
+            exact = exact and rule_exact
+        placements.append(PLACEMENT_BUS if exact else PLACEMENT_BUS_PREFILTER)
+    return CanFilterPlan(can_filters, tuple(placements))
+
+
+def _merge_ranges(ranges: list[tuple[int, int]]) -> tuple[list[int], list[int]]:
+    starts: list[int] = []
+    ends: list[int] = []
+    for first, last in sorted(ranges):
+        if ends and first <= ends[-1] + 1:
+            ends[-1] = max(ends[-1], last)
+        else:
+            starts.append(first)
+            ends.append(last)
+    return starts, ends
+
+
+class _IdSpaceTable:
+    __slots__ = ("exact", "masks", "range_ends", "range_starts")
+
+    def __init__(self, rules: list[FilterRule]):
+        self.exact: frozenset[int] = frozenset(
+            rule.can_id for rule in rules if rule.kind == RULE_EXACT
+        )
+        self.range_starts, self.range_ends = _merge_ranges(
+            [(rule.can_id, rule.value) for rule in rules if rule.kind == RULE_RANGE]
+        )
+        self.masks: tuple[tuple[int, int], ...] = tuple(
+            sorted(
+                {(rule.can_id, rule.value) for rule in rules if rule.kind == RULE_MASK}
+            )
+        )
+
+    def matches(self, arbitration_id: int) -> bool:
+        if arbitration_id in self.exact:
+            return True
+        index = bisect_right(self.range_starts, arbitration_id) - 1
+        if index >= 0 and arbitration_id <= self.range_ends[index]:
+            return True
+        for can_id, mask in self.masks:
+            if arbitration_id & mask == can_id:
+                return True
+        return False
+
+
+class CompiledIdFilter:
+    """Pre-compiled ID filter used on the receive threads.
+
+    Exact IDs live in a hash set, ranges in sorted start/end lists searched
+    with bisect and masks in a short tuple, separately for standard and
+    extended IDs. The rules and tables never change after construction;
+    build a new instance and swap the reference to change the filter.
+
+    Each decision is memoised per ID in a dict, so a steady-state lookup is
+    a single dict hit. The memo is the one mutable part: several notifier
+    threads may fill it at once, which is safe because every dict operation
+    is atomic under the GIL and a racing writer stores the same decision.
+    """
+
+    def __init__(
+        self, rules: list[FilterRule] | None = None, mode: str = FILTER_MODE_BLOCK
+    ):
+        if mode not in (FILTER_MODE_BLOCK, FILTER_MODE_PASS):
+            raise ValueError(f"Unknown filter mode: {mode}")
+        self.rules: tuple[FilterRule, ...] = tuple(rules or ())
+        self.mode = mode
+        self._std = _IdSpaceTable(
+            [rule for rule in self.rules if rule.id_space != ID_SPACE_EXT]
+        )
+        self._ext = _IdSpaceTable(
+            [rule for rule in self.rules if rule.id_space != ID_SPACE_STD]
+        )
+        self._pass_on_match = mode == FILTER_MODE_PASS
+        self._accept_all = mode == FILTER_MODE_BLOCK and not self.rules
+        self._decisions: dict[int, bool] = {}
+
+    @classmethod
+    def accept_all(cls) -> "CompiledIdFilter":
+        return cls([], FILTER_MODE_BLOCK)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CompiledIdFilter):
+            return NotImplemented
+        return self.mode == other.mode and self.rules == other.rules
+
+    def __hash__(self) -> int:
+        return hash((self.mode, self.rules))
+
+    def matches(self, arbitration_id: int, is_extended_id: bool) -> bool:
+        table = self._ext if is_extended_id else self._std
+        return table.matches(arbitration_id)
+
+    def accepts(self, arbitration_id: int, is_extended_id: bool) -> bool:
+        if self._accept_all:
+            return True
+        key = (arbitration_id << 1) | is_extended_id
+        decision = self._decisions.get(key)
+        if decision is None:
+            decision = (
+                self.matches(arbitration_id, is_extended_id) == self._pass_on_match
+            )
+            if len(self._decisions) >= _DECISION_CACHE_LIMIT:
+                self._decisions.clear()
+            self._decisions[key] = decision
+        return decision
+
+
+class ChannelIdFilters:
+    """ID filters of several channels, built from one rule list.
+
+    A rule names the channel it applies to, or None for every channel. The
+    filter of each named channel is compiled once, so the receive thread of
+    a channel only holds a CompiledIdFilter. Never changed once built.
+    """
+
+    def __init__(
+        self,
+        rules: list[tuple[FilterRule, str | None]] | None = None,
+        mode: str = FILTER_MODE_BLOCK,
+    ):
+        self.rules: tuple[tuple[FilterRule, str | None], ...] = tuple(rules or ())
+        self.mode = mode
+        self.default = CompiledIdFilter(
+            [rule for rule, channel in self.rules if channel is None], mode
+        )
+        self._channels = {
+            name: CompiledIdFilter(
+                [rule for rule, channel in self.rules if channel in (None, name)],
+                mode,
+            )
+            for name in {channel for _, channel in self.rules if channel is not None}
+        }
+
+    @classmethod
+    def accept_all(cls) -> "ChannelIdFilters":
+        return cls([], FILTER_MODE_BLOCK)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ChannelIdFilters):
+            return NotImplemented
+        return self.mode == other.mode and self.rules == other.rules
+
+    def __hash__(self) -> int:
+        return hash((self.mode, self.rules))
+
+    def for_channel(self, channel: str) -> CompiledIdFilter:
+        return self._channels.get(channel, self.default)
+
+    # Positions in 'rules' of the rules compiled into for_channel(channel)
+    def rule_indices(self, channel: str) -> list[int]:
+        return [
+            index
+            for index, (_, rule_channel) in enumerate(self.rules)
+            if rule_channel is None or rule_channel == channel
+        ]
@@ -0,0 +1,80 @@
+import math
+from array import array
+from dataclasses import dataclass
+
+# Buckets per doubling of the latency, so a bucket is about 9 % wide
+SUB_BUCKETS = 8
+# Bucket 0 holds everything below 1 µs, the last one everything above
+# 2**27 µs (about 134 s)
+MIN_LATENCY_S = 1e-6
+_OCTAVES = 27
+BUCKET_COUNT = _OCTAVES * SUB_BUCKETS + 2
+
+
+@dataclass(frozen=True)
+class LatencyStats:
+    count: int
+    # seconds, None until a latency was recorded
+    p50: float | None
+    p99: float | None
+    max: float | None
+
+
+class LatencyHistogram:
+    """Latencies in log-scale buckets, in the style of HdrHistogram.
+
+    The buckets are allocated once, so recording is an index computation and
+    an increment whatever the number of values. Percentiles are reported as
+    the upper bound of their bucket (at most about 9 % high), capped at the
+    exact maximum.
+    """
+
+    def __init__(self):
+        self._counts = array("Q", bytes(8 * BUCKET_COUNT))
+        self._count = 0
+        self._max = 0.0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @staticmethod
+    def bucket_index(seconds: float) -> int:
+        if seconds < MIN_LATENCY_S:
+            return 0
+        index = int(math.log2(seconds / MIN_LATENCY_S) * SUB_BUCKETS) + 1
+        return min(index, BUCKET_COUNT - 1)
+
+    @staticmethod
+    def bucket_upper_bound(index: int) -> float:
+        return MIN_LATENCY_S * 2 ** (index / SUB_BUCKETS)
+
+    # 'count' records the same latency for several frames (a sample)
+    def record(self, seconds: float, count: int = 1) -> None:
+        self._counts[self.bucket_index(seconds)] += count
+        self._count += count
+        self._max = max(self._max, seconds)
+
+    def percentile(self, fraction: float) -> float | None:
+        if not self._count:
+            return None
+        rank = max(1, math.ceil(fraction * self._count))
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= rank:
+                return min(self.bucket_upper_bound(index), self._max)
+        return self._max
+
+    def stats(self) -> LatencyStats:
+        return LatencyStats(
+            count=self._count,
+            p50=self.percentile(0.50),
+            p99=self.percentile(0.99),
+            max=self._max if self._count else None,
+        )
+
+    def reset(self) -> None:
+        for index in range(BUCKET_COUNT):
+            self._counts[index] = 0
+        self._count = 0
+        self._max = 0.0
@@ -0,0 +1,225 @@
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import can
+
+from .id_filter import EXT_ID_MAX, STD_ID_MAX
+from .statistics import IdStatistics
+
+# Interfaces whose send_periodic hands the frame to the kernel; their sends
+# are observed through the kernel's loopback on a second socket
+NATIVE_PERIODIC_INTERFACES = frozenset({"socketcan"})
+
+MODE_NATIVE = "kernel BCM"
+MODE_THREAD = "thread"
+
+
+@dataclass(frozen=True)
+class PeriodicSendStats:
+    mode: str
+    # requested period in seconds
+    period: float
+    sent: int
+    errors: int
+    # achieved periods in seconds, None until two frames were sent or when
+    # the kernel's sends cannot be observed
+    period_mean: float | None
+    period_min: float | None
+    period_max: float | None
+    jitter: float | None
+    last_error: Exception | None
+
+
+class PeriodicSender:
+    """Sends one frame cyclically.
+
+    SocketCAN hands the frame to the kernel broadcast manager. Given
+    ``echo_channel``, a second raw socket filtered on the frame's ID receives
+    the kernel's loopback of every frame it sent, which gives the achieved
+    timing and the copies for ``on_sent``. Other interfaces send from a
+    thread of their own through ``send`` (``bus.send`` by default); a frame
+    is timed and reported once the bus accepted it, and failed sends are
+    counted without stopping the thread. ``on_sent`` is called on the
+    sender or echo thread. The data can be changed while sending with
+    ``modify_data``.
+    """
+
+    def __init__(
+        self,
+        bus: can.BusABC,
+        interface: str | None,
+        msg: can.Message,
+        period: float,
+        on_sent: Callable[[can.Message], None] | None = None,
+        send: Callable[[can.Message], None] | None = None,
+        echo_channel: str | None = None,
+    ):
+        if period <= 0:
+            raise ValueError("Period must be greater than 0")
+        self.period = period
+        # the frame being sent, replaced by modify_data
+        self.message = msg
+        self._on_sent = on_sent
+        self._timing: IdStatistics | None = None
+        self._sent = 0
+        self._errors = 0
+        self._last_error: Exception | None = None
+        self._task: can.CyclicSendTaskABC | None = None
+        self._echo_bus: can.BusABC | None = None
+        self._echo_notifier: can.Notifier | None = None
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+
+        if interface in NATIVE_PERIODIC_INTERFACES:
+            self.mode = MODE_NATIVE
+            self._task = bus.send_periodic(msg, period, store_task=False)
+            if echo_channel is not None:
+                self._open_echo(echo_channel, interface, msg)
+        else:
+            self.mode = MODE_THREAD
+            self._send = send if send is not None else bus.send
+            self._thread = threading.Thread(
+                target=self._run, name="PeriodicSender", daemon=True
+            )
+            self._thread.start()
+
+    # True when every sent frame is seen (timed and handed to on_sent)
+    @property
+    def observed(self) -> bool:
+        return self.mode == MODE_THREAD or self._echo_notifier is not None
+
+    # True for the kernel's loopback of this sender's frames, which other
+    # sockets on the host receive as well
+    def is_echo(self, msg: can.Message) -> bool:
+        current = self.message
+        return (
+            self._echo_notifier is not None
+            and not msg.is_rx
+            and msg.arbitration_id == current.arbitration_id
+            and msg.is_extended_id == current.is_extended_id
+        )
+
+    def modify_data(self, msg: can.Message) -> None:
+        """Replace the frame without restarting the period.
+
+        Raises ValueError when the ID or frame type differs, TypeError when
+        the interface cannot modify its task; the sender has to be restarted
+        for either.
+        """
+        if self._task is None:
+            current = self.message
+            if (
+                msg.arbitration_id != current.arbitration_id
+                or msg.is_extended_id != current.is_extended_id
+                or msg.is_fd != current.is_fd
+            ):
+                raise ValueError("The ID or frame type of a periodic send changed")
+        elif isinstance(self._task, can.ModifiableCyclicTaskABC):
+            self._task.modify_data(msg)
+        else:
+            raise TypeError("This interface cannot change periodic data")
+        self.message = msg
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.stop()
+        if self._echo_notifier is not None:
+            self._echo_notifier.stop()
+        if self._echo_bus is not None:
+            self._echo_bus.shutdown()
+        self._stopping.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join()
+
+    def stats(self) -> PeriodicSendStats:
+        timing = self._timing.snapshot() if self._timing is not None else None
+        return PeriodicSendStats(
+            mode=self.mode,
+            period=self.period,
+            sent=self._sent,
+            errors=self._errors,
+            period_mean=timing.period_mean if timing else None,
+            period_min=timing.period_min if timing else None,
+            period_max=timing.period_max if timing else None,
+            jitter=timing.jitter if timing else None,
+            last_error=self._last_error,
+        )
+
+    def _open_echo(self, channel: str, interface: str, msg: can.Message) -> None:
+        id_mask = EXT_ID_MAX if msg.is_extended_id else STD_ID_MAX
+        try:
+            self._echo_bus = can.Bus(
+                channel,
+                interface=interface,
+                fd=msg.is_fd,
+                can_filters=[
+                    {
+                        "can_id": msg.arbitration_id,
+                        "can_mask": id_mask,
+                        "extended": msg.is_extended_id,
+                    }
+                ],
+            )
+            self._echo_notifier = can.Notifier(self._echo_bus, [self._on_echo])
+        except (can.CanError, OSError) as e:
+            # the kernel keeps sending; only the timing and log are missing
+            self._last_error = e
+            if self._echo_bus is not None:
+                self._echo_bus.shutdown()
+                self._echo_bus = None
+
+    # Runs on the echo socket's notifier thread
+    def _on_echo(self, msg: can.Message) -> None:
+        if msg.is_rx:
+            # sent by another node with the same ID
+            return
+        msg.channel = self.message.channel
+        self._record_sent(msg)
+
+    def _run(self) -> None:
+        deadline = time.perf_counter()
+        while not self._stopping.is_set():
+            msg = self.message
+            try:
+                self._send(msg)
+            except (can.CanError, OSError, ValueError) as e:
+                # keep sending through transient errors (e.g. TX buffer full)
+                self._errors += 1
+                self._last_error = e
+            else:
+                self._record_sent(msg)
+            deadline += self.period
+            delay = deadline - time.perf_counter()
+            if delay < -self.period:
+                # a full period late: restart the schedule instead of bursting
+                deadline = time.perf_counter()
+            elif delay > 0:
+                self._stopping.wait(delay)
+
+    def _record_sent(self, msg: can.Message) -> None:
+        now = time.perf_counter()
+        if self._timing is None:
+            self._timing = IdStatistics(msg.arbitration_id, msg.is_extended_id, now)
+        else:
+            self._timing.update(now)
+        self._sent += 1
+        if self._on_sent is not None:
+            self._on_sent(copy_sent_message(msg))
+
+
+def copy_sent_message(msg: can.Message) -> can.Message:
+    return can.Message(
+        timestamp=time.time(),
+        channel=msg.channel,
+        arbitration_id=msg.arbitration_id,
+        is_extended_id=msg.is_extended_id,
+        is_remote_frame=msg.is_remote_frame,
+        is_fd=msg.is_fd,
+        bitrate_switch=msg.bitrate_switch,
+        is_rx=False,
+        dlc=msg.dlc,
+        data=msg.data,
+        check=False,
+    )
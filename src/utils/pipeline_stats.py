@@ -0,0 +1,100 @@
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from .frame_buffer import FrameBufferStats
+
+
+class ReceiveCounters:
+    """Counters of one receive thread (a notifier, replay or headless).
+
+    Only the thread that receives the frames writes them, so plain integer
+    attributes are enough: no lock on the hot path, and readers on other
+    threads see values that are at most a frame behind.
+    """
+
+    __slots__ = ("error_frames", "filtered_out", "receive_ns", "received")
+
+    def __init__(self):
+        # every frame the receive callback was called with
+        self.received = 0
+        # frames rejected by the ID filter
+        self.filtered_out = 0
+        self.error_frames = 0
+        # time spent in the receive callback
+        self.receive_ns = 0
+
+    # Fold in the counters of a thread that has stopped
+    def add(self, other: "ReceiveCounters") -> None:
+        self.received += other.received
+        self.filtered_out += other.filtered_out
+        self.error_frames += other.error_frames
+        self.receive_ns += other.receive_ns
+
+    def reset(self) -> None:
+        self.received = 0
+        self.filtered_out = 0
+        self.error_frames = 0
+        self.receive_ns = 0
+
+
+class RenderCounters:
+    """Counters of the GUI thread's log view."""
+
+    __slots__ = ("format_ns", "formatted", "rendered")
+
+    def __init__(self):
+        # frames handed to the log view
+        self.rendered = 0
+        # cells converted to text, and the time it took
+        self.formatted = 0
+        self.format_ns = 0
+
+    def reset(self) -> None:
+        self.rendered = 0
+        self.formatted = 0
+        self.format_ns = 0
+
+
+@dataclass(frozen=True)
+class PipelineStats:
+    received: int
+    filtered_out: int
+    error_frames: int
+    # frames waiting for the GUI, and frames lost because it fell behind
+    queued: int
+    dropped: int
+    rendered: int
+    formatted: int
+    # seconds
+    receive_time: float
+    format_time: float
+
+    @property
+    def receive_time_per_frame(self) -> float | None:
+        return self.receive_time / self.received if self.received else None
+
+    @property
+    def format_time_per_cell(self) -> float | None:
+        return self.format_time / self.formatted if self.formatted else None
+
+
+def collect_pipeline_stats(
+    receive_counters: Iterable[ReceiveCounters],
+    buffer_stats: FrameBufferStats | None = None,
+    render_counters: RenderCounters | None = None,
+) -> PipelineStats:
+    total = ReceiveCounters()
+    for counters in receive_counters:
+        total.add(counters)
+    render = render_counters if render_counters is not None else RenderCounters()
+    return PipelineStats(
+        received=total.received,
+        filtered_out=total.filtered_out,
+        error_frames=total.error_frames,
+        queued=buffer_stats.pending if buffer_stats is not None else 0,
+        dropped=buffer_stats.dropped if buffer_stats is not None else 0,
+        rendered=render.rendered,
+        formatted=render.formatted,
+        receive_time=total.receive_ns / 1e9,
+        format_time=render.format_ns / 1e9,
+    )
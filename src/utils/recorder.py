@@ -0,0 +1,158 @@
+import queue
+import struct
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+import can
+from can.io.generic import MessageWriter
+
+from .capture_file import CAPTURE_SUFFIX, CaptureWriter
+
+# File suffixes understood by can.Logger that CANViewer offers for recording
+RECORD_FORMATS = {
+    ".blf": "Vector BLF",
+    ".asc": "Vector ASC",
+    ".log": "candump log",
+    ".csv": "CSV",
+    CAPTURE_SUFFIX: "CANViewer capture",
+}
+try:
+    import asammdf  # type: ignore[import-not-found]  # noqa: F401
+except ImportError:
+    pass
+else:
+    RECORD_FORMATS[".mf4"] = "ASAM MDF4"
+
+DEFAULT_QUEUE_SIZE = 65536
+# Frames written per wake-up of the writer thread
+_WRITE_BATCH_SIZE = 1024
+_STOP = object()
+
+
+@dataclass(frozen=True)
+class RecorderStats:
+    path: str
+    queued: int
+    queue_capacity: int
+    written: int
+    bytes_written: int
+    dropped: int
+
+
+def record_file_filter() -> str:
+    patterns = " ".join(f"*{suffix}" for suffix in RECORD_FORMATS)
+    filters = [f"CAN logs ({patterns})"]
+    filters.extend(f"{name} (*{suffix})" for suffix, name in RECORD_FORMATS.items())
+    return ";;".join(filters)
+
+
+class FrameRecorder:
+    """Streams frames to a python-can log file on a dedicated writer thread.
+
+    ``record`` only does a non-blocking put into a bounded queue, so it is
+    safe to call from the can.Notifier thread and from the GUI thread. When
+    the disk cannot keep up the queue fills and further frames are counted
+    as dropped instead of stalling the caller.
+    """
+
+    def __init__(self, path: str | Path, queue_size: int = DEFAULT_QUEUE_SIZE):
+        suffix = Path(path).suffix.lower()
+        if suffix not in RECORD_FORMATS:
+            raise ValueError(f"Unsupported recording format: {suffix}")
+        self.path = str(path)
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._writer: MessageWriter | CaptureWriter | None = None
+        self._thread: threading.Thread | None = None
+        self._written = 0
+        self._bytes_written = 0
+        self._dropped = 0
+        self.error: Exception | None = None
+
+    def start(self) -> None:
+        # Open on the caller's thread so errors surface immediately
+        if Path(self.path).suffix.lower() == CAPTURE_SUFFIX:
+            self._writer = CaptureWriter(self.path)
+        else:
+            self._writer = can.Logger(self.path)
+        self._thread = threading.Thread(
+            target=self._run, name="FrameRecorder", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        if self._thread is None:
+            return
+        # the sentinel must get in even if the queue is full
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def record(self, msg: can.Message) -> None:
+        try:
+            self._queue.put_nowait(msg)
+        except queue.Full:
+            self._dropped += 1
+
+    # Queues frames as one item, e.g. a generator that builds them on the
+    # writer thread; False if the queue is full and they were dropped
+    def record_batch(self, msgs: Iterable[can.Message], count: int) -> bool:
+        try:
+            self._queue.put_nowait(msgs)
+        except queue.Full:
+            self._dropped += count
+            return False
+        return True
+
+    def stats(self) -> RecorderStats:
+        return RecorderStats(
+            path=self.path,
+            queued=self._queue.qsize(),
+            queue_capacity=self._queue.maxsize,
+            written=self._written,
+            bytes_written=self._bytes_written,
+            dropped=self._dropped,
+        )
+
+    def _run(self) -> None:
+        writer = self._writer
+        assert writer is not None
+        batch: list = []
+        try:
+            while True:
+                batch = [self._queue.get()]
+                while len(batch) < _WRITE_BATCH_SIZE:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                for item in batch:
+                    if item is _STOP:
+                        return
+                    if isinstance(item, can.Message):
+                        writer.on_message_received(item)
+                        self._written += 1
+                        continue
+                    for msg in item:
+                        writer.on_message_received(msg)
+                        self._written += 1
+                self._bytes_written = self._file_size()
+        except (OSError, ValueError, struct.error, can.CanError) as e:
+            # keep consuming frames as drops so callers never block
+            self.error = e
+            if not any(msg is _STOP for msg in batch):
+                while self._queue.get() is not _STOP:
+                    self._dropped += 1
+        finally:
+            writer.stop()
+            self._bytes_written = self._file_size()
+
+    def _file_size(self) -> int:
+        try:
+            return Path(self.path).stat().st_size
+        except OSError:
+            return self._bytes_written
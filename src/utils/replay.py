@@ -0,0 +1,238 @@
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable
+from pathlib import Path
+from typing import Protocol
+
+import can
+
+from .capture_file import CAPTURE_SUFFIX, CaptureFile
+
+MIN_SPEED = 0.1
+MAX_SPEED = 100.0
+
+# Waits shorter than this are spun instead of slept, for inter-frame timing
+# finer than the OS timer resolution
+_SPIN_THRESHOLD_S = 0.002
+_BACKLOG_WAIT_S = 0.005
+
+
+class ReplaySource(Protocol):
+    @property
+    def start_timestamp(self) -> float | None: ...
+
+    def __len__(self) -> int: ...
+
+    def message(self, index: int) -> can.Message: ...
+
+    def index_at_time(self, timestamp: float) -> int: ...
+
+    def close(self) -> None: ...
+
+
+class MessageListSource:
+    """Replay source for python-can log files, read fully into memory."""
+
+    def __init__(self, messages: list[can.Message]):
+        self._messages = messages
+        self._timestamps = [msg.timestamp for msg in messages]
+
+    @property
+    def start_timestamp(self) -> float | None:
+        return self._timestamps[0] if self._timestamps else None
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def message(self, index: int) -> can.Message:
+        return self._messages[index]
+
+    def index_at_time(self, timestamp: float) -> int:
+        return bisect_left(self._timestamps, timestamp)
+
+    def close(self) -> None:
+        self._messages = []
+        self._timestamps = []
+
+
+# .cvc captures are read from the mapping; other formats through can.LogReader
+def open_replay_source(path: str | Path) -> ReplaySource:
+    if Path(path).suffix.lower() == CAPTURE_SUFFIX:
+        return CaptureFile(path)
+    with can.LogReader(path) as reader:
+        return MessageListSource(list(reader))
+
+
+class FrameReplay:
+    """Plays a recorded source back through ``deliver`` on its own thread.
+
+    Frames keep their recorded timestamps and are paced by the wall clock at
+    ``speed`` times real time, or sent as fast as ``deliver`` keeps up when
+    the speed is None. At max speed ``is_backlogged`` is polled so the
+    consumer is throttled instead of overflowing. With a ``transmit``
+    callable each frame is also sent onto a bus at the paced time.
+    """
+
+    def __init__(
+        self,
+        source: ReplaySource,
+        deliver: Callable[[can.Message], None],
+        is_backlogged: Callable[[], bool] | None = None,
+    ):
+        self.source = source
+        self._deliver = deliver
+        self._is_backlogged = is_backlogged
+        self._transmit: Callable[[can.Message], None] | None = None
+        self._lock = threading.Lock()
+        # set by every control call to interrupt waits
+        self._wake = threading.Event()
+        self._position = 0
+        self._speed: float | None = 1.0
+        self._playing = False
+        self._stopping = False
+        self._anchor_wall = 0.0
+        self._anchor_timestamp = 0.0
+        self._anchor_dirty = True
+        self.delivered = 0
+        self.transmit_errors = 0
+        self.last_error: Exception | None = None
+        self._thread = threading.Thread(
+            target=self._run, name="FrameReplay", daemon=True
+        )
+        self._thread.start()
+
+    def __len__(self) -> int:
+        return len(self.source)
+
+    def position(self) -> int:
+        return self._position
+
+    def speed(self) -> float | None:
+        return self._speed
+
+    def is_playing(self) -> bool:
+        return self._playing
+
+    def is_finished(self) -> bool:
+        return self._position >= len(self.source)
+
+    def play(self) -> None:
+        with self._lock:
+            if self._position >= len(self.source):
+                self._position = 0
+            self._playing = True
+            self._anchor_dirty = True
+        self._wake.set()
+
+    def pause(self) -> None:
+        with self._lock:
+            self._playing = False
+        self._wake.set()
+
+    def seek(self, index: int) -> None:
+        with self._lock:
+            self._position = max(0, min(index, len(self.source)))
+            self._anchor_dirty = True
+        self._wake.set()
+
+    # Seek to 'seconds' after the first frame
+    def seek_time(self, seconds: float) -> None:
+        start = self.source.start_timestamp
+        if start is not None:
+            self.seek(self.source.index_at_time(start + seconds))
+
+    # None replays as fast as possible
+    def set_speed(self, speed: float | None) -> None:
+        if speed is not None and not MIN_SPEED <= speed <= MAX_SPEED:
+            raise ValueError(
+                f"Replay speed must be between {MIN_SPEED} and {MAX_SPEED}"
+            )
+        with self._lock:
+            self._speed = speed
+            self._anchor_dirty = True
+        self._wake.set()
+
+    def set_transmit(self, transmit: Callable[[can.Message], None] | None) -> None:
+        self._transmit = transmit
+
+    def stop(self) -> None:
+        self._stopping = True
+        self._wake.set()
+        self._thread.join()
+        self.source.close()
+
+    def _wait(self, timeout: float | None = None) -> bool:
+        woken = self._wake.wait(timeout)
+        if woken:
+            self._wake.clear()
+        return woken
+
+    # Returns False when a control call interrupted the wait
+    def _wait_until(self, target: float) -> bool:
+        while True:
+            remaining = target - time.perf_counter()
+            if remaining <= 0:
+                return True
+            if remaining > _SPIN_THRESHOLD_S:
+                if self._wait(remaining - _SPIN_THRESHOLD_S / 2):
+                    return False
+            elif self._wake.is_set():
+                self._wake.clear()
+                return False
+
+    def _run(self) -> None:
+        source = self.source
+        while not self._stopping:
+            with self._lock:
+                if self._playing and self._position >= len(source):
+                    self._playing = False
+                playing = self._playing
+                index = self._position
+                speed = self._speed
+            if not playing:
+                self._wait()
+                continue
+
+            msg = source.message(index)
+            if speed is not None:
+                if self._anchor_dirty:
+                    self._anchor_dirty = False
+                    self._anchor_wall = time.perf_counter()
+                    self._anchor_timestamp = msg.timestamp
+                target = (
+                    self._anchor_wall + (msg.timestamp - self._anchor_timestamp) / speed
+                )
+                if not self._wait_until(target):
+                    continue
+            elif self._is_backlogged is not None and self._is_backlogged():
+                self._wait(_BACKLOG_WAIT_S)
+                continue
+
+            with self._lock:
+                # a seek or pause while waiting wins over this frame
+                if not self._playing or self._position != index:
+                    continue
+                self._position = index + 1
+            self._deliver(msg)
+            self.delivered += 1
+            transmit = self._transmit
+            if transmit is not None and not msg.is_error_frame:
+                try:
+                    transmit(_copy_for_transmit(msg))
+                except can.CanError as e:
+                    self.transmit_errors += 1
+                    self.last_error = e
+
+
+def _copy_for_transmit(msg: can.Message) -> can.Message:
+    return can.Message(
+        arbitration_id=msg.arbitration_id,
+        is_extended_id=msg.is_extended_id,
+        is_remote_frame=msg.is_remote_frame,
+        is_fd=msg.is_fd,
+        bitrate_switch=msg.bitrate_switch,
+        dlc=msg.dlc,
+        data=msg.data,
+        check=False,
+    )
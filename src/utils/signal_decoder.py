@@ -0,0 +1,394 @@
+import re
+import struct
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import NamedTuple
+
+# Signal databases CANViewer can load; DBC is parsed here, the others need
+# cantools
+DATABASE_FORMATS = {".dbc": "Vector DBC"}
+try:
+    import cantools  # type: ignore[import-not-found]
+except ImportError:
+    cantools = None
+else:
+    DATABASE_FORMATS[".arxml"] = "AUTOSAR ARXML"
+    DATABASE_FORMATS[".kcd"] = "Kayak KCD"
+    DATABASE_FORMATS[".sym"] = "PCAN Symbol"
+
+# Bit 31 of a DBC message ID marks an extended ID
+_DBC_EXTENDED_FLAG = 0x80000000
+# Holder of signals that belong to no message, written by Vector tools
+_DBC_INDEPENDENT_SIGNALS = "VECTOR__INDEPENDENT_SIG_MSG"
+
+_MESSAGE_PATTERN = re.compile(r"^BO_\s+(\d+)\s+(\w+)\s*:\s*(\d+)")
+_SIGNAL_PATTERN = re.compile(
+    r"^SG_\s+(\w+)\s*(M|m\d+M?)?\s*:\s*(\d+)\|(\d+)@([01])([+-])\s*"
+    r"\(([^,]+),([^)]+)\)\s*\[[^\]]*\]\s*\"([^\"]*)\""
+)
+_CHOICES_PATTERN = re.compile(r"^VAL_\s+(\d+)\s+(\w+)\s+(.*);")
+_CHOICE_PATTERN = re.compile(r"(-?\d+)\s+\"([^\"]*)\"")
+_VALUE_TYPE_PATTERN = re.compile(r"^SIG_VALTYPE_\s+(\d+)\s+(\w+)\s*:?\s*([12])")
+
+# SIG_VALTYPE_ of IEEE floats: 1 is single, 2 is double precision
+_FLOAT_FORMATS = {32: "f", 64: "d"}
+
+
+@dataclass(frozen=True)
+class SignalDefinition:
+    name: str
+    # DBC start bit: the LSB for little endian, the MSB (sawtooth
+    # numbering) for big endian
+    start: int
+    length: int
+    little_endian: bool = True
+    signed: bool = False
+    is_float: bool = False
+    scale: float = 1.0
+    offset: float = 0.0
+    unit: str = ""
+    # True for the multiplexer switch; set for signals only present when
+    # the switch has one of these values
+    is_multiplexer: bool = False
+    multiplexer_ids: tuple[int, ...] | None = None
+    choices: dict[int, str] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class MessageDefinition:
+    arbitration_id: int
+    is_extended_id: bool
+    name: str
+    length: int
+    signals: tuple[SignalDefinition, ...]
+
+
+class DecodedSignal(NamedTuple):
+    name: str
+    # physical value, or the name of the raw value from the value table
+    value: int | float | str
+    unit: str
+
+
+class _CompiledSignal:
+    """One signal reduced to a shift and mask of the frame as an integer."""
+
+    __slots__ = (
+        "choices",
+        "float_struct",
+        "is_integer",
+        "little_endian",
+        "mask",
+        "min_length",
+        "name",
+        "offset",
+        "scale",
+        "shift",
+        "sign_bit",
+        "unit",
+    )
+
+    def __init__(self, signal: SignalDefinition, message_length: int):
+        self.name = signal.name
+        self.unit = signal.unit
+        self.little_endian = signal.little_endian
+        if signal.little_endian:
+            lsb = signal.start
+            msb = signal.start + signal.length - 1
+            self.shift = lsb
+            last_bit = msb
+        else:
+            # bit n of byte b is bit (length - 1 - b) * 8 + n of the frame
+            # read as a big endian integer
+            msb_byte, msb_bit = divmod(signal.start, 8)
+            msb = (message_length - 1 - msb_byte) * 8 + msb_bit
+            self.shift = msb - signal.length + 1
+            if msb >= message_length * 8 or self.shift < 0:
+                raise ValueError(f"Signal {signal.name} does not fit in the message")
+            # the LSB is 'length - 1' bits further along the sawtooth
+            last_bit = message_length * 8 - 1 - self.shift
+        self.mask = (1 << signal.length) - 1
+        self.sign_bit = 1 << (signal.length - 1) if signal.signed else 0
+        self.scale = signal.scale
+        self.offset = signal.offset
+        self.is_integer = (
+            not signal.is_float
+            and float(signal.scale).is_integer()
+            and float(signal.offset).is_integer()
+        )
+        self.float_struct: struct.Struct | None = None
+        if signal.is_float:
+            float_format = _FLOAT_FORMATS.get(signal.length)
+            if float_format is None:
+                raise ValueError(
+                    f"Float signal {signal.name} must be 32 or 64 bits long"
+                )
+            self.float_struct = struct.Struct(f"<{float_format}")
+        self.choices = signal.choices
+        # frames shorter than this do not carry the signal
+        self.min_length = last_bit // 8 + 1
+
+    def raw(self, little: int, big: int) -> int:
+        value = ((little if self.little_endian else big) >> self.shift) & self.mask
+        if value & self.sign_bit:
+            value -= self.mask + 1
+        return value
+
+    def decode(self, little: int, big: int) -> DecodedSignal:
+        raw = self.raw(little, big)
+        if self.choices:
+            choice = self.choices.get(raw)
+            if choice is not None:
+                return DecodedSignal(self.name, choice, self.unit)
+        if self.float_struct is not None:
+            value: int | float = self.float_struct.unpack(
+                (raw & self.mask).to_bytes(self.float_struct.size, "little")
+            )[0]
+            value = value * self.scale + self.offset
+        elif self.is_integer:
+            value = raw * int(self.scale) + int(self.offset)
+        else:
+            value = raw * self.scale + self.offset
+        return DecodedSignal(self.name, value, self.unit)
+
+
+class MessageDecoder:
+    """Decoder of one message, compiled once from its definition.
+
+    The frame is converted to an integer once per byte order and each
+    signal is a shift and a mask of it. Multiplexed signals are looked up
+    by the value of the multiplexer switch.
+    """
+
+    def __init__(self, message: MessageDefinition):
+        self.name = message.name
+        self._length = message.length
+        self._signals: list[_CompiledSignal] = []
+        self._multiplexer: _CompiledSignal | None = None
+        self._multiplexed: dict[int, list[_CompiledSignal]] = {}
+        for signal in message.signals:
+            compiled = _CompiledSignal(signal, message.length)
+            if signal.multiplexer_ids is None:
+                self._signals.append(compiled)
+                if signal.is_multiplexer:
+                    self._multiplexer = compiled
+                continue
+            for multiplexer_id in signal.multiplexer_ids:
+                self._multiplexed.setdefault(multiplexer_id, []).append(compiled)
+        compiled_signals = [*self._signals]
+        for signals in self._multiplexed.values():
+            compiled_signals.extend(signals)
+        self._uses_little = any(s.little_endian for s in compiled_signals)
+        self._uses_big = any(not s.little_endian for s in compiled_signals)
+
+    def decode(self, data: bytes) -> list[DecodedSignal]:
+        data_length = len(data)
+        little = int.from_bytes(data, "little") if self._uses_little else 0
+        big = 0
+        if self._uses_big:
+            length = self._length
+            if len(data) != length:
+                data = data[:length].ljust(length, b"\x00")
+            big = int.from_bytes(data, "big")
+        signals = self._signals
+        if self._multiplexer is not None and data_length >= (
+            self._multiplexer.min_length
+        ):
+            selected = self._multiplexed.get(self._multiplexer.raw(little, big))
+            if selected:
+                signals = signals + selected
+        return [
+            signal.decode(little, big)
+            for signal in signals
+            if data_length >= signal.min_length
+        ]
+
+
+def format_signals(signals: list[DecodedSignal]) -> str:
+    parts = []
+    for signal in signals:
+        value = signal.value
+        text = f"{value:g}" if isinstance(value, float) else str(value)
+        parts.append(f"{signal.name}={text}{' ' + signal.unit if signal.unit else ''}")
+    return ", ".join(parts)
+
+
+class SignalDecoder:
+    """Decoders of every message of a signal database, by CAN ID.
+
+    Frames with an ID the database does not define cost one dict lookup.
+    """
+
+    def __init__(self, messages: list[MessageDefinition], path: str = ""):
+        self.path = path
+        self._decoders = {
+            (int(message.is_extended_id) << 29) | message.arbitration_id: (
+                MessageDecoder(message)
+            )
+            for message in messages
+        }
+
+    def __len__(self) -> int:
+        return len(self._decoders)
+
+    def decoder_for(
+        self, arbitration_id: int, is_extended_id: bool
+    ) -> MessageDecoder | None:
+        return self._decoders.get((int(is_extended_id) << 29) | arbitration_id)
+
+    def decode(
+        self, arbitration_id: int, is_extended_id: bool, data: bytes
+    ) -> list[DecodedSignal] | None:
+        decoder = self.decoder_for(arbitration_id, is_extended_id)
+        if decoder is None:
+            return None
+        return decoder.decode(data)
+
+    # "Message: signal=value unit, ..." or "" for unknown IDs
+    def format(self, arbitration_id: int, is_extended_id: bool, data: bytes) -> str:
+        decoder = self.decoder_for(arbitration_id, is_extended_id)
+        if decoder is None:
+            return ""
+        return f"{decoder.name}: {format_signals(decoder.decode(data))}"
+
+
+def database_file_filter() -> str:
+    patterns = " ".join(f"*{suffix}" for suffix in DATABASE_FORMATS)
+    filters = [f"Signal databases ({patterns})"]
+    filters.extend(f"{name} (*{suffix})" for suffix, name in DATABASE_FORMATS.items())
+    return ";;".join(filters)
+
+
+def load_signal_database(path: str | Path) -> SignalDecoder:
+    suffix = Path(path).suffix.lower()
+    if suffix not in DATABASE_FORMATS:
+        raise ValueError(f"Unsupported signal database: {Path(path).name}")
+    if suffix == ".dbc":
+        messages = parse_dbc(_read_text(Path(path)))
+    else:
+        messages = _load_with_cantools(path)
+    return SignalDecoder(messages, str(path))
+
+
+def _read_text(path: Path) -> str:
+    raw = path.read_bytes()
+    try:
+        return raw.decode("utf-8")
+    except UnicodeDecodeError:
+        # what CANdb++ writes
+        return raw.decode("cp1252", errors="replace")
+
+
+def parse_dbc(text: str) -> list[MessageDefinition]:
+    # message key -> (name, length, signal fields)
+    messages: dict[int, tuple[str, int, list[dict]]] = {}
+    choices: dict[tuple[int, str], dict[int, str]] = {}
+    float_signals: dict[tuple[int, str], int] = {}
+    current: list[dict] | None = None
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith("BO_ "):
+            match = _MESSAGE_PATTERN.match(line)
+            if match is None or match[2] == _DBC_INDEPENDENT_SIGNALS:
+                current = None
+                continue
+            current = []
+            messages[int(match[1])] = (match[2], int(match[3]), current)
+        elif line.startswith("SG_ "):
+            match = _SIGNAL_PATTERN.match(line)
+            if match is None:
+                raise ValueError(f"Invalid signal: {line}")
+            if current is None:
+                continue
+            multiplexing = match[2] or ""
+            current.append(
+                {
+                    "name": match[1],
+                    "start": int(match[3]),
+                    "length": int(match[4]),
+                    "little_endian": match[5] == "1",
+                    "signed": match[6] == "-",
+                    "scale": float(match[7]),
+                    "offset": float(match[8]),
+                    "unit": match[9],
+                    "is_multiplexer": multiplexing.endswith("M"),
+                    "multiplexer_ids": (
+                        (int(multiplexing[1:].rstrip("M")),)
+                        if multiplexing.startswith("m")
+                        else None
+                    ),
+                }
+            )
+        else:
+            current = None
+            if line.startswith("VAL_ "):
+                match = _CHOICES_PATTERN.match(line)
+                if match is not None:
+                    choices[(int(match[1]), match[2])] = {
+                        int(value): name
+                        for value, name in _CHOICE_PATTERN.findall(match[3])
+                    }
+            elif line.startswith("SIG_VALTYPE_ "):
+                match = _VALUE_TYPE_PATTERN.match(line)
+                if match is not None:
+                    float_signals[(int(match[1]), match[2])] = int(match[3])
+
+    definitions = []
+    for message_id, (name, length, signals) in messages.items():
+        definitions.append(
+            MessageDefinition(
+                arbitration_id=message_id & ~_DBC_EXTENDED_FLAG,
+                is_extended_id=bool(message_id & _DBC_EXTENDED_FLAG),
+                name=name,
+                length=length,
+                signals=tuple(
+                    SignalDefinition(
+                        **signal,
+                        is_float=(message_id, signal["name"]) in float_signals,
+                        choices=choices.get((message_id, signal["name"]), {}),
+                    )
+                    for signal in signals
+                ),
+            )
+        )
+    return definitions
+
+
+def _load_with_cantools(path: str | Path) -> list[MessageDefinition]:
+    try:
+        database = cantools.database.load_file(str(path), strict=False)
+    except Exception as e:
+        raise ValueError(str(e)) from e
+    return [
+        MessageDefinition(
+            arbitration_id=message.frame_id,
+            is_extended_id=message.is_extended_frame,
+            name=message.name,
+            length=message.length,
+            signals=tuple(
+                SignalDefinition(
+                    name=signal.name,
+                    start=signal.start,
+                    length=signal.length,
+                    little_endian=signal.byte_order == "little_endian",
+                    signed=signal.is_signed,
+                    is_float=signal.is_float,
+                    scale=signal.scale,
+                    offset=signal.offset,
+                    unit=signal.unit or "",
+                    is_multiplexer=signal.is_multiplexer,
+                    multiplexer_ids=(
+                        tuple(signal.multiplexer_ids)
+                        if signal.multiplexer_ids
+                        else None
+                    ),
+                    choices={
+                        int(value): str(name)
+                        for value, name in (signal.choices or {}).items()
+                    },
+                )
+                for signal in message.signals
+            ),
+        )
+        for message in database.messages
+    ]
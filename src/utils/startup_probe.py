@@ -0,0 +1,32 @@
+import time
+
+from PySide6.QtCore import QEvent, QObject, QTimer
+from PySide6.QtWidgets import QApplication, QWidget
+
+# When set, main.py reports the first paint of the window and exits
+STARTUP_PROBE_ENV = "CANVIEWER_STARTUP_PROBE"
+FIRST_PAINT_MARKER = "CANVIEWER_FIRST_PAINT"
+
+
+class _FirstPaintFilter(QObject):
+    def __init__(self, app: QApplication, started: float):
+        super().__init__(app)
+        self._app = app
+        self._started = started
+        self._reported = False
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        if event.type() == QEvent.Type.Paint and not self._reported:
+            self._reported = True
+            elapsed_ms = (time.perf_counter() - self._started) * 1000
+            print(f"{FIRST_PAINT_MARKER} {elapsed_ms:.1f}", flush=True)
+            # let the paint finish, then quit
+            QTimer.singleShot(0, self._app.quit)
+        return False
+
+
+# 'started' is the perf_counter() value taken first thing in main(); the
+# printed time excludes interpreter startup, which the benchmark measures
+# from outside
+def exit_after_first_paint(app: QApplication, window: QWidget, started: float) -> None:
+    window.installEventFilter(_FirstPaintFilter(app, started))
@@ -0,0 +1,171 @@
+import csv
+import json
+import math
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+
+import can
+
+from .frame_store import FLAG_ERROR, FLAG_EXTENDED, message_channel
+
+
+@dataclass(frozen=True)
+class IdStatisticsSnapshot:
+    channel: str
+    arbitration_id: int
+    is_extended_id: bool
+    count: int
+    # average frames per second between the first and the last frame
+    rate: float
+    # periods in seconds, None until two frames have been seen
+    period_mean: float | None
+    period_min: float | None
+    period_max: float | None
+    # standard deviation of the period
+    jitter: float | None
+    first_seen: float
+    last_seen: float
+
+
+class IdStatistics:
+    """Running statistics for one arbitration ID on one channel.
+
+    Period mean and variance use Welford's online algorithm, so every frame
+    costs a handful of float operations and no history is kept.
+    """
+
+    __slots__ = (
+        "_period_m2",
+        "_period_max",
+        "_period_mean",
+        "_period_min",
+        "arbitration_id",
+        "channel",
+        "count",
+        "first_seen",
+        "is_extended_id",
+        "last_seen",
+    )
+
+    def __init__(
+        self,
+        arbitration_id: int,
+        is_extended_id: bool,
+        timestamp: float,
+        channel: str = "",
+    ):
+        self.channel = channel
+        self.arbitration_id = arbitration_id
+        self.is_extended_id = is_extended_id
+        self.count = 1
+        self.first_seen = timestamp
+        self.last_seen = timestamp
+        self._period_mean = 0.0
+        self._period_m2 = 0.0
+        self._period_min = math.inf
+        self._period_max = -math.inf
+
+    def update(self, timestamp: float) -> None:
+        period = timestamp - self.last_seen
+        self.last_seen = timestamp
+        self.count += 1
+        # the number of periods is count - 1
+        delta = period - self._period_mean
+        self._period_mean += delta / (self.count - 1)
+        self._period_m2 += delta * (period - self._period_mean)
+        self._period_min = min(self._period_min, period)
+        self._period_max = max(self._period_max, period)
+
+    def snapshot(self) -> IdStatisticsSnapshot:
+        periods = self.count - 1
+        duration = self.last_seen - self.first_seen
+        return IdStatisticsSnapshot(
+            channel=self.channel,
+            arbitration_id=self.arbitration_id,
+            is_extended_id=self.is_extended_id,
+            count=self.count,
+            rate=periods / duration if duration > 0 else 0.0,
+            period_mean=self._period_mean if periods else None,
+            period_min=self._period_min if periods else None,
+            period_max=self._period_max if periods else None,
+            jitter=math.sqrt(self._period_m2 / periods) if periods else None,
+            first_seen=self.first_seen,
+            last_seen=self.last_seen,
+        )
+
+
+class StatisticsEngine:
+    """Per-ID and per-channel statistics with memory proportional to the
+    number of distinct IDs."""
+
+    def __init__(self):
+        self._entries: dict[tuple[object, int], IdStatistics] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def update_batch(self, msgs: list[can.Message]) -> None:
+        entries = self._entries
+        for msg in msgs:
+            if msg.is_error_frame:
+                continue
+            key = (msg.channel, (int(msg.is_extended_id) << 29) | msg.arbitration_id)
+            entry = entries.get(key)
+            if entry is None:
+                entries[key] = IdStatistics(
+                    msg.arbitration_id,
+                    msg.is_extended_id,
+                    msg.timestamp,
+                    message_channel(msg),
+                )
+            else:
+                entry.update(msg.timestamp)
+
+    # (timestamp, arbitration ID, frame flags) tuples, e.g. from a capture file
+    def update_records(self, records: Iterable[tuple[float, int, int]]) -> None:
+        entries = self._entries
+        for timestamp, arbitration_id, flags in records:
+            if flags & FLAG_ERROR:
+                continue
+            is_extended_id = bool(flags & FLAG_EXTENDED)
+            key = (None, (int(is_extended_id) << 29) | arbitration_id)
+            entry = entries.get(key)
+            if entry is None:
+                entries[key] = IdStatistics(arbitration_id, is_extended_id, timestamp)
+            else:
+                entry.update(timestamp)
+
+    # names of the channels with statistics, "" excluded
+    def channels(self) -> list[str]:
+        return sorted({entry.channel for entry in self._entries.values()} - {""})
+
+    def snapshot(self) -> list[IdStatisticsSnapshot]:
+        return [entry.snapshot() for entry in self._entries.values()]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def to_csv(self, path: str | Path) -> None:
+        columns = [field.name for field in fields(IdStatisticsSnapshot)]
+        with open(path, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=columns)
+            writer.writeheader()
+            for snapshot in self.snapshot():
+                writer.writerow(asdict(snapshot))
+
+    def to_json(self, path: str | Path) -> None:
+        with open(path, "w") as file:
+            json.dump(
+                [asdict(snapshot) for snapshot in self.snapshot()], file, indent=2
+            )
+
+    # Export by file suffix (.csv or .json)
+    def export(self, path: str | Path) -> None:
+        suffix = Path(path).suffix.lower()
+        if suffix == ".csv":
+            self.to_csv(path)
+        elif suffix == ".json":
+            self.to_json(path)
+        else:
+            raise ValueError(f"Unsupported statistics export format: {suffix}")
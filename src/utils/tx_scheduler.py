@@ -0,0 +1,259 @@
+import heapq
+import math
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import can
+
+from .periodic_sender import copy_sent_message
+
+
+@dataclass(frozen=True)
+class TxRowStats:
+    sent: int
+    # periods skipped because the scheduler was a full period or more late
+    missed: int
+    errors: int
+    # worst delay between a deadline and its send, in seconds
+    max_lateness: float
+    last_error: Exception | None
+
+
+class _Row:
+    __slots__ = (
+        "channel",
+        "enabled",
+        "errors",
+        "generation",
+        "last_error",
+        "max_lateness",
+        "missed",
+        "msg",
+        "offset",
+        "period",
+        "sent",
+    )
+
+    def __init__(self, msg: can.Message, period: float, offset: float, enabled: bool):
+        self.msg = msg
+        self.period = period
+        self.offset = offset
+        self.enabled = enabled
+        # channel the row is sent on, bound when it starts sending
+        self.channel: str | None = None
+        # heap entries of older generations are stale and skipped
+        self.generation = 0
+        self.sent = 0
+        self.missed = 0
+        self.errors = 0
+        self.max_lateness = 0.0
+        self.last_error: Exception | None = None
+
+
+class TxScheduler:
+    """Sends many cyclic messages from a single thread.
+
+    Rows are kept in a heap ordered by their next deadline, so the thread
+    sleeps until the earliest one and sends every row that is due in one
+    pass; hundreds of rows cost one thread and no timers. A row that falls
+    a full period or more behind skips the lost periods instead of sending
+    a burst, and the skipped deadlines are counted per row. Changing a row
+    bumps its generation, which invalidates its old heap entry without a
+    heap search. Deadlines are anchored to the time the scheduler started,
+    so offsets keep rows apart across edits.
+
+    ``bind_channel`` names the channel a row is sent on; it is asked when
+    the scheduler starts and when a row is added while running, and stored
+    in the row's ``msg.channel``.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[can.Message], None],
+        on_sent: Callable[[can.Message], None] | None = None,
+        bind_channel: Callable[[], str | None] | None = None,
+    ):
+        self._send = send
+        self._on_sent = on_sent
+        self._bind_channel = bind_channel
+        self._lock = threading.Lock()
+        # set by every change to interrupt the wait for the next deadline
+        self._wake = threading.Event()
+        self._rows: dict[int, _Row] = {}
+        self._heap: list[tuple[float, int, int]] = []
+        self._next_key = 0
+        self._running = False
+        # start time of the running scheduler; every deadline is measured
+        # from it
+        self._epoch = 0.0
+        self._thread: threading.Thread | None = None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def is_running(self) -> bool:
+        return self._running
+
+    def add(
+        self,
+        msg: can.Message,
+        period: float,
+        offset: float = 0.0,
+        enabled: bool = True,
+    ) -> int:
+        _check_timing(period, offset)
+        with self._lock:
+            key = self._next_key
+            self._next_key += 1
+            row = self._rows[key] = _Row(msg, period, offset, enabled)
+            if self._running:
+                self._bind(row)
+            self._schedule(key)
+        self._wake.set()
+        return key
+
+    # Replaces the message and timing; the row continues on the grid of its
+    # new period and offset instead of restarting from now
+    def update(
+        self, key: int, msg: can.Message, period: float, offset: float = 0.0
+    ) -> None:
+        _check_timing(period, offset)
+        with self._lock:
+            row = self._rows[key]
+            msg.channel = row.channel
+            row.msg = msg
+            row.period = period
+            row.offset = offset
+            self._schedule(key)
+        self._wake.set()
+
+    def set_enabled(self, key: int, enabled: bool) -> None:
+        with self._lock:
+            self._rows[key].enabled = enabled
+            self._schedule(key)
+        self._wake.set()
+
+    def remove(self, key: int) -> None:
+        with self._lock:
+            del self._rows[key]
+        self._wake.set()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._rows.clear()
+            self._heap.clear()
+        self._wake.set()
+
+    def stats(self, key: int) -> TxRowStats:
+        row = self._rows[key]
+        return TxRowStats(
+            sent=row.sent,
+            missed=row.missed,
+            errors=row.errors,
+            max_lateness=row.max_lateness,
+            last_error=row.last_error,
+        )
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            for row in self._rows.values():
+                row.sent = 0
+                row.missed = 0
+                row.errors = 0
+                row.max_lateness = 0.0
+                row.last_error = None
+
+    def start(self) -> None:
+        if self._running:
+            return
+        with self._lock:
+            self._running = True
+            self._epoch = time.perf_counter()
+            self._heap.clear()
+            for key, row in self._rows.items():
+                self._bind(row)
+                self._schedule(key)
+        self._thread = threading.Thread(
+            target=self._run, name="TxScheduler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        if not self._running:
+            return
+        self._running = False
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    # Called with the lock held
+    def _bind(self, row: _Row) -> None:
+        if self._bind_channel is not None:
+            row.channel = self._bind_channel()
+            row.msg.channel = row.channel
+
+    # Deadlines lie on the grid epoch + offset + k * period, so a row keeps
+    # its phase when it is edited or enabled again. Called with the lock held
+    def _schedule(self, key: int) -> None:
+        row = self._rows[key]
+        row.generation += 1
+        if not (self._running and row.enabled):
+            return
+        deadline = self._epoch + row.offset
+        now = time.perf_counter()
+        if deadline < now:
+            deadline += math.ceil((now - deadline) / row.period) * row.period
+        heapq.heappush(self._heap, (deadline, key, row.generation))
+
+    def _run(self) -> None:
+        while self._running:
+            self._wake.clear()
+            due: list[tuple[_Row, can.Message]] = []
+            with self._lock:
+                now = time.perf_counter()
+                next_deadline = None
+                while self._heap:
+                    deadline, key, generation = self._heap[0]
+                    row = self._rows.get(key)
+                    if row is None or row.generation != generation:
+                        heapq.heappop(self._heap)
+                        continue
+                    if deadline > now:
+                        next_deadline = deadline
+                        break
+                    heapq.heappop(self._heap)
+                    lateness = now - deadline
+                    row.max_lateness = max(row.max_lateness, lateness)
+                    skipped = int(lateness // row.period)
+                    row.missed += skipped
+                    heapq.heappush(
+                        self._heap,
+                        (deadline + (skipped + 1) * row.period, key, generation),
+                    )
+                    due.append((row, row.msg))
+
+            # sends happen outside the lock so edits never wait on the bus;
+            # any failure is the row's error and the other rows keep going
+            for row, msg in due:
+                try:
+                    self._send(msg)
+                    row.sent += 1
+                    if self._on_sent is not None:
+                        self._on_sent(copy_sent_message(msg))
+                except Exception as e:  # noqa: BLE001
+                    row.errors += 1
+                    row.last_error = e
+
+            if not due:
+                timeout = None if next_deadline is None else next_deadline - now
+                self._wake.wait(timeout)
+
+
+def _check_timing(period: float, offset: float) -> None:
+    if not 0 < period < math.inf:
+        raise ValueError("Period must be greater than 0")
+    if not 0 <= offset < math.inf:
+        raise ValueError("Offset must not be negative")
@@ -7,6 +7,13 @@ class Validator:
     hex_validator = QRegularExpressionValidator(QRegularExpression("^[0-9A-Fa-f]+$"))
     # DEC
     dec_validator = QIntValidator()
+    # ID filter entries: "100", "100-1FF" (range) or "100/7F0" (id/mask)
+    filter_hex_validator = QRegularExpressionValidator(
+        QRegularExpression("^[0-9A-Fa-f]+([-/][0-9A-Fa-f]*)?$")
+    )
+    filter_dec_validator = QRegularExpressionValidator(
+        QRegularExpression("^[0-9]+([-/][0-9]*)?$")
+    )
 
     @staticmethod
     def decimalize(value_str: str, radix_type="dec") -> int: